@@ -1,21 +1,55 @@
+# Imported first so that the remaining imports can be timed
+from startup_profiler import profiler
+
+profiler.begin("import sugar3")
 from sugar3.activity import activity
 from sugar3.graphics.toolbarbox import ToolbarBox
 from sugar3.graphics.toolbutton import ToolButton
+profiler.end("import sugar3")
 
-from gi.repository import Gtk, Gdk, GLib
+profiler.begin("import gtk")
+from gi.repository import Gtk, GLib
+profiler.end("import gtk")
 import os
-import subprocess
-import threading
-import time
 import random
 
+profiler.begin("import launcher")
+from animations import AnimationScheduler, CssKeyframes, add_screen_provider
+from game_registry import GameRegistry
+from resource_monitor import ResourceMonitor
+from worker_pool import WarmWorkerPool
+profiler.end("import launcher")
+
 class MathGamesActivity(activity.Activity):
 
+    # Game list with colorful icons
+    GAME_LIST = [
+        ("Math Minesweeper", "💣", "games/math_minesweeper.py", "#FF6B6B"),
+        ("Broken Calculator", "🧮", "games/broken_calculator.py", "#4ECDC4"),
+        ("Fifteen Puzzle", "🧩", "games/fifteen_puzzle.py", "#FF9F1C"),
+        ("Euclid's Game", "📐", "games/euclids_game.py", "#A16AE8"),
+        ("Odd Scoring", "🎲", "games/OddScoring.py", "#38B6FF"),
+        ("Number Ninja", "🥷", "games/number_ninja.py", "#4CAF50"),
+    ]
+
     def __init__(self, handle):
+        profiler.begin("activity init")
         super().__init__(handle)
         self.set_title("Math Games")
+        profiler.end("activity init")
+        
+        # Game modules are imported once and reused on relaunch
+        self.registry = GameRegistry(os.path.dirname(os.path.abspath(__file__)))
+        
+        # Pre-imported interpreters for games without a run() function
+        self.worker_pool = WarmWorkerPool(size=1)
+        
+        # Wall/CPU time, memory and callback counts of every launched game
+        self.monitor = ResourceMonitor.from_environ()
+        self.game_names = {path: name for name, _, path, _ in self.GAME_LIST}
 
         # Set up toolbar
+        profiler.begin("toolbar")
         toolbar_box = ToolbarBox()
         self.set_toolbar_box(toolbar_box)
 
@@ -23,10 +57,71 @@ class MathGamesActivity(activity.Activity):
         stop_button.connect('clicked', self.__quit_cb)
         toolbar_box.toolbar.insert(stop_button, -1)
         toolbar_box.show_all()
+        profiler.end("toolbar")
 
-        # Main container with colorful background
-        main_container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
-        main_container.set_border_width(16)
+        # The launcher is built in two stages: everything needed to pick a
+        # game is created here, and secondary widgets (tip rotator, rainbow
+        # border) are added from an idle callback after the first frame.
+        profiler.begin("grid")
+        self.main_container = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
+        self.main_container.set_border_width(16)
+        
+        self.main_container.pack_start(self.create_header(), False, False, 0)
+        self.main_container.pack_start(self.create_games_grid(), True, True, 0)
+        self.main_container.pack_start(self.create_random_button(), False, False, 0)
+        profiler.end("grid")
+        
+        # Apply CSS
+        profiler.begin("css")
+        self.apply_css()
+        profiler.end("css")
+        
+        # Set up the main canvas
+        profiler.begin("show")
+        self.set_canvas(self.main_container)
+        self.main_container.show_all()
+        profiler.end("show")
+        
+        # Drive all launcher animations from one frame-clock scheduler
+        self.animations = AnimationScheduler(self)
+        self.animations.add(1.0, self.animate_header_icon)
+        self.animations.add(0.5, self.animate_dice_icon)
+        
+        # Build the rest once the first frame is on screen
+        self.first_draw_id = self.main_container.connect("draw", self._on_first_draw)
+    
+    def _on_first_draw(self, widget, context):
+        widget.disconnect(self.first_draw_id)
+        profiler.mark("first draw")
+        GLib.idle_add(self.create_secondary_ui)
+        return False
+    
+    def create_secondary_ui(self):
+        """Second construction stage, run after the first frame."""
+        profiler.begin("secondary ui")
+        self.main_container.pack_start(self.create_tip_box(), False, False, 0)
+        self.tip_box.show_all()
+        self.animations.add(5.0, self.rotate_tips)
+        
+        # Precompile every rotation of the rainbow border once
+        self.rainbow_keyframes = CssKeyframes("rainbow-border", self.build_rainbow_frames())
+        self.animations.add(0.2, self.animate_rainbow_border)
+        
+        self.main_container.pack_start(self.create_diagnostics_panel(), False, False, 0)
+        self.diagnostics_panel.show_all()
+        self.monitor.add_listener(self.update_diagnostics)
+        profiler.end("secondary ui")
+        profiler.mark("interactive")
+        profiler.write_report()
+        
+        # Warm up game workers and modules once the launcher is usable
+        self.worker_pool.start_later()
+        self.registry.preload([path for _, _, path, _ in self.GAME_LIST])
+        return False
+    
+    def create_header(self):
+        """Create the title area with the animated icon"""
+        header = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
         
         # Header with animated icon
         header_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
@@ -43,15 +138,19 @@ class MathGamesActivity(activity.Activity):
         header_text.set_markup("<span font='20' weight='bold' foreground='#FF6B6B'>Math Games</span>")
         header_box.pack_start(header_text, False, False, 0)
         
-        main_container.pack_start(header_box, False, False, 0)
+        header.pack_start(header_box, False, False, 0)
         
         # Subtitle with fun text
         subtitle = Gtk.Label()
         subtitle.set_markup("<span font='12' foreground='#6B5BFF' style='italic'>Fun math adventures await!</span>")
+        subtitle.set_margin_top(12)
         subtitle.set_margin_bottom(12)
-        main_container.pack_start(subtitle, False, False, 0)
+        header.pack_start(subtitle, False, False, 0)
         
-        # Games grid
+        return header
+    
+    def create_games_grid(self):
+        """Create the scrollable grid of game tiles"""
         scrolled_window = Gtk.ScrolledWindow()
         scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
         
@@ -64,26 +163,18 @@ class MathGamesActivity(activity.Activity):
         games_grid.set_column_spacing(16)
         games_grid.set_row_spacing(16)
         
-        # Game list with colorful icons
-        game_list = [
-            ("Math Minesweeper", "💣", "games/math_minesweeper.py", "#FF6B6B"),
-            ("Broken Calculator", "🧮", "games/broken_calculator.py", "#4ECDC4"),
-            ("Fifteen Puzzle", "🧩", "games/fifteen_puzzle.py", "#FF9F1C"),
-            ("Euclid's Game", "📐", "games/euclids_game.py", "#A16AE8"),
-            ("Odd Scoring", "🎲", "games/OddScoring.py", "#38B6FF"),
-            ("Number Ninja", "🥷", "games/number_ninja.py", "#4CAF50"),
-        ]
-        
         # Create game buttons with fun effects
         self.buttons = []
-        for name, icon, path, color in game_list:
+        for name, icon, path, color in self.GAME_LIST:
             game_box = self.create_game_button(name, icon, path, color)
             games_grid.add(game_box)
             self.buttons.append((game_box, path))
         
         scrolled_window.add(games_grid)
-        main_container.pack_start(scrolled_window, True, True, 0)
-        
+        return scrolled_window
+    
+    def create_random_button(self):
+        """Create the "surprise me" button"""
         # Random game button with sparkling effect
         random_button = Gtk.Button()
         random_button.set_size_request(200, 60)
@@ -91,8 +182,8 @@ class MathGamesActivity(activity.Activity):
         random_button.set_margin_top(12)
         
         # Add border container for rainbow effect
-        border_container = Gtk.Box()
-        border_container.get_style_context().add_class("rainbow-border")
+        self.border_container = Gtk.Box()
+        self.border_container.get_style_context().add_class("rainbow-border")
         
         random_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
         random_box.set_halign(Gtk.Align.CENTER)
@@ -110,42 +201,68 @@ class MathGamesActivity(activity.Activity):
         random_label.set_markup("<span font='16' weight='bold' color='white'>SURPRISE ME!</span>")
         random_box.pack_start(random_label, False, False, 0)
         
-        # This is changed - we're nesting the button inside the border container
         random_button.add(random_box)
         random_button.get_style_context().add_class("random-button")
         
-        # Add thread to animate rainbow border
-        threading.Thread(target=self.animate_rainbow_border, daemon=True).start()
-        
-        main_container.pack_start(random_button, False, False, 0)
-        
+        # The rainbow border is drawn by the container around the button
+        self.border_container.pack_start(random_button, True, True, 0)
+        return self.border_container
+    
+    def create_tip_box(self):
+        """Create the tip of the day box"""
         # Tip of the day with rotating tips
-        tip_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        tip_box.set_margin_top(16)
-        tip_box.get_style_context().add_class("tip-box")
+        self.tip_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        self.tip_box.set_margin_top(16)
+        self.tip_box.get_style_context().add_class("tip-box")
         
         tip_icon = Gtk.Label()
         tip_icon.set_markup("<span font='16'>💡</span>")
-        tip_box.pack_start(tip_icon, False, False, 0)
+        self.tip_box.pack_start(tip_icon, False, False, 0)
         
         self.tip_text = Gtk.Label()
         self.tip_text.set_markup("<span font='12' foreground='#6B5BFF'>Try to beat your best time in the Fifteen Puzzle!</span>")
         self.tip_text.set_line_wrap(True)
-        tip_box.pack_start(self.tip_text, True, True, 0)
+        self.tip_box.pack_start(self.tip_text, True, True, 0)
         
-        main_container.pack_start(tip_box, False, False, 0)
-        
-        # Apply CSS
-        self.apply_css()
+        return self.tip_box
+    
+    def create_diagnostics_panel(self):
+        """Create the collapsed panel listing per-game resource usage"""
+        self.diagnostics_panel = Gtk.Expander(label="Diagnostics")
+        self.diagnostics_panel.set_margin_top(8)
+        
+        # Game, mode, status, wall time, CPU time, peak RSS, callbacks
+        self.diagnostics_store = Gtk.ListStore(str, str, str, str, str, str, str)
+        tree_view = Gtk.TreeView(model=self.diagnostics_store)
+        titles = ["Game", "Mode", "Status", "Wall (s)", "CPU (s)", "Peak RSS (MB)", "Callbacks"]
+        for column, title in enumerate(titles):
+            tree_view.append_column(Gtk.TreeViewColumn(title, Gtk.CellRendererText(), text=column))
         
-        # Set up the main canvas
-        self.set_canvas(main_container)
-        main_container.show_all()
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scrolled_window.set_min_content_height(120)
+        scrolled_window.add(tree_view)
+        self.diagnostics_panel.add(scrolled_window)
         
-        # Start animation threads
-        threading.Thread(target=self.animate_header_icon, daemon=True).start()
-        threading.Thread(target=self.animate_dice_icon, daemon=True).start()
-        threading.Thread(target=self.rotate_tips, daemon=True).start()
+        self.update_diagnostics(self.monitor)
+        return self.diagnostics_panel
+    
+    def update_diagnostics(self, monitor):
+        """Refresh the diagnostics panel, newest launch first"""
+        def show(value, scale=1, digits=1):
+            return "-" if value is None else f"{value / scale:.{digits}f}"
+        
+        self.diagnostics_store.clear()
+        for record in reversed(monitor.records):
+            self.diagnostics_store.append([
+                record.name,
+                record.mode,
+                record.status,
+                show(record.wall_s),
+                show(record.cpu_s, digits=2),
+                show(record.peak_rss_kb, scale=1024),
+                "-" if record.callbacks is None else str(record.callbacks),
+            ])
     
     def create_game_button(self, name, icon, path, color):
         # Create button container
@@ -177,78 +294,69 @@ class MathGamesActivity(activity.Activity):
         button.add(button_box)
         return button
     
-    def animate_header_icon(self):
-        # More diverse math emojis
-        math_emojis = ["🧮", "🔢", "📏", "📐", "➗", "➕", "✖️", "🟰", "🧩", "🎲"]
-        position = 0
-        
-        while True:
-            # Change the emoji
-            emoji = math_emojis[position % len(math_emojis)]
-            
-            # Simply update the emoji without bounce effect
-            GLib.idle_add(self.header_icon.set_markup, f"<span font='24'>{emoji}</span>")
-            
-            position += 1
-            time.sleep(1)
+    # More diverse math emojis
+    HEADER_EMOJIS = ["🧮", "🔢", "📏", "📐", "➗", "➕", "✖️", "🟰", "🧩", "🎲"]
+
+    # Dice faces
+    DICE_FACES = ["⚀", "⚁", "⚂", "⚃", "⚄", "⚅", "🎲"]
+
+    TIPS = [
+        "Try to beat your best time in the Fifteen Puzzle!",
+        "Math is fun when you play games!",
+        "The Broken Calculator tests your problem-solving skills!",
+        "Challenge a friend to play Euclid's Game with you!",
+        "Number Ninja will make you faster at mental math!",
+        "Can you solve the Math Minesweeper without exploding?",
+        "Odd Scoring has strange rules. Can you figure them out?"
+    ]
+
+    TIP_COLORS = ["#6B5BFF", "#FF6B6B", "#4ECDC4", "#FF9F1C", "#A16AE8", "#38B6FF", "#4CAF50"]
+
+    RAINBOW_COLORS = [
+        "#FF0000", "#FF7F00", "#FFFF00", "#00FF00",
+        "#0000FF", "#4B0082", "#9400D3"
+    ]
+
+    def animate_header_icon(self, step):
+        # Simply update the emoji without bounce effect
+        emoji = self.HEADER_EMOJIS[step % len(self.HEADER_EMOJIS)]
+        self.header_icon.set_markup(f"<span font='24'>{emoji}</span>")
     
-    def animate_dice_icon(self):
-        # Dice faces
-        dice_faces = ["⚀", "⚁", "⚂", "⚃", "⚄", "⚅", "🎲"]
-        i = 0
-        
-        while True:
-            face = dice_faces[i % len(dice_faces)]
-            GLib.idle_add(self.dice_icon.set_markup, f"<span font='18'>{face}</span>")
-            time.sleep(0.5)
-            i += 1
+    def animate_dice_icon(self, step):
+        face = self.DICE_FACES[step % len(self.DICE_FACES)]
+        self.dice_icon.set_markup(f"<span font='18'>{face}</span>")
     
-    def rotate_tips(self):
-        tips = [
-            "Try to beat your best time in the Fifteen Puzzle!",
-            "Math is fun when you play games!",
-            "The Broken Calculator tests your problem-solving skills!",
-            "Challenge a friend to play Euclid's Game with you!",
-            "Number Ninja will make you faster at mental math!",
-            "Can you solve the Math Minesweeper without exploding?",
-            "Odd Scoring has strange rules. Can you figure them out?"
-        ]
-        
-        tip_colors = ["#6B5BFF", "#FF6B6B", "#4ECDC4", "#FF9F1C", "#A16AE8", "#38B6FF", "#4CAF50"]
-        
-        i = 0
-        while True:
-            tip = tips[i % len(tips)]
-            color = tip_colors[i % len(tip_colors)]
-            GLib.idle_add(self.tip_text.set_markup, f"<span font='12' foreground='{color}'>{tip}</span>")
-            time.sleep(5)
-            i += 1
+    def rotate_tips(self, step):
+        tip = self.TIPS[step % len(self.TIPS)]
+        color = self.TIP_COLORS[step % len(self.TIP_COLORS)]
+        self.tip_text.set_markup(f"<span font='12' foreground='{color}'>{tip}</span>")
     
     def launch_game(self, button, path):
-        script_path = os.path.join(os.path.dirname(__file__), path)
+        name = self.game_names.get(path, path)
         try:
-            # Change directory to ensure relative paths work
-            original_dir = os.getcwd()
-            os.chdir(os.path.dirname(script_path))
-            
-            # Import the module dynamically
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("game_module", script_path)
-            game_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(game_module)
+            # Reuse the cached module when this game was already loaded
+            entry = self.registry.load(path)
+            if entry.error is not None:
+                print(f"Error loading game: {entry.error}")
             
             # Call the run function if it exists, otherwise fall back to subprocess
-            if hasattr(game_module, 'run'):
-                game_module.run()
+            if entry.entry_point is not None:
+                self.monitor.run_in_process(name, entry.entry_point)
             else:
-                subprocess.Popen(["python3", script_path])
-                
-            # Restore original directory
-            os.chdir(original_dir)
+                self.launch_subprocess(name, path)
         except Exception as e:
             print(f"Error launching game: {e}")
-            # Fall back to the original method if there's an error
-            subprocess.Popen(["python3", script_path])
+            # Fall back to a separate process if there's an error
+            self.launch_subprocess(name, path)
+    
+    def launch_subprocess(self, name, path):
+        """Run a game in a worker process and monitor its resource usage"""
+        script_path = self.registry.script_path(path)
+        stats_path = self.monitor.new_stats_path()
+        process = self.worker_pool.launch(
+            script_path, cwd=os.path.dirname(script_path), stats_path=stats_path
+        )
+        self.monitor.watch_process(name, process, stats_path)
     
     def launch_random_game(self, button):
         """Launch a random game from the available games."""
@@ -277,6 +385,7 @@ class MathGamesActivity(activity.Activity):
         self.launch_game(button, path)
     
     def __quit_cb(self, button):
+        self.worker_pool.shutdown()
         Gtk.main_quit()
     
     def apply_css(self):
@@ -381,46 +490,25 @@ class MathGamesActivity(activity.Activity):
         }
         """
         
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(css)
-        screen = Gdk.Screen.get_default()
-        Gtk.StyleContext.add_provider_for_screen(
-            screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_USER
-        )
+        add_screen_provider(css, Gtk.STYLE_PROVIDER_PRIORITY_USER)
 
-    # Add new method to handle rainbow animation
-    def animate_rainbow_border(self):
-        colors = [
-            "#FF0000", "#FF7F00", "#FFFF00", "#00FF00",
-            "#0000FF", "#4B0082", "#9400D3"
-        ]
-        i = 0
-        
-        while True:
+    def build_rainbow_frames(self):
+        colors = self.RAINBOW_COLORS
+        frames = []
+        
+        for i in range(len(colors)):
             # Rotate colors for rainbow effect
             color1 = colors[i % len(colors)]
             color2 = colors[(i + 1) % len(colors)]
             color3 = colors[(i + 2) % len(colors)]
             color4 = colors[(i + 3) % len(colors)]
-            
-            border_css = f"""
-            .rainbow-border {{
-                border: 4px solid;
-                border-image: linear-gradient(45deg, {color1}, {color2}, {color3}, {color4}) 1;
-            }}
-            """
-            
-            # Apply the updated CSS
-            GLib.idle_add(self._update_rainbow_css, border_css)
-            
-            time.sleep(0.2)
-            i += 1
+            frames.append(
+                "border: 4px solid; "
+                f"border-image: linear-gradient(45deg, {color1}, {color2}, {color3}, {color4}) 1;"
+            )
+        
+        return frames
     
-    def _update_rainbow_css(self, css_text):
-        css_provider = Gtk.CssProvider()
-        css_provider.load_from_data(css_text.encode())
-        screen = Gdk.Screen.get_default()
-        Gtk.StyleContext.add_provider_for_screen(
-            screen, css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        )
-        return False
\ No newline at end of file
+    # Add new method to handle rainbow animation
+    def animate_rainbow_border(self, step):
+        self.rainbow_keyframes.apply(self.border_container, step)
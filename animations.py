@@ -0,0 +1,219 @@
+"""
+Animation helpers for the Math Games launcher.
+
+All launcher effects (emoji cycling, dice faces, tip rotation, rainbow
+border) are driven by a single AnimationScheduler instead of one sleeping
+thread per effect. Style animations use CssKeyframes, which compiles every
+frame once and then only swaps CSS classes.
+"""
+
+from gi.repository import Gtk, Gdk, GLib
+
+
+# Number of CssProviders this module has attached to the default screen
+_live_providers = 0
+
+
+def add_screen_provider(css, priority=Gtk.STYLE_PROVIDER_PRIORITY_USER):
+    """Compile a stylesheet and attach it to the default screen."""
+    global _live_providers
+    css_provider = Gtk.CssProvider()
+    css_provider.load_from_data(css.encode() if isinstance(css, str) else css)
+    Gtk.StyleContext.add_provider_for_screen(
+        Gdk.Screen.get_default(), css_provider, priority
+    )
+    _live_providers += 1
+    return css_provider
+
+
+def remove_screen_provider(css_provider):
+    """Detach a provider previously returned by add_screen_provider()."""
+    global _live_providers
+    Gtk.StyleContext.remove_provider_for_screen(
+        Gdk.Screen.get_default(), css_provider
+    )
+    _live_providers -= 1
+
+
+def live_provider_count():
+    """Return how many screen CssProviders are currently attached."""
+    return _live_providers
+
+
+class AnimationScheduler:
+    """Run periodic animation callbacks in step with a widget's frame clock.
+
+    Only one GLib timeout is ever pending: it is armed for the earliest due
+    animation and, when it fires, the due callbacks are run from a one-shot
+    frame clock tick so updates land in the next painted frame. While the
+    widget is unmapped, iconified or fully covered the timeout is dropped,
+    so a hidden launcher does not wake up at all.
+    """
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.animations = {}
+        self.next_id = 1
+        self.timeout_id = None
+        self.tick_id = None
+        self.mapped = widget.get_mapped()
+        self.iconified = False
+        self.obscured = False
+
+        widget.add_events(Gdk.EventMask.VISIBILITY_NOTIFY_MASK |
+                          Gdk.EventMask.STRUCTURE_MASK)
+        widget.connect("map-event", self._on_map_event)
+        widget.connect("unmap-event", self._on_unmap_event)
+        widget.connect("window-state-event", self._on_window_state_event)
+        widget.connect("visibility-notify-event", self._on_visibility_event)
+        widget.connect("destroy", self._on_destroy)
+
+    def add(self, period, callback):
+        """Register callback(step) to run every `period` seconds.
+
+        The step counter starts at 0 and increases by one per call, so the
+        callback can index into its list of frames. Returns an id that can
+        be passed to remove().
+        """
+        animation_id = self.next_id
+        self.next_id += 1
+        period_us = int(period * 1000000)
+        self.animations[animation_id] = {
+            "period": period_us,
+            "callback": callback,
+            "step": 0,
+            "due": GLib.get_monotonic_time(),
+        }
+        self._reschedule()
+        return animation_id
+
+    def remove(self, animation_id):
+        """Stop a registered animation."""
+        self.animations.pop(animation_id, None)
+        self._reschedule()
+
+    def is_running(self):
+        """Return True if the launcher is visible and animations are ticking."""
+        return self.mapped and not self.iconified and not self.obscured
+
+    def _reschedule(self):
+        """Arm the single timeout for the next due animation."""
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+
+        if not self.animations or not self.is_running() or self.tick_id is not None:
+            return
+
+        now = GLib.get_monotonic_time()
+        next_due = min(anim["due"] for anim in self.animations.values())
+        delay_ms = max(0, (next_due - now) // 1000)
+        self.timeout_id = GLib.timeout_add(delay_ms, self._on_timeout)
+
+    def _on_timeout(self):
+        """Hand the due animations over to the frame clock."""
+        self.timeout_id = None
+        if self.is_running() and self.tick_id is None:
+            self.tick_id = self.widget.add_tick_callback(self._on_tick)
+        return False
+
+    def _on_tick(self, widget, frame_clock):
+        """Run every animation whose deadline has passed in this frame."""
+        self.tick_id = None
+        now = frame_clock.get_frame_time()
+
+        for anim in list(self.animations.values()):
+            if anim["due"] > now:
+                continue
+            anim["callback"](anim["step"])
+            anim["step"] += 1
+            # Skip missed periods instead of replaying them in a burst
+            anim["due"] += anim["period"]
+            if anim["due"] <= now:
+                anim["due"] = now + anim["period"]
+
+        self._reschedule()
+        return GLib.SOURCE_REMOVE
+
+    def _pause(self):
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+        if self.tick_id is not None:
+            self.widget.remove_tick_callback(self.tick_id)
+            self.tick_id = None
+
+    def _update_state(self):
+        if self.is_running():
+            # Resume from now rather than catching up on the hidden period
+            now = GLib.get_monotonic_time()
+            for anim in self.animations.values():
+                anim["due"] = now
+            self._reschedule()
+        else:
+            self._pause()
+
+    def _on_map_event(self, widget, event):
+        self.mapped = True
+        self._update_state()
+        return False
+
+    def _on_unmap_event(self, widget, event):
+        self.mapped = False
+        self._update_state()
+        return False
+
+    def _on_window_state_event(self, widget, event):
+        hidden = Gdk.WindowState.ICONIFIED | Gdk.WindowState.WITHDRAWN
+        self.iconified = bool(event.new_window_state & hidden)
+        self._update_state()
+        return False
+
+    def _on_visibility_event(self, widget, event):
+        self.obscured = event.state == Gdk.VisibilityState.FULLY_OBSCURED
+        self._update_state()
+        return False
+
+    def _on_destroy(self, widget):
+        self._pause()
+        self.animations.clear()
+
+
+class CssKeyframes:
+    """Animate a widget's style by swapping precompiled CSS classes.
+
+    Every frame is compiled into one provider up front as `.<name>-<i>`, so
+    advancing the animation only toggles a class on the widget and the
+    style cascade never grows.
+    """
+
+    def __init__(self, name, frames, priority=Gtk.STYLE_PROVIDER_PRIORITY_USER):
+        self.name = name
+        self.frame_count = len(frames)
+        css = "".join(
+            f".{name}.{name}-{i} {{ {body} }}\n" for i, body in enumerate(frames)
+        )
+        self.provider = add_screen_provider(css, priority)
+        self.current = {}
+
+    def frame_class(self, step):
+        return f"{self.name}-{step % self.frame_count}"
+
+    def apply(self, widget, step):
+        """Show frame `step` (wrapping around) on widget."""
+        context = widget.get_style_context()
+        new_class = self.frame_class(step)
+        old_class = self.current.get(widget)
+        if old_class == new_class:
+            return
+        if old_class is not None:
+            context.remove_class(old_class)
+        context.add_class(new_class)
+        self.current[widget] = new_class
+
+    def release(self):
+        """Detach the compiled stylesheet from the screen."""
+        if self.provider is not None:
+            remove_screen_provider(self.provider)
+            self.provider = None
+        self.current.clear()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check saved Fifteen Puzzle replays by playing them back headlessly.
+
+Every replay is simulated from its starting board; one whose moves leave
+the board or do not end solved is reported as invalid and the script
+exits with status 1. Use it to check games before they go on a
+leaderboard, or to collect move counts and times from many games.
+
+    python3 benchmarks/replay_games.py
+    python3 benchmarks/replay_games.py path/to/replays/*.replay
+    python3 benchmarks/replay_games.py --output games.json
+
+Without arguments the replays the game saved are checked.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "games"))
+
+from engine.journal import load_replay, is_solved_replay, replay_dir
+
+
+def check_replay(path):
+    """Return the result row of one replay file."""
+    result = {
+        "replay": path,
+        "size": None,
+        "moves": None,
+        "elapsed_s": None,
+        "status": "invalid",
+    }
+    try:
+        replay = load_replay(path)
+        result["size"] = replay.grid_size
+        result["moves"] = len(replay.journal)
+        result["elapsed_s"] = replay.elapsed
+        if is_solved_replay(replay):
+            result["status"] = "ok"
+        else:
+            result["status"] = "not solved"
+    except (OSError, ValueError) as e:
+        result["status"] = f"invalid ({e})"
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("replays", nargs="*", help="replay files (default: the saved games)")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    paths = args.replays or sorted(glob.glob(os.path.join(replay_dir(), "*.replay")))
+    started = time.perf_counter()
+    results = [check_replay(path) for path in paths]
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        size = "-" if result["size"] is None else f"{result['size']}x{result['size']}"
+        moves = "-" if result["moves"] is None else result["moves"]
+        print(f"{os.path.basename(result['replay']):45s} {size:>5} {moves:>6}  {result['status']}")
+
+    total_moves = sum(result["moves"] or 0 for result in results)
+    failed = [result for result in results if result["status"] != "ok"]
+    print(f"\nChecked {len(results)} replays ({total_moves:,} moves) in {elapsed:.3f}s, "
+          f"{len(failed)} failed")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"results": results}, output_file, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Headless benchmarks for the hot paths of every game.
+
+The benchmarks run against the engine models in games/engine, so no
+display is needed. Results are written as JSON and compared against a
+stored baseline; a benchmark that got slower than the baseline by more
+than the tolerance is reported as a regression and the script exits with
+status 1.
+
+    python3 benchmarks/run_benchmarks.py
+    python3 benchmarks/run_benchmarks.py --output results.json
+    python3 benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "games"))
+
+from engine.fifteen import FifteenPuzzle, generate_math_operations, random_solvable_board
+from engine.solver import solve, LinearConflictHeuristic
+from engine import pattern_db
+from engine.walking_distance import WalkingDistanceHeuristic
+from engine.fast_solver import solve_fast, FINISH_RESERVE
+from engine.journal import simulate
+from engine.euclid import EuclidsGame
+from engine.odd_scoring import OddScoringGame
+from engine.broken_calculator import BrokenCalculatorGame
+from engine.minesweeper import QuestionGenerator
+from engine.number_ninja import Number, NumberNinjaGame, cairo
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+SEED = 1234
+
+# name -> (setup() returning a zero-argument callable, iterations per run)
+BENCHMARKS = {}
+
+
+def benchmark(name, iterations):
+    """Register a setup function under `name`."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, iterations)
+        return setup
+    return register
+
+
+@benchmark("fifteen.shuffle_board", 20)
+def bench_fifteen_shuffle():
+    puzzle = FifteenPuzzle(rng=random.Random(SEED))
+    return puzzle.shuffle
+
+
+@benchmark("fifteen.shuffle_walk", 20)
+def bench_fifteen_shuffle_walk():
+    puzzle = FifteenPuzzle(rng=random.Random(SEED))
+    return lambda: puzzle.shuffle(1000)
+
+
+@benchmark("fifteen.is_solvable", 2000)
+def bench_fifteen_is_solvable():
+    puzzle = FifteenPuzzle(rng=random.Random(SEED))
+    puzzle.shuffle()
+    return puzzle.is_solvable
+
+
+@benchmark("fifteen.generate_math_operations[10x10]", 2000)
+def bench_generate_math_operations():
+    rng = random.Random(SEED)
+    return lambda: generate_math_operations(99, rng)
+
+
+@benchmark("fifteen.move_and_check[10x10]", 20000)
+def bench_fifteen_move_large():
+    puzzle = FifteenPuzzle(grid_size=10, rng=random.Random(SEED))
+    puzzle.shuffle()
+
+    def move():
+        # Slide the tile next to the empty cell back and forth
+        x, y = puzzle.get_possible_moves()[0]
+        puzzle.move_tile(x, y)
+        puzzle.is_solved()
+    return move
+
+
+@benchmark("fifteen.simulate_replay[1000 moves]", 200)
+def bench_simulate_replay():
+    rng = random.Random(SEED)
+    puzzle = FifteenPuzzle(rng=rng)
+    puzzle.new_game()
+    for _ in range(1000):
+        x, y = rng.choice(puzzle.get_possible_moves())
+        puzzle.move_tile(x, y)
+    replay = puzzle.replay()
+    return lambda: simulate(replay)
+
+
+# A fixed 4x4 position 32 moves from solved
+SOLVER_BOARD = [2, 3, 0, 4, 1, 5, 14, 7, 9, 11, 13, 8, 6, 12, 10, 15]
+
+
+@benchmark("solver.solve[4x4]", 3)
+def bench_solver():
+    return lambda: solve(SOLVER_BOARD, 4, LinearConflictHeuristic(4))
+
+
+@benchmark("solver.solve_pdb[4x4]", 3)
+def bench_solver_pdb():
+    # Needs the tables built by engine.pattern_db.main()
+    heuristic = pattern_db.load_heuristic(4)
+    if heuristic is None:
+        return None
+    return lambda: solve(SOLVER_BOARD, 4, heuristic)
+
+
+@benchmark("solver.solve_wd[4x4]", 3)
+def bench_solver_walking_distance():
+    # Build the table here so the first timed run does not pay for it
+    heuristic = WalkingDistanceHeuristic(4)
+    return lambda: solve(SOLVER_BOARD, 4, heuristic)
+
+
+@benchmark("fast_solver.solve_fast[10x10]", 5)
+def bench_solve_fast():
+    board = random_solvable_board(10, random.Random(SEED))
+    # No time for the optimal 4x4 search, so only the reduction is timed
+    return lambda: solve_fast(board, 10, deadline=FINISH_RESERVE)
+
+
+@benchmark("minesweeper.get_random_question", 5000)
+def bench_random_question():
+    random.seed(SEED)
+    return QuestionGenerator().get_random_question
+
+
+@benchmark("calculator.evaluate_expression", 5000)
+def bench_evaluate_expression():
+    game = BrokenCalculatorGame(rng=random.Random(SEED))
+    return lambda: game.evaluate_expression("12+34*5-6/3")
+
+
+@benchmark("calculator.generate_hint", 5000)
+def bench_generate_hint():
+    game = BrokenCalculatorGame(rng=random.Random(SEED))
+    game.start(2)
+    return game.generate_hint
+
+
+def euclid_board(size):
+    """A game whose board holds `size` numbers and is not yet finished."""
+    game = EuclidsGame(rng=random.Random(SEED))
+    # gcd 1 and a large maximum so the board can grow to `size`
+    game.start(997, 1000)
+    while len(game.numbers_on_board) < size:
+        num1, num2, _ = game.find_bot_move()
+        game.play(num1, num2)
+    return game
+
+
+for _size in (10, 50, 150):
+    benchmark(f"euclid.find_valid_bot_move[{_size}]", 2000 // _size)(
+        lambda size=_size: euclid_board(size).find_bot_move)
+    benchmark(f"euclid.check_game_over[{_size}]", 20000)(
+        lambda size=_size: euclid_board(size).is_game_over)
+
+
+@benchmark("odd_scoring.calculate_computer_move", 20000)
+def bench_computer_move():
+    game = OddScoringGame("sum", "normal", rng=random.Random(SEED))
+    game.start()
+    game.apply_move(2, human=True)
+    return game.calculate_computer_move
+
+
+@benchmark("number_ninja.update_game", 2000)
+def bench_update_game():
+    game = NumberNinjaGame(rng=random.Random(SEED))
+    game.start(800, 600)
+    for _ in range(40):
+        game.spawn_number()
+    # Keep the numbers on screen so every step moves all 40 of them
+    for num in game.numbers:
+        num.speed = 0
+    return game.update
+
+
+@benchmark("number_ninja.number_draw", 2000)
+def bench_number_draw():
+    if cairo is None:
+        return None
+    surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, 800, 600)
+    context = cairo.Context(surface)
+    num = Number(12, 400, 300, 2.0)
+    num.size = 50
+    return lambda: num.draw(context)
+
+
+def run_benchmark(name, repeat):
+    """Return the best time per call in nanoseconds, or None if skipped."""
+    setup, iterations = BENCHMARKS[name]
+    func = setup()
+    if func is None:
+        return None
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = (time.perf_counter() - start) / iterations
+        if best is None or elapsed < best:
+            best = elapsed
+    return best * 1e9
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of (name, baseline_ns, current_ns) regressions."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if current is None or previous is None:
+            continue
+        if current > previous * (1 + tolerance):
+            regressions.append((name, previous, current))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown before reporting a regression (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per benchmark; the fastest run is kept")
+    parser.add_argument("--filter", default="",
+                        help="only run benchmarks whose name contains this text")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for name in BENCHMARKS:
+        if args.filter in name:
+            results[name] = run_benchmark(name, args.repeat)
+            shown = "skipped" if results[name] is None else f"{results[name]:12.0f} ns/op"
+            print(f"{name:45s} {shown}")
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "ns/op",
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2, sort_keys=True)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, previous, current in regressions:
+        print(f"REGRESSION {name}: {previous:.0f} -> {current:.0f} ns/op")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Solve a file of Fifteen Puzzle instances optimally, in parallel.
+
+Every instance is solved with the chosen heuristic across a pool of
+worker processes, and the solver's answer is checked by replaying its
+moves on the instance. Per instance the script reports the solution
+length, nodes expanded, nodes per second and wall time. Node counts and
+lengths do not depend on the machine, so they also make an oracle for
+solver and heuristic changes: an instance file with expected lengths
+fails the run if any solution is the wrong length or does not solve the
+board.
+
+    python3 benchmarks/solve_batch.py
+    python3 benchmarks/solve_batch.py --heuristic linear-conflict --workers 4
+    python3 benchmarks/solve_batch.py my_instances.txt --output results.json
+
+Instance files hold one instance per line; blank lines and lines starting
+with # are ignored. A line is either just the tiles, or an id, the tiles
+and optionally the expected solution length; further columns, such as a
+published node count, are ignored. Tiles use 0 for the empty cell and
+follow the usual convention of published instance sets: the goal has the
+empty cell first, 0 1 2 ... 15. Pass --blank-last for files that use the
+game's own goal, 1 2 ... 15 0.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "games"))
+
+from engine.fifteen import is_solvable_board
+from engine.solver import solve, HEURISTICS
+
+DEFAULT_INSTANCES = os.path.join(BENCH_DIR, "fifteen_instances.txt")
+
+
+class Instance:
+    """One puzzle to solve, with tiles in the game's convention."""
+
+    def __init__(self, name, tiles, grid_size, expected=None):
+        self.name = name
+        self.tiles = tiles
+        self.grid_size = grid_size
+        self.expected = expected
+
+
+def from_blank_first(tiles):
+    """Convert tiles whose goal is 0 1 .. n-1 to the game's 1 .. n-1 0.
+
+    Turning the board half a turn and renumbering tile t as n - t maps one
+    goal onto the other, and every solution keeps its length.
+    """
+    size = len(tiles)
+    return [size - tile if tile else 0 for tile in reversed(tiles)]
+
+
+def read_instances(path, grid_size=4, blank_first=True):
+    size = grid_size * grid_size
+    instances = []
+    with open(path) as instance_file:
+        for line_number, line in enumerate(instance_file, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            numbers = [int(field) for field in fields]
+
+            if len(numbers) == size:
+                name, tiles, rest = str(len(instances) + 1), numbers, []
+            else:
+                name, tiles, rest = fields[0], numbers[1:size + 1], numbers[size + 1:]
+            if sorted(tiles) != list(range(size)):
+                raise ValueError(f"{path}:{line_number}: not a {grid_size}x{grid_size} board")
+            if blank_first:
+                tiles = from_blank_first(tiles)
+            if not is_solvable_board(tiles, grid_size):
+                raise ValueError(f"{path}:{line_number}: instance {name} cannot be solved")
+            expected = rest[0] if rest else None
+            instances.append(Instance(name, tiles, grid_size, expected))
+    return instances
+
+
+def replay(tiles, grid_size, moves):
+    """Return True if sliding `moves` in order solves the board."""
+    board = list(tiles)
+    blank = board.index(0)
+    for tile in moves:
+        cell = board.index(tile)
+        distance = abs(cell % grid_size - blank % grid_size) + abs(cell // grid_size - blank // grid_size)
+        if distance != 1:
+            return False
+        board[blank], board[cell] = tile, 0
+        blank = cell
+    return board == list(range(1, grid_size * grid_size)) + [0]
+
+
+def solve_instance(instance, heuristic_name, max_nodes):
+    """Solve one instance in a worker process and return its result row."""
+    heuristic = HEURISTICS[heuristic_name](instance.grid_size)
+    if heuristic is None:
+        raise RuntimeError(f"The {heuristic_name} heuristic is not available for "
+                           f"{instance.grid_size}x{instance.grid_size}")
+
+    started = time.perf_counter()
+    solution = solve(instance.tiles, instance.grid_size, heuristic, max_nodes=max_nodes)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "instance": instance.name,
+        "expected": instance.expected,
+        "length": None,
+        "nodes": None,
+        "nodes_per_s": None,
+        "elapsed_s": round(elapsed, 3),
+        "status": "budget",
+    }
+    if solution is None:
+        return result
+    result["length"] = len(solution)
+    result["nodes"] = solution.nodes
+    result["nodes_per_s"] = round(solution.nodes / elapsed) if elapsed > 0 else None
+    if not replay(instance.tiles, instance.grid_size, solution.moves):
+        result["status"] = "invalid"
+    elif instance.expected is not None and len(solution) != instance.expected:
+        result["status"] = "wrong length"
+    else:
+        result["status"] = "ok"
+    return result
+
+
+def print_row(result):
+    length = "-" if result["length"] is None else result["length"]
+    nodes = "-" if result["nodes"] is None else f"{result['nodes']:,}"
+    rate = "-" if result["nodes_per_s"] is None else f"{result['nodes_per_s']:,}"
+    print(f"{result['instance']:>8} {length:>6} {nodes:>14} {rate:>10} "
+          f"{result['elapsed_s']:9.2f}s  {result['status']}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("instances", nargs="?", default=DEFAULT_INSTANCES,
+                        help="instance file (default: benchmarks/fifteen_instances.txt)")
+    parser.add_argument("--size", type=int, default=4,
+                        help="board size of the instances (default: 4)")
+    parser.add_argument("--heuristic", choices=sorted(HEURISTICS),
+                        default="pdb+walking-distance",
+                        help="heuristic to search with (default: pdb+walking-distance)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--max-nodes", type=int,
+                        help="give up on an instance after this many expanded nodes")
+    parser.add_argument("--limit", type=int, help="only solve the first LIMIT instances")
+    parser.add_argument("--blank-last", action="store_true",
+                        help="the file's goal has the empty cell last, as in the game")
+    parser.add_argument("--output", help="write JSON results to this file")
+    args = parser.parse_args()
+
+    if HEURISTICS[args.heuristic](args.size) is None:
+        print(f"The {args.heuristic} heuristic is not available for {args.size}x{args.size}; "
+              "build the pattern databases with "
+              "`cd games && python3 -c \"from engine.pattern_db import main; main()\"`")
+        return 2
+
+    instances = read_instances(args.instances, args.size, not args.blank_last)[:args.limit]
+    print(f"{'instance':>8} {'length':>6} {'nodes':>14} {'nodes/s':>10} {'time':>10}  status")
+
+    started = time.perf_counter()
+    results = []
+    # Worker processes map the pattern database files too, so they share
+    # one copy of the tables
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(solve_instance, instance, args.heuristic, args.max_nodes)
+                   for instance in instances]
+        for future in as_completed(futures):
+            result = future.result()
+            print_row(result)
+            results.append(result)
+    wall = time.perf_counter() - started
+
+    order = {instance.name: i for i, instance in enumerate(instances)}
+    results.sort(key=lambda result: order[result["instance"]])
+    solved = [result for result in results if result["nodes"] is not None]
+    total_nodes = sum(result["nodes"] for result in solved)
+    cpu = sum(result["elapsed_s"] for result in solved)
+    failed = [result for result in results if result["status"] in ("invalid", "wrong length")]
+
+    print(f"\nSolved {len(solved)}/{len(results)} with {args.heuristic} in {wall:.1f}s "
+          f"on {args.workers} workers: {total_nodes:,} nodes, "
+          f"{total_nodes / cpu if cpu else 0:,.0f} nodes/s per worker")
+    for result in failed:
+        print(f"FAILED {result['instance']}: {result['status']} "
+              f"(length {result['length']}, expected {result['expected']})")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "heuristic": args.heuristic,
+            "workers": args.workers,
+            "wall_s": round(wall, 3),
+            "total_nodes": total_nodes,
+            "results": results,
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
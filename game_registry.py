@@ -0,0 +1,137 @@
+"""
+In-process registry of the game modules shown in the launcher.
+
+Each game script is imported at most once; later launches reuse the cached
+module and its run() entry point until the file changes on disk. Game
+modules build Gtk objects when they are imported, and GTK is not thread
+safe, so preloading imports one game per idle callback of the main loop
+instead of on a worker thread; the launcher stays responsive between
+imports. The cache itself is safe to use from worker threads.
+"""
+
+import ast
+import importlib.util
+import os
+import sys
+import threading
+
+from gi.repository import GLib
+
+
+class GameEntry:
+    """A loaded game module and the entry point the launcher should call."""
+
+    def __init__(self, script_path, mtime, module=None, entry_point=None, error=None):
+        self.script_path = script_path
+        self.mtime = mtime
+        self.module = module
+        self.entry_point = entry_point
+        self.error = error
+
+
+class GameRegistry:
+    """Cache of imported game modules keyed by script path."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.path_locks = {}
+
+    def script_path(self, path):
+        """Return the absolute path of a game script relative to base_dir."""
+        return os.path.join(self.base_dir, path)
+
+    def load(self, path):
+        """Return the GameEntry for `path`, importing it only if needed.
+
+        The cached entry is reused until the script's mtime changes. A module
+        that failed to import is cached too (with entry.error set), so a
+        broken game is not re-executed on every click.
+        """
+        script_path = self.script_path(path)
+        mtime = os.path.getmtime(script_path)
+
+        with self.lock:
+            entry = self.entries.get(script_path)
+            if entry is not None and entry.mtime == mtime:
+                return entry
+            path_lock = self.path_locks.setdefault(script_path, threading.Lock())
+
+        # Only one thread imports a given script; others wait for its result
+        with path_lock:
+            with self.lock:
+                entry = self.entries.get(script_path)
+            if entry is None or entry.mtime != mtime:
+                entry = self._import(script_path, mtime)
+                with self.lock:
+                    self.entries[script_path] = entry
+        return entry
+
+    def has_entry_point(self, path):
+        """True if the script defines a top-level run(), read without importing it.
+
+        Scripts that do not parse are reported as having none.
+        """
+        try:
+            with open(self.script_path(path), encoding="utf-8") as script:
+                tree = ast.parse(script.read())
+        except (OSError, SyntaxError, ValueError):
+            return False
+        return any(isinstance(node, ast.FunctionDef) and node.name == "run"
+                   for node in tree.body)
+
+    def preload(self, paths):
+        """Import the given games from the main loop, one per idle callback.
+
+        Only games with a run() entry point are imported, since the others
+        are always launched in a worker process, and games whose import
+        already failed are skipped. Returns the GLib source id of the
+        pending callback, or None if there is nothing to import.
+        """
+        pending = []
+        for path in paths:
+            with self.lock:
+                entry = self.entries.get(self.script_path(path))
+            if entry is not None and entry.error is not None:
+                continue
+            if self.has_entry_point(path):
+                pending.append(path)
+        if not pending:
+            return None
+
+        def load_next():
+            try:
+                self.load(pending.pop(0))
+            except OSError as e:
+                print(f"Error preloading game: {e}")
+            return GLib.SOURCE_CONTINUE if pending else GLib.SOURCE_REMOVE
+
+        return GLib.idle_add(load_next, priority=GLib.PRIORITY_LOW)
+
+    def invalidate(self, path=None):
+        """Forget one cached game, or all of them when path is None."""
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(self.script_path(path), None)
+
+    def _import(self, script_path, mtime):
+        # Let games import their sibling helpers (game_paths, ...) the same
+        # way they do when run as a script
+        games_dir = os.path.dirname(script_path)
+        with self.lock:
+            if games_dir not in sys.path:
+                sys.path.insert(0, games_dir)
+
+        module_name = "mathgames_" + os.path.splitext(os.path.basename(script_path))[0]
+        try:
+            spec = importlib.util.spec_from_file_location(module_name, script_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception as e:
+            return GameEntry(script_path, mtime, error=e)
+
+        entry_point = getattr(module, 'run', None)
+        return GameEntry(script_path, mtime, module=module, entry_point=entry_point)
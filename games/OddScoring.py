@@ -9,7 +9,6 @@ A game with two modes: Sum to Target and Countdown to Zero
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, GLib, Gdk
-import random
 import os
 from sugar3.activity import activity
 from sugar3.graphics.style import GRID_CELL_SIZE
@@ -17,6 +16,8 @@ from sugar3.graphics.toolbarbox import ToolbarBox
 from sugar3.activity.widgets import ActivityToolbarButton
 from sugar3.activity.widgets import StopButton
 
+from engine.odd_scoring import OddScoringGame
+
 
 class OddScoringActivity(activity.Activity):
     """Main activity class for the Math Challenges game."""
@@ -72,14 +73,8 @@ class OddScoringActivity(activity.Activity):
             self.main_box.set_name("odd-scoring-window")
             self.set_canvas(self.main_box)
         
-        # Game variables
-        self.target_sum = 21  # Target sum to reach
-        self.current_sum = 0  # Running sum starts at 0
-        self.human_moves = 0
-        self.computer_moves = 0
-        self.game_over = False
-        self.game_mode = "sum"  # Default mode: "sum" or "countdown"
-        self.difficulty = "normal"  # Default difficulty: "easy", "normal", "hard"
+        # Game variables (sum mode, normal difficulty by default)
+        self.game = OddScoringGame()
         
         # Create and show title screen
         self.show_title_screen()
@@ -336,7 +331,7 @@ class OddScoringActivity(activity.Activity):
         sum_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         sum_card.set_size_request(280, 350)
         sum_card.get_style_context().add_class("mode-card")
-        if self.game_mode == "sum":
+        if self.game.game_mode == "sum":
             sum_card.get_style_context().add_class("mode-card-selected")
         
         sum_title = Gtk.Label()
@@ -378,7 +373,7 @@ class OddScoringActivity(activity.Activity):
         countdown_card = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
         countdown_card.set_size_request(280, 350)
         countdown_card.get_style_context().add_class("mode-card")
-        if self.game_mode == "countdown":
+        if self.game.game_mode == "countdown":
             countdown_card.get_style_context().add_class("mode-card-selected")
         
         countdown_title = Gtk.Label()
@@ -431,7 +426,7 @@ class OddScoringActivity(activity.Activity):
     
     def on_mode_selected(self, button, mode):
         """Handle game mode selection."""
-        self.game_mode = mode
+        self.game.game_mode = mode
         self.show_difficulty_selection()
     
     def show_difficulty_selection(self):
@@ -446,7 +441,7 @@ class OddScoringActivity(activity.Activity):
         difficulty_container.set_valign(Gtk.Align.CENTER)
         
         # Header
-        mode_name = "Sum to Target" if self.game_mode == "sum" else "Countdown to Zero"
+        mode_name = "Sum to Target" if self.game.game_mode == "sum" else "Countdown to Zero"
         header_label = Gtk.Label()
         header_label.set_markup(f"<span size='x-large' weight='bold'>{mode_name}</span>")
         header_label.set_margin_top(20)
@@ -467,7 +462,7 @@ class OddScoringActivity(activity.Activity):
         easy_button = Gtk.Button(label="Easy")
         easy_button.get_style_context().add_class("difficulty-button")
         easy_button.get_style_context().add_class("difficulty-easy")
-        if self.difficulty == "easy":
+        if self.game.difficulty == "easy":
             easy_button.get_style_context().add_class("difficulty-selected")
         easy_button.connect("clicked", self.on_difficulty_selected, "easy")
         difficulties_box.pack_start(easy_button, False, False, 0)
@@ -476,7 +471,7 @@ class OddScoringActivity(activity.Activity):
         normal_button = Gtk.Button(label="Normal")
         normal_button.get_style_context().add_class("difficulty-button")
         normal_button.get_style_context().add_class("difficulty-normal")
-        if self.difficulty == "normal":
+        if self.game.difficulty == "normal":
             normal_button.get_style_context().add_class("difficulty-selected")
         normal_button.connect("clicked", self.on_difficulty_selected, "normal")
         difficulties_box.pack_start(normal_button, False, False, 0)
@@ -485,7 +480,7 @@ class OddScoringActivity(activity.Activity):
         hard_button = Gtk.Button(label="Hard")
         hard_button.get_style_context().add_class("difficulty-button")
         hard_button.get_style_context().add_class("difficulty-hard")
-        if self.difficulty == "hard":
+        if self.game.difficulty == "hard":
             hard_button.get_style_context().add_class("difficulty-selected")
         hard_button.connect("clicked", self.on_difficulty_selected, "hard")
         difficulties_box.pack_start(hard_button, False, False, 0)
@@ -524,15 +519,8 @@ class OddScoringActivity(activity.Activity):
     
     def on_difficulty_selected(self, button, difficulty):
         """Handle difficulty selection."""
-        self.difficulty = difficulty
-        
         # Update target based on difficulty
-        if difficulty == "easy":
-            self.target_sum = 15
-        elif difficulty == "normal":
-            self.target_sum = 21
-        elif difficulty == "hard":
-            self.target_sum = 30
+        self.game.set_difficulty(difficulty)
         
         # Refresh the UI to show the selection
         self.show_difficulty_selection()
@@ -540,14 +528,7 @@ class OddScoringActivity(activity.Activity):
     def on_start_game(self, button):
         """Start a new game when the Start Game button is clicked."""
         # Reset game state
-        if self.game_mode == "sum":
-            self.current_sum = 0
-        else:  # countdown
-            self.current_sum = self.target_sum
-        
-        self.human_moves = 0
-        self.computer_moves = 0
-        self.game_over = False
+        self.game.start()
         
         # Switch to game screen
         self.show_game_screen()
@@ -562,9 +543,9 @@ class OddScoringActivity(activity.Activity):
         info_bar = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         
         # Mode indicator
-        mode_name = "Sum to Target" if self.game_mode == "sum" else "Countdown to Zero"
+        mode_name = "Sum to Target" if self.game.game_mode == "sum" else "Countdown to Zero"
         mode_label = Gtk.Label()
-        mode_label.set_markup(f"<span font_desc='14'><b>{mode_name}</b> | {self.difficulty.capitalize()}</span>")
+        mode_label.set_markup(f"<span font_desc='14'><b>{mode_name}</b> | {self.game.difficulty.capitalize()}</span>")
         mode_label.set_halign(Gtk.Align.START)
         info_bar.pack_start(mode_label, True, True, 10)
         
@@ -618,18 +599,18 @@ class OddScoringActivity(activity.Activity):
         game_container.set_margin_bottom(20)
         
         # Current and target values
-        if self.game_mode == "sum":
+        if self.game.game_mode == "sum":
             current_label = Gtk.Label()
             current_label.set_markup("<span size='large' weight='bold'>Current Sum:</span>")
             game_container.pack_start(current_label, False, False, 0)
             
             self.current_value_display = Gtk.Label()
             self.current_value_display.get_style_context().add_class("sum-value")
-            self.current_value_display.set_markup(f"<span>{self.current_sum}</span>")
+            self.current_value_display.set_markup(f"<span>{self.game.current_sum}</span>")
             game_container.pack_start(self.current_value_display, False, False, 0)
             
             target_label = Gtk.Label()
-            target_label.set_markup(f"<span size='large' weight='bold'>Target: {self.target_sum}</span>")
+            target_label.set_markup(f"<span size='large' weight='bold'>Target: {self.game.target_sum}</span>")
             target_label.get_style_context().add_class("target-value")
             game_container.pack_start(target_label, False, False, 10)
         else:  # countdown mode
@@ -639,7 +620,7 @@ class OddScoringActivity(activity.Activity):
             
             self.current_value_display = Gtk.Label()
             self.current_value_display.get_style_context().add_class("countdown-value")
-            self.current_value_display.set_markup(f"<span>{self.current_sum}</span>")
+            self.current_value_display.set_markup(f"<span>{self.game.current_sum}</span>")
             game_container.pack_start(self.current_value_display, False, False, 0)
             
             target_label = Gtk.Label()
@@ -659,8 +640,8 @@ class OddScoringActivity(activity.Activity):
         
         # Game rules reminder
         rules_reminder = Gtk.Label()
-        if self.game_mode == "sum":
-            rules_reminder.set_text(f"First to reach EXACTLY {self.target_sum} wins!")
+        if self.game.game_mode == "sum":
+            rules_reminder.set_text(f"First to reach EXACTLY {self.game.target_sum} wins!")
         else:  # countdown
             rules_reminder.set_text("First to reach EXACTLY 0 wins!")
         rules_reminder.get_style_context().add_class("rule-label")
@@ -672,7 +653,7 @@ class OddScoringActivity(activity.Activity):
         self.move_buttons = []  # Store references to the move buttons
         
         for move in range(1, 4):
-            action = "Add" if self.game_mode == "sum" else "Subtract"
+            action = "Add" if self.game.game_mode == "sum" else "Subtract"
             move_button = Gtk.Button(label=f"{action} {move}")
             move_button.get_style_context().add_class("move-button")
             move_button.connect("clicked", self.on_move_clicked, move)
@@ -690,41 +671,36 @@ class OddScoringActivity(activity.Activity):
     
     def update_progress(self):
         """Update the progress bar to show progress toward target."""
-        if self.game_mode == "sum":
-            fraction = min(1.0, self.current_sum / self.target_sum)
+        if self.game.game_mode == "sum":
+            fraction = min(1.0, self.game.current_sum / self.game.target_sum)
             self.progress_bar.set_fraction(fraction)
-            self.progress_bar.set_text(f"{self.current_sum} / {self.target_sum}")
+            self.progress_bar.set_text(f"{self.game.current_sum} / {self.game.target_sum}")
         else:  # countdown
-            fraction = 1.0 - min(1.0, self.current_sum / self.target_sum)
+            fraction = 1.0 - min(1.0, self.game.current_sum / self.game.target_sum)
             self.progress_bar.set_fraction(fraction)
-            self.progress_bar.set_text(f"{self.current_sum} → 0")
+            self.progress_bar.set_text(f"{self.game.current_sum} → 0")
         
         self.progress_bar.set_show_text(True)
     
     def update_game_ui(self):
         """Update the UI to reflect the current game state."""
         # Update move counts
-        self.human_moves_label.set_text(f"{self.human_moves}")
-        self.computer_moves_label.set_text(f"{self.computer_moves}")
+        self.human_moves_label.set_text(f"{self.game.human_moves}")
+        self.computer_moves_label.set_text(f"{self.game.computer_moves}")
         
         # Update current value display
-        self.current_value_display.set_markup(f"<span>{self.current_sum}</span>")
+        self.current_value_display.set_markup(f"<span>{self.game.current_sum}</span>")
         
         # Update progress bar
         self.update_progress()
     
     def on_move_clicked(self, button, move):
         """Handle player's move."""
-        if self.game_over:
+        if self.game.game_over:
             return
         
         # Update current sum based on game mode
-        if self.game_mode == "sum":
-            self.current_sum += move
-        else:  # countdown
-            self.current_sum -= move
-        
-        self.human_moves += 1
+        self.game.apply_move(move, human=True)
         
         # Update UI with animation
         button.get_style_context().add_class("animation-container")
@@ -745,21 +721,16 @@ class OddScoringActivity(activity.Activity):
     
     def computer_move(self):
         """Execute computer's move."""
-        if self.game_over:
+        if self.game.game_over:
             return False
         
-        move = self.calculate_computer_move()
+        move = self.game.calculate_computer_move()
         
         # Update sum based on game mode
-        if self.game_mode == "sum":
-            self.current_sum += move
-        else:  # countdown
-            self.current_sum -= move
-        
-        self.computer_moves += 1
+        self.game.apply_move(move, human=False)
         
         # Update UI
-        self.status_label.set_markup(f"<span size='large' weight='bold'>Your Turn (Computer {('added' if self.game_mode == 'sum' else 'subtracted')} {move})</span>")
+        self.status_label.set_markup(f"<span size='large' weight='bold'>Your Turn (Computer {('added' if self.game.game_mode == 'sum' else 'subtracted')} {move})</span>")
         self.update_game_ui()
         
         # Check if game over
@@ -771,151 +742,26 @@ class OddScoringActivity(activity.Activity):
         
         return False
     
-    def calculate_computer_move(self):
-        """Calculate the computer's move based on game mode and difficulty."""
-        if self.game_mode == "sum":
-            # Calculate optimal move for sum mode
-            remaining = self.target_sum - self.current_sum
-            
-            if self.difficulty == "easy":
-                # Easy: Just random moves
-                valid_moves = [i for i in range(1, 4) if self.current_sum + i <= self.target_sum]
-                return random.choice(valid_moves) if valid_moves else 1
-            
-            elif self.difficulty == "normal":
-                # Normal: Some strategy but not perfect
-                if remaining <= 3:
-                    # Can win in one move
-                    return remaining
-                elif random.random() < 0.7:  # 70% chance of making optimal move
-                    return self.get_optimal_sum_move(remaining)
-                else:
-                    # Random move
-                    valid_moves = [i for i in range(1, 4) if self.current_sum + i <= self.target_sum]
-                    return random.choice(valid_moves) if valid_moves else 1
-            
-            else:  # hard
-                # Hard: Always optimal
-                if remaining <= 3:
-                    # Can win in one move
-                    return remaining
-                else:
-                    return self.get_optimal_sum_move(remaining)
-        
-        else:  # countdown mode
-            if self.difficulty == "easy":
-                # Easy: Just random moves
-                valid_moves = [i for i in range(1, 4) if self.current_sum - i >= 0]
-                return random.choice(valid_moves) if valid_moves else 1
-            
-            elif self.difficulty == "normal":
-                # Normal: Some strategy but not perfect
-                if self.current_sum <= 3:
-                    # Can win in one move
-                    return self.current_sum
-                elif random.random() < 0.7:  # 70% chance of making optimal move
-                    return self.get_optimal_countdown_move()
-                else:
-                    # Random move
-                    valid_moves = [i for i in range(1, 4) if self.current_sum - i >= 0]
-                    return random.choice(valid_moves) if valid_moves else 1
-            
-            else:  # hard
-                # Hard: Always optimal
-                if self.current_sum <= 3:
-                    # Can win in one move
-                    return self.current_sum
-                else:
-                    return self.get_optimal_countdown_move()
-    
-    def get_optimal_sum_move(self, remaining):
-        """Get the optimal move for sum mode."""
-        if remaining == 4:
-            # Force player into a losing position
-            return 3
-        elif remaining % 4 == 0:
-            # Leave a multiple of 4 to maintain advantage
-            return 3
-        elif remaining % 4 == 1:
-            # Leave a multiple of 4 to maintain advantage
-            return 1
-        elif remaining % 4 == 2:
-            # Leave a multiple of 4 to maintain advantage
-            return 2
-        else:  # remaining % 4 == 3
-            # Leave a multiple of 4 to maintain advantage
-            return 3
-    
-    def get_optimal_countdown_move(self):
-        """Get the optimal move for countdown mode."""
-        if self.current_sum % 4 == 0:
-            return 3
-        elif self.current_sum % 4 == 1:
-            return 1
-        elif self.current_sum % 4 == 2:
-            return 2
-        else:  # current_sum % 4 == 3
-            return 3
-    
     def update_move_buttons(self):
         """Update move buttons based on current game state."""
         if hasattr(self, 'move_buttons'):
             for i, button in enumerate(self.move_buttons):
                 move = i + 1
-                if self.game_mode == "sum":
-                    button.set_sensitive(not self.game_over and self.current_sum + move <= self.target_sum)
-                else:  # countdown
-                    button.set_sensitive(not self.game_over and self.current_sum - move >= 0)
+                button.set_sensitive(not self.game.game_over and self.game.is_legal(move))
     
     def check_game_over(self):
         """Check if the game is over and handle end game if needed."""
-        if self.game_mode == "sum":
-            if self.current_sum >= self.target_sum:
-                self.end_game()
-                return True
-        else:  # countdown
-            if self.current_sum <= 0:
-                self.end_game()
-                return True
+        if self.game.check_game_over():
+            self.end_game()
+            return True
         return False
     
     def end_game(self):
         """End the game and show the results."""
-        self.game_over = True
+        self.game.game_over = True
         
         # Determine winner based on game mode
-        if self.game_mode == "sum":
-            if self.current_sum == self.target_sum:
-                # Last player to move wins
-                if self.human_moves > self.computer_moves:
-                    winner = "You Win!"
-                    message = f"You reached exactly {self.target_sum}!"
-                else:
-                    winner = "Computer Wins!"
-                    message = f"Computer reached exactly {self.target_sum}!"
-            else:  # Over the target
-                if self.human_moves > self.computer_moves:
-                    winner = "Computer Wins!"
-                    message = f"You went over {self.target_sum}!"
-                else:
-                    winner = "You Win!"
-                    message = f"Computer went over {self.target_sum}!"
-        else:  # countdown
-            if self.current_sum == 0:
-                # Last player to move wins
-                if self.human_moves > self.computer_moves:
-                    winner = "You Win!"
-                    message = "You reached exactly 0!"
-                else:
-                    winner = "Computer Wins!"
-                    message = "Computer reached exactly 0!"
-            else:  # Under zero
-                if self.human_moves > self.computer_moves:
-                    winner = "Computer Wins!"
-                    message = "You went below 0!"
-                else:
-                    winner = "You Win!"
-                    message = "Computer went below 0!"
+        winner, message = self.game.result()
         
         # Show end screen
         self.show_end_screen(winner, message)
@@ -951,10 +797,10 @@ class OddScoringActivity(activity.Activity):
         
         # Final value display
         final_value = Gtk.Label()
-        if self.game_mode == "sum":
-            final_value.set_markup(f"<span size='x-large' weight='bold'>Final Sum: {self.current_sum}</span>")
+        if self.game.game_mode == "sum":
+            final_value.set_markup(f"<span size='x-large' weight='bold'>Final Sum: {self.game.current_sum}</span>")
         else:  # countdown
-            final_value.set_markup(f"<span size='x-large' weight='bold'>Final Value: {self.current_sum}</span>")
+            final_value.set_markup(f"<span size='x-large' weight='bold'>Final Value: {self.game.current_sum}</span>")
         end_container.pack_start(final_value, False, False, 10)
         
         # Move counts in frames like the game screen
@@ -965,7 +811,7 @@ class OddScoringActivity(activity.Activity):
         human_frame = Gtk.Frame(label="Your Moves")
         human_frame.set_label_align(0.5, 0.5)
         human_frame.get_style_context().add_class("stat-frame")
-        human_label = Gtk.Label(label=f"{self.human_moves}")
+        human_label = Gtk.Label(label=f"{self.game.human_moves}")
         human_label.get_style_context().add_class("stat-label")
         human_frame.add(human_label)
         stats_box.pack_start(human_frame, True, True, 0)
@@ -974,7 +820,7 @@ class OddScoringActivity(activity.Activity):
         comp_frame = Gtk.Frame(label="Computer Moves")
         comp_frame.set_label_align(0.5, 0.5)
         comp_frame.get_style_context().add_class("stat-frame")
-        comp_label = Gtk.Label(label=f"{self.computer_moves}")
+        comp_label = Gtk.Label(label=f"{self.game.computer_moves}")
         comp_label.get_style_context().add_class("stat-label")
         comp_frame.add(comp_label)
         stats_box.pack_start(comp_frame, True, True, 0)
@@ -983,7 +829,7 @@ class OddScoringActivity(activity.Activity):
         total_frame = Gtk.Frame(label="Total Moves")
         total_frame.set_label_align(0.5, 0.5)
         total_frame.get_style_context().add_class("stat-frame")
-        total_label = Gtk.Label(label=f"{self.human_moves + self.computer_moves}")
+        total_label = Gtk.Label(label=f"{self.game.human_moves + self.game.computer_moves}")
         total_label.get_style_context().add_class("stat-label")
         total_frame.add(total_label)
         stats_box.pack_start(total_frame, True, True, 0)
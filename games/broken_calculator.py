@@ -1,9 +1,10 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GLib, Pango
-import random
 import re
 
+from engine.broken_calculator import BrokenCalculatorGame
+
 class BrokenCalculatorApp(Gtk.Window):
     def __init__(self):
         Gtk.Window.__init__(self, title="Broken Calculator")
@@ -14,14 +15,8 @@ class BrokenCalculatorApp(Gtk.Window):
         # Set a playful window icon (optional, requires icon file)
         # self.set_icon_from_file("/path/to/icon.png")
         
-        # Game state variables
-        self.difficulty = 1  # Default: Easy
-        self.max_attempts = 5
-        self.total_score = 0
-        self.rounds_played = 0
-        self.current_attempt = 0
-        self.target_number = 0
-        self.available_buttons = []
+        # Game state variables (easy difficulty by default)
+        self.game = BrokenCalculatorGame()
         self.game_active = False
         self.animation_timeout_id = None
         
@@ -488,19 +483,16 @@ class BrokenCalculatorApp(Gtk.Window):
         """Start a new game with the selected difficulty"""
         # Set difficulty based on selection
         if self.diff_medium.get_active():
-            self.difficulty = 2
+            difficulty = 2
         elif self.diff_hard.get_active():
-            self.difficulty = 3
+            difficulty = 3
         else:
-            self.difficulty = 1
+            difficulty = 1
             
-        # Reset game state
-        self.total_score = 0
-        self.rounds_played = 0
+        # Reset game state and start the first round
+        self.game.start(difficulty)
         self.score_label.set_text("0")
-        
-        # Start the first round
-        self.start_new_round()
+        self.show_round()
         
         # Update UI state
         self.game_active = True
@@ -509,68 +501,30 @@ class BrokenCalculatorApp(Gtk.Window):
         
     def on_next_round(self, button):
         """Start a new round"""
-        self.start_new_round()
+        self.game.new_round()
+        self.show_round()
         self.next_button.set_sensitive(False)
         
-    def start_new_round(self):
-        """Set up a new round of the game"""
-        # Increment round counter
-        self.rounds_played += 1
-        self.round_label.set_text(str(self.rounds_played))
-        
-        # Reset attempt counter
-        self.current_attempt = 0
+    def show_round(self):
+        """Show a freshly started round of the game"""
+        self.round_label.set_text(str(self.game.rounds_played))
         self.update_attempts_label()
         
-        # Generate target number based on difficulty
-        if self.difficulty == 1:
-            self.target_number = random.randint(10, 50)
-        elif self.difficulty == 2:
-            self.target_number = random.randint(20, 100)
-        else:
-            self.target_number = random.randint(50, 200)
-            
-        self.target_label.set_markup(f"<span size='20000' weight='bold' foreground='#0077cc'>{self.target_number}</span>")
+        self.target_label.set_markup(f"<span size='20000' weight='bold' foreground='#0077cc'>{self.game.target_number}</span>")
         
-        # Generate available buttons based on difficulty
-        self.generate_available_buttons()
+        # Show which buttons are broken this round
+        self.show_available_buttons()
         
         # Reset display
         self.display.set_text("")
         
         # Update feedback
-        self.feedback_label.set_text(f"Round {self.rounds_played}: Try to reach {self.target_number}")
-        
-    def generate_available_buttons(self):
-        """Generate a random set of available buttons for the calculator based on difficulty"""
-        all_digits = list("0123456789")
-        all_operators = list("+-*/")
-        
-        # Set number of broken buttons based on difficulty
-        if self.difficulty == 1:  # Easy
-            broken_digits = 2
-            broken_operators = 1
-        elif self.difficulty == 2:  # Medium
-            broken_digits = 3
-            broken_operators = 2
-        else:  # Hard
-            broken_digits = 4
-            broken_operators = 1
-        
-        # Select buttons to break
-        broken_digit_buttons = random.sample(all_digits, broken_digits)
-        broken_operator_buttons = random.sample(all_operators, broken_operators)
-        
-        # Generate available buttons by removing broken ones
-        available_digits = [d for d in all_digits if d not in broken_digit_buttons]
-        available_operators = [op for op in all_operators if op not in broken_operator_buttons]
-        
-        # Always include = and C buttons
-        self.available_buttons = available_digits + available_operators + ["=", "C"]
-        
-        # Update the UI to show which buttons are broken
+        self.feedback_label.set_text(f"Round {self.game.rounds_played}: Try to reach {self.game.target_number}")
+        
+    def show_available_buttons(self):
+        """Update the calculator buttons to show which ones are broken"""
         for label, button in self.calc_buttons.items():
-            if label in self.available_buttons:
+            if label in self.game.available_buttons:
                 button.set_sensitive(True)
                 button.get_style_context().remove_class("broken-button")
             else:
@@ -578,8 +532,8 @@ class BrokenCalculatorApp(Gtk.Window):
                 button.get_style_context().add_class("broken-button")
                 
         # Display information about broken buttons
-        broken_digits_str = ", ".join(broken_digit_buttons)
-        broken_ops_str = ", ".join(broken_operator_buttons)
+        broken_digits_str = ", ".join(self.game.broken_digits)
+        broken_ops_str = ", ".join(self.game.broken_operators)
         msg = f"Broken buttons: digits [{broken_digits_str}], operators [{broken_ops_str}]"
         self.feedback_label.set_text(msg)
                 
@@ -608,16 +562,12 @@ class BrokenCalculatorApp(Gtk.Window):
         if not expression:
             return
             
-        # Increment attempt counter
-        self.current_attempt += 1
-        self.update_attempts_label()
-        
         try:
-            # Try evaluating the expression
-            result = eval(expression)
+            # Try evaluating the expression (uses up an attempt)
+            result, correct = self.game.submit(expression)
             
             # Check if target is reached
-            if result == self.target_number:
+            if correct:
                 self.handle_success()
             else:
                 self.handle_wrong_answer(result)
@@ -625,21 +575,21 @@ class BrokenCalculatorApp(Gtk.Window):
             # Update display to show result
             self.display.set_text(str(result))
             
-        except Exception as e:
+        except ValueError:
             # Handle invalid expressions
             self.feedback_label.set_text("Invalid expression! Try again.")
+        
+        self.update_attempts_label()
             
         # Check if max attempts reached
-        if self.current_attempt >= self.max_attempts and not self.next_button.get_sensitive():
+        if self.game.out_of_attempts() and not self.next_button.get_sensitive():
             self.handle_game_over()
             
     def handle_success(self):
         """Handle the case when player reaches the target number"""
-        # Calculate score based on attempts left and difficulty
-        remaining_attempts = self.max_attempts - self.current_attempt
-        points = 10 + (remaining_attempts * 5) + (self.difficulty * 5)
-        self.total_score += points
-        self.score_label.set_text(str(self.total_score))
+        # Score is based on attempts left and difficulty
+        points = self.game.points()
+        self.score_label.set_text(str(self.game.total_score))
         
         # Update feedback
         self.feedback_label.set_markup(
@@ -675,7 +625,7 @@ class BrokenCalculatorApp(Gtk.Window):
         
         # Update the target label with the new size
         self.target_label.set_markup(
-            f"<span size='{self.pulse_size}' weight='bold' foreground='#0077cc'>{self.target_number}</span>"
+            f"<span size='{self.pulse_size}' weight='bold' foreground='#0077cc'>{self.game.target_number}</span>"
         )
         
         # Continue the animation for a few seconds
@@ -686,7 +636,7 @@ class BrokenCalculatorApp(Gtk.Window):
         if self.animation_counter >= 20:  # About 2 seconds
             self.animation_counter = 0
             self.target_label.set_markup(
-                f"<span size='20000' weight='bold' foreground='#0077cc'>{self.target_number}</span>"
+                f"<span size='20000' weight='bold' foreground='#0077cc'>{self.game.target_number}</span>"
             )
             self.animation_timeout_id = None
             return False
@@ -716,7 +666,7 @@ class BrokenCalculatorApp(Gtk.Window):
         
         # Target reached message
         target_label = Gtk.Label()
-        target_label.set_markup(f"<span size='large'>You reached the target: <b>{self.target_number}</b></span>")
+        target_label.set_markup(f"<span size='large'>You reached the target: <b>{self.game.target_number}</b></span>")
         content_box.pack_start(target_label, False, False, 5)
         
         # Points earned
@@ -757,7 +707,7 @@ class BrokenCalculatorApp(Gtk.Window):
     
     def handle_wrong_answer(self, result):
         """Handle the case when player's calculation doesn't match target"""
-        difference = abs(result - self.target_number)
+        difference = abs(result - self.game.target_number)
         
         if difference <= 5:
             feedback = "Very close! Just a little off."
@@ -766,7 +716,7 @@ class BrokenCalculatorApp(Gtk.Window):
         else:
             feedback = "Not quite there yet."
             
-        attempts_left = self.max_attempts - self.current_attempt
+        attempts_left = self.game.max_attempts - self.game.current_attempt
         if attempts_left > 0:
             feedback += f" ({attempts_left} attempts left)"
             
@@ -775,13 +725,13 @@ class BrokenCalculatorApp(Gtk.Window):
     def handle_game_over(self):
         """Handle the case when player has used all attempts"""
         self.feedback_label.set_markup(
-            f"<span foreground='#ff0000' weight='bold'>Game Over! The target was {self.target_number}</span>"
+            f"<span foreground='#ff0000' weight='bold'>Game Over! The target was {self.game.target_number}</span>"
         )
         self.next_button.set_sensitive(True)
         
     def update_attempts_label(self):
         """Update the attempts counter in the UI"""
-        self.attempts_label.set_text(f"{self.current_attempt}/{self.max_attempts}")
+        self.attempts_label.set_text(f"{self.game.current_attempt}/{self.game.max_attempts}")
         
     def on_hint_clicked(self, button):
         """Provide a hint for reaching the target number"""
@@ -794,40 +744,7 @@ class BrokenCalculatorApp(Gtk.Window):
         
     def generate_hint(self):
         """Generate a hint for reaching the target number"""
-        digits = [btn for btn in self.available_buttons if btn in "0123456789"]
-        operators = [btn for btn in self.available_buttons if btn in "+-*/"]
-        
-        # Simple hint strategy
-        if "+" in operators and self.target_number > 10:
-            a = random.randint(1, self.target_number-1)
-            b = self.target_number - a
-            if all(d in digits for d in str(a)) and all(d in digits for d in str(b)):
-                return f"Try adding two numbers to get {self.target_number}, like {a}+{b}."
-        
-        if "-" in operators:
-            a = random.randint(self.target_number+1, self.target_number+20)
-            b = a - self.target_number
-            if all(d in digits for d in str(a)) and all(d in digits for d in str(b)):
-                return f"Try subtracting from a larger number, like {a}-{b}."
-        
-        if "*" in operators and self.target_number > 1:
-            factors = [i for i in range(1, 11) if self.target_number % i == 0]
-            valid_factors = [f for f in factors if all(d in digits for d in str(f)) and 
-                             all(d in digits for d in str(self.target_number // f))]
-            if valid_factors:
-                factor = random.choice(valid_factors)
-                return f"Try multiplying {factor} by {self.target_number // factor}."
-        
-        if "/" in operators and self.target_number > 0:
-            multiples = [self.target_number * i for i in range(1, 11)]
-            valid_multiples = [m for m in multiples if all(d in digits for d in str(m))]
-            if valid_multiples:
-                multiple = random.choice(valid_multiples)
-                return f"Try dividing {multiple} by {multiple // self.target_number}."
-        
-        # Generic hint
-        available_ops = " and ".join([f"'{op}'" for op in operators])
-        return f"Try combining {available_ops} operations with your available digits."
+        return self.game.generate_hint()
 
 def main():
     """Main entry point for the application"""
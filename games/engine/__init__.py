@@ -0,0 +1,20 @@
+"""
+Display-independent game engines.
+
+Each module holds the rules, state and scoring of one game with no Gtk
+imports, so the logic can be tested, benchmarked and simulated headlessly.
+The Gtk windows in the parent directory are views over these models.
+"""
+
+from engine.board import PackedBoard, ArrayBoard, make_board
+from engine.expressions import ExpressionPool
+from engine.fifteen import FifteenPuzzle, is_solvable_board, random_solvable_board
+from engine.solver import solve
+from engine.fast_solver import solve_fast
+from engine.journal import MoveJournal, Replay
+from engine.scrambles import ScramblePool, generate_scramble
+from engine.euclid import EuclidsGame
+from engine.odd_scoring import OddScoringGame
+from engine.broken_calculator import BrokenCalculatorGame
+from engine.minesweeper import MinesweeperGame, QuestionGenerator
+from engine.number_ninja import NumberNinjaGame
@@ -0,0 +1,162 @@
+"""
+Compact sliding puzzle boards.
+
+Boards up to 4x4 are packed into a single int with 4 bits per cell (a
+4x4 board fits in 64 bits); bigger boards keep one byte per cell in a
+bytearray. Both types read like a flat row-major sequence with 0 for the
+empty cell and support the same operations:
+
+- slide(cell) moves the tile at `cell` into the empty cell in O(1)
+- equality and copy() work on the packed value or bytes
+- is_solved() compares against the solved value (O(1) when packed)
+
+Boards change in place, so they are not hashable; use key() for an
+immutable value, or the puzzle's Zobrist hash, to look positions up.
+
+Use make_board() to get the right type for a board size.
+"""
+
+from collections.abc import Sequence
+
+# Largest board whose cells fit in 4 bits each
+PACKED_MAX_SIZE = 4
+
+
+def solved_tiles(grid_size):
+    return list(range(1, grid_size * grid_size)) + [0]
+
+
+class PackedBoard:
+    """A board of up to 4x4 stored as one int, cell i in bits 4i..4i+3."""
+
+    __slots__ = ("grid_size", "value", "blank", "solved_value")
+
+    def __init__(self, grid_size, tiles):
+        self.grid_size = grid_size
+        self.value = 0
+        for cell, tile in enumerate(tiles):
+            self.value |= tile << (4 * cell)
+        self.blank = list(tiles).index(0)
+        self.solved_value = 0
+        for cell, tile in enumerate(solved_tiles(grid_size)):
+            self.solved_value |= tile << (4 * cell)
+
+    def __getitem__(self, cell):
+        return (self.value >> (4 * cell)) & 15
+
+    def __len__(self):
+        return self.grid_size * self.grid_size
+
+    def __iter__(self):
+        value = self.value
+        return iter([(value >> shift) & 15 for shift in range(0, 4 * len(self), 4)])
+
+    def index(self, tile):
+        if tile == 0:
+            return self.blank
+        return list(self).index(tile)
+
+    def slide(self, cell):
+        """Move the tile at `cell` into the empty cell; returns the tile."""
+        tile = (self.value >> (4 * cell)) & 15
+        self.value += (tile << (4 * self.blank)) - (tile << (4 * cell))
+        self.blank = cell
+        return tile
+
+    def is_solved(self):
+        return self.value == self.solved_value
+
+    def copy(self):
+        board = PackedBoard.__new__(PackedBoard)
+        board.grid_size = self.grid_size
+        board.value = self.value
+        board.blank = self.blank
+        board.solved_value = self.solved_value
+        return board
+
+    def key(self):
+        """The packed value; equal keys mean equal boards."""
+        return self.value
+
+    def __eq__(self, other):
+        if isinstance(other, PackedBoard):
+            return self.grid_size == other.grid_size and self.value == other.value
+        if isinstance(other, (ArrayBoard, Sequence)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PackedBoard({self.grid_size}, {list(self)})"
+
+
+class ArrayBoard:
+    """A board of any size stored as one byte per cell."""
+
+    __slots__ = ("grid_size", "cells", "blank", "solved_cells")
+
+    def __init__(self, grid_size, tiles):
+        self.grid_size = grid_size
+        self.cells = bytearray(tiles)
+        self.blank = self.cells.index(0)
+        self.solved_cells = bytes(solved_tiles(grid_size))
+
+    def __getitem__(self, cell):
+        return self.cells[cell]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def index(self, tile):
+        if tile == 0:
+            return self.blank
+        return self.cells.index(tile)
+
+    def slide(self, cell):
+        """Move the tile at `cell` into the empty cell; returns the tile."""
+        cells = self.cells
+        tile = cells[cell]
+        cells[self.blank] = tile
+        cells[cell] = 0
+        self.blank = cell
+        return tile
+
+    def is_solved(self):
+        return self.cells == self.solved_cells
+
+    def copy(self):
+        board = ArrayBoard.__new__(ArrayBoard)
+        board.grid_size = self.grid_size
+        board.cells = bytearray(self.cells)
+        board.blank = self.blank
+        board.solved_cells = self.solved_cells
+        return board
+
+    def key(self):
+        """An immutable copy of the cells; equal keys mean equal boards."""
+        return bytes(self.cells)
+
+    def __eq__(self, other):
+        if isinstance(other, ArrayBoard):
+            return self.cells == other.cells
+        if isinstance(other, (PackedBoard, Sequence)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ArrayBoard({self.grid_size}, {list(self)})"
+
+
+def make_board(grid_size, tiles=None):
+    """Return a packed or array board holding `tiles` (default: solved)."""
+    if tiles is None:
+        tiles = solved_tiles(grid_size)
+    if grid_size <= PACKED_MAX_SIZE:
+        return PackedBoard(grid_size, tiles)
+    return ArrayBoard(grid_size, tiles)
@@ -0,0 +1,142 @@
+"""
+Broken Calculator rules: reach a target number using only the calculator
+buttons that still work.
+"""
+
+import random
+
+DIGITS = "0123456789"
+OPERATORS = "+-*/"
+
+# (target range, broken digits, broken operators) per difficulty
+DIFFICULTY_SETTINGS = {
+    1: ((10, 50), 2, 1),   # Easy
+    2: ((20, 100), 3, 2),  # Medium
+    3: ((50, 200), 4, 1),  # Hard
+}
+
+
+class BrokenCalculatorGame:
+    """Round, attempt and score state for the Broken Calculator."""
+
+    def __init__(self, difficulty=1, max_attempts=5, rng=random):
+        self.random = rng
+        self.difficulty = difficulty
+        self.max_attempts = max_attempts
+        self.total_score = 0
+        self.rounds_played = 0
+        self.current_attempt = 0
+        self.target_number = 0
+        self.available_buttons = []
+        self.broken_digits = []
+        self.broken_operators = []
+        self.round_won = False
+
+    def start(self, difficulty):
+        """Reset the score and start the first round."""
+        self.difficulty = difficulty
+        self.total_score = 0
+        self.rounds_played = 0
+        self.new_round()
+
+    def new_round(self):
+        """Set up a new round of the game"""
+        self.rounds_played += 1
+        self.current_attempt = 0
+        self.round_won = False
+
+        (low, high), broken_digits, broken_operators = DIFFICULTY_SETTINGS[self.difficulty]
+        self.target_number = self.random.randint(low, high)
+        self.generate_available_buttons(broken_digits, broken_operators)
+
+    def generate_available_buttons(self, broken_digits, broken_operators):
+        """Pick which buttons are broken for this round"""
+        all_digits = list(DIGITS)
+        all_operators = list(OPERATORS)
+
+        self.broken_digits = self.random.sample(all_digits, broken_digits)
+        self.broken_operators = self.random.sample(all_operators, broken_operators)
+
+        # Generate available buttons by removing broken ones
+        available_digits = [d for d in all_digits if d not in self.broken_digits]
+        available_operators = [op for op in all_operators if op not in self.broken_operators]
+
+        # Always include = and C buttons
+        self.available_buttons = available_digits + available_operators + ["=", "C"]
+
+    def evaluate_expression(self, expression):
+        """Evaluate a calculator expression.
+
+        Only digits, a decimal point and + - * / are accepted; anything
+        else, or a malformed expression, raises ValueError. The point has
+        no button, but a division can leave a result like 2.5 on the
+        display that the next expression builds on. "**" is rejected too
+        since a calculator has no power key and huge powers would hang the
+        game.
+        """
+        if (not expression or "**" in expression or
+                any(ch not in DIGITS + OPERATORS + "." for ch in expression)):
+            raise ValueError(f"Invalid expression: {expression!r}")
+        try:
+            return eval(expression, {"__builtins__": {}}, {})
+        except (SyntaxError, ZeroDivisionError, OverflowError) as e:
+            raise ValueError(f"Invalid expression: {expression!r}") from e
+
+    def submit(self, expression):
+        """Use one attempt on `expression`; returns (result, correct).
+
+        Raises ValueError for invalid expressions (the attempt still counts).
+        """
+        self.current_attempt += 1
+        result = self.evaluate_expression(expression)
+        correct = result == self.target_number
+        if correct:
+            self.round_won = True
+            self.total_score += self.points()
+        return result, correct
+
+    def points(self):
+        """Points for solving the round at the current attempt."""
+        remaining_attempts = self.max_attempts - self.current_attempt
+        return 10 + (remaining_attempts * 5) + (self.difficulty * 5)
+
+    def out_of_attempts(self):
+        return self.current_attempt >= self.max_attempts
+
+    def generate_hint(self):
+        """Generate a hint for reaching the target number"""
+        digits = [btn for btn in self.available_buttons if btn in DIGITS]
+        operators = [btn for btn in self.available_buttons if btn in OPERATORS]
+        target = self.target_number
+
+        # Simple hint strategy
+        if "+" in operators and target > 10:
+            a = self.random.randint(1, target - 1)
+            b = target - a
+            if all(d in digits for d in str(a)) and all(d in digits for d in str(b)):
+                return f"Try adding two numbers to get {target}, like {a}+{b}."
+
+        if "-" in operators:
+            a = self.random.randint(target + 1, target + 20)
+            b = a - target
+            if all(d in digits for d in str(a)) and all(d in digits for d in str(b)):
+                return f"Try subtracting from a larger number, like {a}-{b}."
+
+        if "*" in operators and target > 1:
+            factors = [i for i in range(1, 11) if target % i == 0]
+            valid_factors = [f for f in factors if all(d in digits for d in str(f)) and
+                             all(d in digits for d in str(target // f))]
+            if valid_factors:
+                factor = self.random.choice(valid_factors)
+                return f"Try multiplying {factor} by {target // factor}."
+
+        if "/" in operators and target > 0:
+            multiples = [target * i for i in range(1, 11)]
+            valid_multiples = [m for m in multiples if all(d in digits for d in str(m))]
+            if valid_multiples:
+                multiple = self.random.choice(valid_multiples)
+                return f"Try dividing {multiple} by {multiple // target}."
+
+        # Generic hint
+        available_ops = " and ".join([f"'{op}'" for op in operators])
+        return f"Try combining {available_ops} operations with your available digits."
@@ -0,0 +1,116 @@
+"""
+Euclid's Game rules: players take turns adding the positive difference of
+two numbers already on the board, and whoever makes more moves wins.
+"""
+
+import math
+import random
+
+
+class EuclidsGame:
+    """Board, turn and score state for Euclid's Game."""
+
+    def __init__(self, rng=random):
+        self.random = rng
+        self.numbers_on_board = []
+        self.board_set = set()
+        self.board_gcd = 0
+        self.player_moves = 0
+        self.bot_moves = 0
+        self.current_turn = "Player"  # "Player" or "Bot"
+        self.game_active = False
+
+    def start(self, num1=None, num2=None):
+        """Initialize a new game with two starting numbers."""
+        self.numbers_on_board = []
+        self.board_set = set()
+        self.board_gcd = 0
+        self.player_moves = 0
+        self.bot_moves = 0
+        self.current_turn = "Player"
+        self.game_active = True
+
+        # Generate two random starting numbers
+        if num1 is None:
+            num1 = self.random.randint(10, 50)
+        if num2 is None:
+            num2 = self.random.randint(60, 100)
+
+            # Make sure the numbers are different
+            while num1 == num2:
+                num2 = self.random.randint(60, 100)
+
+        self.add_number(num1)
+        self.add_number(num2)
+
+    def add_number(self, number):
+        """Add a new number to the board; False if it is already there."""
+        if number in self.board_set:
+            return False
+
+        self.board_set.add(number)
+        self.numbers_on_board.append(number)
+        self.numbers_on_board.sort()  # Keep numbers sorted for easier viewing
+        self.board_gcd = math.gcd(self.board_gcd, number)
+        return True
+
+    def is_valid_difference(self, difference):
+        return difference > 0 and difference not in self.board_set
+
+    def valid_moves(self):
+        """Return every (num1, num2, difference) that adds a new number."""
+        moves = []
+        numbers = self.numbers_on_board
+        for i in range(len(numbers)):
+            for j in range(i + 1, len(numbers)):
+                difference = numbers[j] - numbers[i]
+                if difference not in self.board_set:
+                    moves.append((numbers[i], numbers[j], difference))
+        return moves
+
+    def find_bot_move(self):
+        """Pick a random valid move for the bot, or None."""
+        possible_pairs = self.valid_moves()
+        if possible_pairs:
+            return self.random.choice(possible_pairs)
+        return None
+
+    def play(self, num1, num2):
+        """Apply a move for the current player; returns the difference.
+
+        Raises ValueError if the difference is 0 or already on the board.
+        """
+        difference = abs(num1 - num2)
+        if difference == 0:
+            raise ValueError("The difference is 0, which is not a valid move.")
+        if difference in self.board_set:
+            raise ValueError(f"The number {difference} is already on the board.")
+
+        self.add_number(difference)
+        if self.current_turn == "Player":
+            self.player_moves += 1
+            self.current_turn = "Bot"
+        else:
+            self.bot_moves += 1
+            self.current_turn = "Player"
+        return difference
+
+    def is_game_over(self):
+        """Check if the game is over (no more valid moves possible).
+
+        A set closed under positive differences is exactly the multiples of
+        its gcd up to its maximum, so the game is over once the board holds
+        max // gcd numbers.
+        """
+        if not self.numbers_on_board:
+            return True
+        return len(self.numbers_on_board) == self.numbers_on_board[-1] // self.board_gcd
+
+    def end(self):
+        """Stop the game and return the result message."""
+        self.game_active = False
+        if self.player_moves > self.bot_moves:
+            return f"Game over! You win! Score: Player {self.player_moves} - Bot {self.bot_moves}"
+        elif self.bot_moves > self.player_moves:
+            return f"Game over! Bot wins! Score: Player {self.player_moves} - Bot {self.bot_moves}"
+        return f"Game over! It's a tie! Score: Player {self.player_moves} - Bot {self.bot_moves}"
@@ -0,0 +1,126 @@
+"""
+Pools of math expressions used as Fifteen Puzzle tile labels.
+
+ExpressionPool lists many expressions for every value up to max_value
+once, so labelling a board only picks from ready-made lists. The labels
+of all values live in one flat tuple; each value keeps the (start, end)
+range of its labels per operator, so a label is drawn with two random
+choices. Every label evaluates to its own value, so the labels of one
+board never repeat.
+
+Operators are brought in as the numbers grow, the way the game has
+always done it: small numbers are sums, then differences, and products,
+quotients and bracketed expressions only appear from MIN_VALUES.
+"""
+
+import random
+
+# Operators an expression can use; "()" is two operations with brackets
+OPERATORS = ("+", "-", "×", "÷", "()")
+
+# Smallest value labelled with each operator
+MIN_VALUES = {"+": 1, "-": 6, "×": 11, "÷": 11, "()": 11}
+
+# Most labels kept per value and operator
+LABELS_PER_OPERATOR = 12
+
+# Largest operand in generated expressions, so labels stay short
+MAX_OPERAND = 100
+
+POOL_SEED = 24
+
+_default_pool = None
+
+
+def sums(value):
+    first = range(0, value + 1) if value <= 5 else range(1, value)
+    return [f"{a} + {value - a}" for a in first]
+
+
+def differences(value):
+    return [f"{value + b} - {b}" for b in range(1, 11) if value + b <= MAX_OPERAND]
+
+
+def products(value):
+    return [f"{a} × {value // a}" for a in range(2, 10)
+            if value % a == 0 and 2 <= value // a <= 12]
+
+
+def quotients(value):
+    return [f"{value * b} ÷ {b}" for b in range(2, 10) if value * b <= MAX_OPERAND]
+
+
+def bracketed(value):
+    labels = []
+    for a in range(2, 10):
+        if value % a:
+            continue
+        inner = value // a
+        # a × (b + c) and (b - c) × a
+        labels.extend(f"{a} × ({b} + {inner - b})" for b in range(1, inner // 2 + 1))
+        labels.extend(f"({inner + c} - {c}) × {a}" for c in range(1, 6))
+    for a in range(2, 10):
+        for b in range(a, 10):
+            rest = value - a * b
+            if 0 < rest <= 20:
+                labels.append(f"({a} × {b}) + {rest}")
+    return labels
+
+
+GENERATORS = {
+    "+": sums,
+    "-": differences,
+    "×": products,
+    "÷": quotients,
+    "()": bracketed,
+}
+
+
+class ExpressionPool:
+    """Ready-made labels for every value from 1 to max_value."""
+
+    def __init__(self, max_value=99, operators=OPERATORS, per_operator=LABELS_PER_OPERATOR,
+                 seed=POOL_SEED):
+        self.max_value = max_value
+        self.operators = tuple(operators)
+        rng = random.Random(seed)
+
+        labels = []
+        # ranges[value] -> one (start, end) into labels per usable operator
+        self.ranges = [()]
+        for value in range(1, max_value + 1):
+            value_ranges = []
+            for operator in self.operators:
+                if value < MIN_VALUES[operator]:
+                    continue
+                candidates = GENERATORS[operator](value)
+                if len(candidates) > per_operator:
+                    candidates = rng.sample(candidates, per_operator)
+                if candidates:
+                    value_ranges.append((len(labels), len(labels) + len(candidates)))
+                    labels.extend(candidates)
+            if not value_ranges:
+                # Every value can at least be written as a sum
+                value_ranges.append((len(labels), len(labels) + 1))
+                labels.append(f"{value} + 0")
+            self.ranges.append(tuple(value_ranges))
+        self.labels = tuple(labels)
+
+    def label(self, value, rng=random):
+        """A random label for `value`, every operator equally likely."""
+        start, end = rng.choice(self.ranges[value])
+        return self.labels[rng.randrange(start, end)]
+
+    def draw(self, max_value, rng=random):
+        """Labels for the values 1 to max_value of one board."""
+        if max_value > self.max_value:
+            raise ValueError(f"The pool only has labels up to {self.max_value}")
+        return {value: self.label(value, rng) for value in range(1, max_value + 1)}
+
+
+def default_pool():
+    """The pool shared by every board, built on first use."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = ExpressionPool()
+    return _default_pool
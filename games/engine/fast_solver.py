@@ -0,0 +1,308 @@
+"""
+Fast, near-optimal solver for big sliding puzzles.
+
+Optimal search is out of reach past 4x4, so solve_fast() solves the way
+people do: it places the top row and then the left column one tile at a
+time, which leaves a board one size smaller, and repeats until 4x4 is
+left. That last 4x4 is searched optimally if the search finishes before
+the deadline; otherwise it is reduced once more and the final 3x3 is
+solved optimally, which takes milliseconds. The deadline is checked
+between every stage, and when it passes the moves made so far are
+returned as an incomplete solution. Any stretch of the result that comes
+back to a position it already passed through is then cut out.
+
+Placing a tile moves it one cell at a time along a shortest path to its
+target, bringing the empty cell round in front of it each time. The last
+two tiles of a row or column cannot be placed one after the other, so
+both are brought into the few cells next to the line's end and a small
+search over their cells and the empty cell's finds the slides that put
+them in place together.
+"""
+
+import time
+from collections import deque
+
+from engine.fifteen import is_solvable_board, neighbour_table, zobrist_table, board_hash
+from engine.solver import solve, Solution, SearchCancelled
+
+# Default time allowed for a hint on a big board, in seconds
+DEFAULT_DEADLINE = 0.2
+
+# Boards are reduced down to this size before searching optimally
+OPTIMAL_SIZE = 4
+
+# Time kept back from the optimal search for noticing the deadline and
+# finishing without it, in seconds
+FINISH_RESERVE = 0.03
+
+# Nodes between deadline checks of the optimal searches, a few
+# milliseconds' worth
+DEADLINE_CHECK_INTERVAL = 512
+
+
+class Reducer:
+    """Places tiles on one board, recording the tiles slid."""
+
+    def __init__(self, board, grid_size):
+        self.n = grid_size
+        self.board = list(board)
+        self.pos = [0] * len(self.board)
+        for cell, tile in enumerate(self.board):
+            self.pos[tile] = cell
+        self.neighbours = neighbour_table(grid_size)
+        self.locked = [False] * len(self.board)
+        self.moves = []
+        self.nodes = 0
+
+    def slide(self, cell):
+        board, pos = self.board, self.pos
+        tile, blank = board[cell], pos[0]
+        board[blank], board[cell] = tile, 0
+        pos[tile], pos[0] = blank, cell
+        self.moves.append(tile)
+
+    def path(self, start, goal, avoid=()):
+        """Shortest path of cells from start to goal (a cell or a set of
+        cells), not including start, through unlocked cells not in
+        `avoid`; None if there is none."""
+        goals = goal if isinstance(goal, set) else {goal}
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            self.nodes += 1
+            if cell in goals:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = previous[cell]
+                return path[::-1]
+            for neighbour in self.neighbours[cell]:
+                if neighbour not in previous and neighbour not in avoid and not self.locked[neighbour]:
+                    previous[neighbour] = cell
+                    queue.append(neighbour)
+        return None
+
+    def move_blank(self, target, avoid=()):
+        path = self.path(self.pos[0], target, avoid)
+        if path is None:
+            return False
+        for cell in path:
+            self.slide(cell)
+        return True
+
+    def move_tile(self, tile, target):
+        """Bring `tile` to `target` without touching locked cells."""
+        path = self.path(self.pos[tile], target)
+        if path is None:
+            self.move_tile_jointly(tile, target)
+            return
+        for cell in path:
+            if not self.move_blank(cell, avoid=(self.pos[tile],)):
+                # The empty cell is shut in behind the tile
+                self.move_tile_jointly(tile, target)
+                return
+            self.slide(self.pos[tile])
+
+    def move_tile_jointly(self, tile, target):
+        """Search over (tile cell, empty cell) pairs for the slides that
+        bring `tile` to `target`; slower, but never gets stuck."""
+        start = (self.pos[tile], self.pos[0])
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            self.nodes += 1
+            tile_cell, blank = state
+            if tile_cell == target:
+                break
+            for cell in self.neighbours[blank]:
+                if self.locked[cell]:
+                    continue
+                child = (blank, cell) if cell == tile_cell else (tile_cell, cell)
+                if child not in previous:
+                    previous[child] = state
+                    queue.append(child)
+        else:
+            raise ValueError("This board cannot be solved")
+
+        blanks = []
+        while previous[state] is not None:
+            blanks.append(state[1])
+            state = previous[state]
+        for cell in reversed(blanks):
+            self.slide(cell)
+
+    def place_line(self, cells, side):
+        """Put the solved tiles into `cells` and lock them.
+
+        `side` is the step from a cell of the line to the next one off it,
+        into the part of the board that is still unsolved.
+        """
+        for cell in cells[:-2]:
+            self.move_tile(cell + 1, cell)
+            self.locked[cell] = True
+
+        first, last = cells[-2], cells[-1]
+        if self.board[first] != first + 1 or self.board[last] != last + 1:
+            # Bring both tiles and the empty cell into the corner next to
+            # the line's end, then search for the slides that finish it
+            along = last - first
+            window = {first, last}
+            for depth in (1, 2):
+                for step in (-along, 0, along):
+                    window.add(first + depth * side + step)
+            self.move_tile(last + 1, first)
+            if self.pos[first + 1] not in window:
+                self.locked[first] = True
+                self.move_tile(first + 1, first + side)
+                self.locked[first] = False
+            self.move_blank_into(window, avoid=(self.pos[first + 1], self.pos[last + 1]))
+            self.arrange_pair(first + 1, last + 1, first, last, window)
+        self.locked[first] = self.locked[last] = True
+
+    def move_blank_into(self, cells, avoid):
+        """Move the empty cell to the nearest of `cells`, not crossing `avoid`."""
+        for cell in self.path(self.pos[0], cells, avoid):
+            self.slide(cell)
+
+    def arrange_pair(self, first_tile, last_tile, first, last, window):
+        """Slide the empty cell around inside `window` until first_tile is
+        on `first` and last_tile on `last`."""
+        pos = self.pos
+        start = (pos[first_tile], pos[last_tile], pos[0])
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            self.nodes += 1
+            a, b, blank = state
+            if a == first and b == last:
+                break
+            for cell in self.neighbours[blank]:
+                if cell not in window:
+                    continue
+                if cell == a:
+                    child = (blank, b, cell)
+                elif cell == b:
+                    child = (a, blank, cell)
+                else:
+                    child = (a, b, cell)
+                if child not in previous:
+                    previous[child] = state
+                    queue.append(child)
+        else:
+            raise ValueError("This board cannot be solved")
+
+        blanks = []
+        while previous[state] is not None:
+            blanks.append(state[2])
+            state = previous[state]
+        for cell in reversed(blanks):
+            self.slide(cell)
+
+    def reduce(self, offset):
+        """Solve row and column `offset`, leaving the board below and
+        right of them."""
+        n = self.n
+        self.place_line([offset * n + col for col in range(offset, n)], n)
+        self.place_line([row * n + offset for row in range(offset + 1, n)], 1)
+
+    def finish(self, time_left):
+        """Solve the board; returns False as soon as time_left() is not
+        positive, with the moves made so far kept."""
+        n = self.n
+        for offset in range(n - OPTIMAL_SIZE):
+            if time_left() <= 0:
+                return False
+            self.reduce(offset)
+
+        size = min(n, OPTIMAL_SIZE)
+        if size > 3:
+            # Search the last 4x4 only while there is time to finish without it
+            if (time_left() > FINISH_RESERVE and
+                    self.solve_corner(size, should_stop=lambda: time_left() < FINISH_RESERVE)):
+                return True
+            if time_left() <= 0:
+                return False
+            self.reduce(n - size)
+        if time_left() <= 0:
+            return False
+        return self.solve_corner(3, should_stop=lambda: time_left() <= 0)
+
+    def solve_corner(self, size, heuristic=None, should_stop=None):
+        """Optimally solve the unsolved size x size corner, or return False
+        if the search was stopped."""
+        n = self.n
+        offset = n - size
+        cells = [row * n + col for row in range(offset, n) for col in range(offset, n)]
+
+        # Number the corner's tiles as a board of its own
+        to_corner, from_corner = {0: 0}, {0: 0}
+        for index, cell in enumerate(cells):
+            to_corner[cell + 1] = index + 1
+            from_corner[index + 1] = cell + 1
+        corner = [to_corner[self.board[cell]] for cell in cells]
+
+        try:
+            solution = solve(corner, size, heuristic, should_stop=should_stop,
+                             check_interval=DEADLINE_CHECK_INTERVAL)
+        except SearchCancelled:
+            return False
+        self.nodes += solution.nodes
+        for tile in solution.moves:
+            self.slide(self.pos[from_corner[tile]])
+        return True
+
+
+def remove_loops(board, grid_size, moves):
+    """Return `moves` without the stretches that revisit a position."""
+    keys = zobrist_table(grid_size)
+    board = list(board)
+    pos = [0] * len(board)
+    for cell, tile in enumerate(board):
+        pos[tile] = cell
+
+    position_hash = board_hash(board, grid_size)
+    hashes = [position_hash]
+    seen = {position_hash: 0}
+    kept = []
+    for tile in moves:
+        cell, blank = pos[tile], pos[0]
+        board[blank], board[cell] = tile, 0
+        pos[tile], pos[0] = blank, cell
+        position_hash ^= keys[tile][cell] ^ keys[tile][blank] ^ keys[0][blank] ^ keys[0][cell]
+
+        earlier = seen.get(position_hash)
+        if earlier is not None:
+            # Back where `earlier` moves had been made; forget the loop
+            for dropped in hashes[earlier + 1:]:
+                del seen[dropped]
+            del hashes[earlier + 1:]
+            del kept[earlier:]
+            continue
+        kept.append(tile)
+        hashes.append(position_hash)
+        seen[position_hash] = len(kept)
+    return kept
+
+
+def solve_fast(board, grid_size, deadline=DEFAULT_DEADLINE):
+    """Return a Solution for `board` within `deadline` seconds.
+
+    The solution is short but not always the shortest. FINISH_RESERVE of
+    the deadline is kept for finishing without the optimal search of the
+    last 4x4, so a deadline that short skips that search; the rest takes
+    a few tens of milliseconds even on 10x10. If the deadline passes
+    first, the Solution holds the moves made so far and `complete` is
+    False. Raises ValueError for a board that cannot be solved.
+    """
+    if not is_solvable_board(board, grid_size):
+        raise ValueError("This board cannot be solved")
+    started = time.perf_counter()
+    time_left = lambda: deadline - (time.perf_counter() - started)
+    reducer = Reducer(board, grid_size)
+    complete = reducer.finish(time_left)
+
+    moves = remove_loops(board, grid_size, reducer.moves)
+    return Solution(moves, reducer.nodes, time.perf_counter() - started, complete)
@@ -0,0 +1,281 @@
+"""
+Fifteen Puzzle rules: board state, legal moves, shuffling and hints.
+"""
+
+import random
+
+from engine.board import make_board
+from engine.expressions import default_pool
+from engine.journal import (
+    MAX_GRID_SIZE, MIN_GRID_SIZE, MoveJournal, Replay, direction_steps, opposite,
+)
+
+
+# Fixed seed so every board of a size hashes the same way in every process
+ZOBRIST_SEED = 15
+_zobrist_tables = {}
+
+
+def generate_math_operations(max_value=15, rng=random):
+    """Generate math expression labels for numbers 1 to max_value"""
+    return default_pool().draw(max_value, rng)
+
+
+def permutation_parity(values):
+    """Return the parity (0 or 1) of the inversion count of `values`.
+
+    `values` must hold 1..len(values) in any order. The parity is read
+    from the cycle decomposition in O(n): a permutation of n items with c
+    cycles has the same parity as n - c.
+    """
+    seen = [False] * len(values)
+    cycles = 0
+    for start in range(len(values)):
+        if seen[start]:
+            continue
+        cycles += 1
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            i = values[i] - 1
+    return (len(values) - cycles) % 2
+
+
+def is_solvable_board(board, grid_size):
+    """Return True if a flat row-major board (0 = empty) can be solved"""
+    parity = permutation_parity([value for value in board if value != 0])
+
+    # On odd-width boards every blank row is equivalent and the
+    # inversion parity alone decides.
+    if grid_size % 2 == 1:
+        return parity == 0
+
+    # On even-width boards, if the empty tile is on an even row from the
+    # bottom, the puzzle is solvable if the number of inversions is odd;
+    # on an odd row from the bottom it needs an even number.
+    row_from_bottom = grid_size - board.index(0) // grid_size
+    return parity != row_from_bottom % 2
+
+
+def neighbour_table(grid_size):
+    """For every cell, the cells the empty cell can move to from it."""
+    table = []
+    for cell in range(grid_size * grid_size):
+        x, y = cell % grid_size, cell // grid_size
+        cells = []
+        for dx, dy in ((0, -1), (-1, 0), (1, 0), (0, 1)):
+            if 0 <= x + dx < grid_size and 0 <= y + dy < grid_size:
+                cells.append((y + dy) * grid_size + x + dx)
+        table.append(tuple(cells))
+    return table
+
+
+def zobrist_table(grid_size):
+    """Random 64-bit keys per (tile, cell); tile 0 is the empty cell."""
+    table = _zobrist_tables.get(grid_size)
+    if table is None:
+        rng = random.Random(ZOBRIST_SEED * 100 + grid_size)
+        size = grid_size * grid_size
+        table = [[rng.getrandbits(64) for _ in range(size)] for _ in range(size)]
+        _zobrist_tables[grid_size] = table
+    return table
+
+
+def board_hash(board, grid_size):
+    """Zobrist hash of a flat board: the XOR of the key of every tile's cell"""
+    table = zobrist_table(grid_size)
+    value = 0
+    for cell, tile in enumerate(board):
+        value ^= table[tile][cell]
+    return value
+
+
+def random_solvable_board(grid_size, rng=random):
+    """Return a uniformly random solvable board in O(n).
+
+    The board is shuffled once; if it came out unsolvable, swapping two
+    tiles flips the parity. That swap pairs every unsolvable board with
+    exactly one solvable board, so the result stays uniform.
+    """
+    board = list(range(1, grid_size * grid_size)) + [0]
+    rng.shuffle(board)
+    if not is_solvable_board(board, grid_size):
+        first, second = [idx for idx in range(3) if board[idx] != 0][:2]
+        board[first], board[second] = board[second], board[first]
+    return board
+
+
+class FifteenPuzzle:
+    """State of a sliding puzzle board.
+
+    The board is a compact board from engine.board that reads as a flat
+    row-major sequence with 0 for the empty cell, and empty_pos is the
+    (x, y) of the empty cell. hash is the board's Zobrist hash and is kept
+    up to date by every move, so looking up a position does not scan the
+    board. Moves made with move_tile() are kept in `journal`, from the
+    board in `start_tiles`, for undo, redo and replays.
+    """
+
+    def __init__(self, grid_size=4, rng=random):
+        self.random = rng
+        self.set_grid_size(grid_size)
+
+    def set_grid_size(self, grid_size):
+        """Switch to a grid_size x grid_size board in the solved position"""
+        if not MIN_GRID_SIZE <= grid_size <= MAX_GRID_SIZE:
+            raise ValueError(f"Board size must be between {MIN_GRID_SIZE} and {MAX_GRID_SIZE}")
+        self.grid_size = grid_size
+        self.max_value = grid_size * grid_size - 1
+        self.zobrist = zobrist_table(grid_size)
+        self.neighbours = neighbour_table(grid_size)
+        self.steps = direction_steps(grid_size)
+        self.reset()
+
+    @property
+    def empty_pos(self):
+        blank = self.board.blank
+        return (blank % self.grid_size, blank // self.grid_size)
+
+    def reset(self):
+        """Put the board in the solved position"""
+        self.board = make_board(self.grid_size)
+        self.hash = board_hash(self.board, self.grid_size)
+        self.begin()
+
+    def begin(self):
+        """Make the current board the start of a game"""
+        self.start_tiles = list(self.board)
+        self.journal = MoveJournal()
+        self.move_count = 0
+        self.last_moved_tile = None
+
+    def new_game(self, moves=None):
+        """Reset and shuffle the board for a new game"""
+        self.reset()
+        self.shuffle(moves)
+        self.begin()
+
+    def load(self, tiles):
+        """Start a game from the given row-major tiles"""
+        if not is_solvable_board(tiles, self.grid_size):
+            raise ValueError("This board cannot be solved")
+        self.board = make_board(self.grid_size, tiles)
+        self.hash = board_hash(self.board, self.grid_size)
+        self.begin()
+
+    def tile_at(self, x, y):
+        return self.board[y * self.grid_size + x]
+
+    def shuffle(self, moves=None):
+        """Shuffle the board while ensuring it's solvable.
+
+        With moves=None the board becomes a uniformly random solvable
+        position. Otherwise `moves` random slides are made from the current
+        position, which keeps the board close to solved for small counts.
+        """
+        if moves is None:
+            self.board = make_board(self.grid_size, random_solvable_board(self.grid_size, self.random))
+            self.hash = board_hash(self.board, self.grid_size)
+            return
+
+        # Slides keep the board solvable; never undo the previous slide so
+        # short walks actually move away from the start
+        previous = None
+        for _ in range(moves):
+            cells = self.neighbours[self.board.blank]
+            cell = self.random.choice(cells)
+            while cell == previous:
+                cell = self.random.choice(cells)
+            previous = self.board.blank
+            self.slide(cell)
+
+    def is_solvable(self):
+        """Check if the puzzle is solvable"""
+        return is_solvable_board(self.board, self.grid_size)
+
+    def get_possible_moves(self):
+        """Get coordinates of tiles that can be moved"""
+        n = self.grid_size
+        return [(cell % n, cell // n) for cell in self.neighbours[self.board.blank]]
+
+    def can_move(self, x, y):
+        """Return True if the tile at (x, y) is next to the empty cell"""
+        empty_x, empty_y = self.empty_pos
+        return ((x == empty_x and abs(y - empty_y) == 1) or
+                (y == empty_y and abs(x - empty_x) == 1))
+
+    def move_tile(self, x, y):
+        """Move a tile to the empty position if it's adjacent"""
+        if not self.can_move(x, y):
+            return False
+
+        # Remember which tile was moved
+        cell = y * self.grid_size + x
+        self.journal.record(self.steps.index(cell - self.board.blank))
+        self.last_moved_tile = self.slide(cell)
+        self.move_count += 1
+        return True
+
+    def undo(self):
+        """Take back the last move; returns the tile moved, or None"""
+        if not self.journal.can_undo():
+            return None
+        direction = opposite(self.journal.undo())
+        self.last_moved_tile = self.slide(self.board.blank + self.steps[direction])
+        self.move_count -= 1
+        return self.last_moved_tile
+
+    def redo(self):
+        """Make the last undone move again; returns the tile moved, or None"""
+        if not self.journal.can_redo():
+            return None
+        direction = self.journal.redo()
+        self.last_moved_tile = self.slide(self.board.blank + self.steps[direction])
+        self.move_count += 1
+        return self.last_moved_tile
+
+    def replay(self, elapsed=0.0):
+        """The game so far as a Replay"""
+        return Replay(self.grid_size, self.start_tiles, self.journal, elapsed)
+
+    def slide(self, cell):
+        """Slide the tile at `cell` (next to the empty cell) into it"""
+        empty_idx = self.board.blank
+        value = self.board.slide(cell)
+
+        # The tile and the empty cell trade places
+        tile_keys, empty_keys = self.zobrist[value], self.zobrist[0]
+        self.hash ^= (tile_keys[cell] ^ tile_keys[empty_idx] ^
+                      empty_keys[empty_idx] ^ empty_keys[cell])
+        return value
+
+    def is_solved(self):
+        """Check if the puzzle is solved"""
+        return self.board.is_solved()
+
+    def is_in_place(self, x, y):
+        """Return True if the tile at (x, y) is in its solved position"""
+        idx = y * self.grid_size + x
+        return self.board[idx] == idx + 1
+
+    def hint_tile(self):
+        """Return a movable tile that gets closer to its target, or None"""
+        empty_x, empty_y = self.empty_pos
+
+        # Only the (at most four) neighbours of the empty cell can move;
+        # check them in reading order
+        for x, y in sorted(self.get_possible_moves(), key=lambda pos: (pos[1], pos[0])):
+            value = self.board[y * self.grid_size + x]
+
+            # Calculate where this tile should be
+            target_idx = value - 1
+            target_x = target_idx % self.grid_size
+            target_y = target_idx // self.grid_size
+
+            # Calculate if moving would get it closer to target
+            current_dist = abs(x - target_x) + abs(y - target_y)
+            new_dist = abs(empty_x - target_x) + abs(empty_y - target_y)
+            if new_dist < current_dist:
+                return value
+
+        return None
@@ -0,0 +1,186 @@
+"""
+Move history and replays for the Fifteen Puzzle.
+
+Every move is stored as the direction the empty cell went, in two bits,
+so MoveJournal keeps four moves per byte. Undo and redo only move a
+cursor through the journal; making a new move after undoing drops the
+moves that could have been redone.
+
+A finished game is saved as a Replay: the starting board, the time taken
+and the packed moves. A 4x4 game of a hundred moves fits in under 70
+bytes. simulate() plays a replay back on a bare list without any of the
+game's bookkeeping, so replays can be checked in bulk, for example
+before accepting a leaderboard entry.
+"""
+
+import os
+import struct
+import time
+
+# Directions the empty cell moves in; opposite directions differ in bit 1
+UP, RIGHT, DOWN, LEFT = range(4)
+
+# Board sizes offered by the game, from the 8-puzzle to the 99-puzzle
+MIN_GRID_SIZE = 3
+MAX_GRID_SIZE = 10
+
+ENV_VAR = "MATHGAMES_REPLAY_DIR"
+
+MAGIC = b"MGFP"
+VERSION = 1
+# magic, version, grid size, move count, elapsed milliseconds
+HEADER = struct.Struct("<4sBBII")
+
+
+def opposite(direction):
+    return direction ^ 2
+
+
+def direction_steps(grid_size):
+    """Cell index change of the empty cell for each direction."""
+    return (-grid_size, 1, grid_size, -1)
+
+
+class MoveJournal:
+    """Moves of one game, four to a byte, with a cursor for undo and redo."""
+
+    def __init__(self, data=b"", length=0):
+        self.data = bytearray(data)
+        self.length = length  # Moves recorded, including undone ones
+        self.cursor = length  # Moves currently applied
+
+    def __len__(self):
+        return self.cursor
+
+    def __getitem__(self, index):
+        return (self.data[index >> 2] >> ((index & 3) * 2)) & 3
+
+    def __iter__(self):
+        for index in range(self.cursor):
+            yield self[index]
+
+    def record(self, direction):
+        """Append a move, dropping any undone moves after the cursor."""
+        index = self.cursor
+        shift = (index & 3) * 2
+        if shift == 0:
+            # First move of a new byte; anything after it was undone
+            del self.data[index >> 2:]
+            self.data.append(direction)
+        else:
+            byte = index >> 2
+            self.data[byte] = (self.data[byte] & ~(3 << shift)) | (direction << shift)
+        self.cursor = self.length = index + 1
+
+    def can_undo(self):
+        return self.cursor > 0
+
+    def can_redo(self):
+        return self.cursor < self.length
+
+    def undo(self):
+        """Step back; returns the direction of the move being undone."""
+        self.cursor -= 1
+        return self[self.cursor]
+
+    def redo(self):
+        """Step forward; returns the direction of the move to make again."""
+        direction = self[self.cursor]
+        self.cursor += 1
+        return direction
+
+    def packed(self):
+        """The applied moves as bytes, four to a byte."""
+        size = (self.cursor + 3) >> 2
+        data = bytearray(self.data[:size])
+        if self.cursor & 3:
+            # Clear undone moves that share the last byte
+            data[-1] &= (1 << ((self.cursor & 3) * 2)) - 1
+        return bytes(data)
+
+
+class Replay:
+    """A game from its starting board, with the moves and the time taken."""
+
+    def __init__(self, grid_size, tiles, journal, elapsed=0.0):
+        self.grid_size = grid_size
+        self.tiles = list(tiles)
+        self.journal = journal
+        self.elapsed = elapsed
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.grid_size, len(self.journal),
+                             int(self.elapsed * 1000))
+        return header + bytes(self.tiles) + self.journal.packed()
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("Not a Fifteen Puzzle replay")
+        magic, version, grid_size, moves, elapsed_ms = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Fifteen Puzzle replay")
+        start = HEADER.size
+        size = grid_size * grid_size
+        tiles = list(data[start:start + size])
+        packed = data[start + size:]
+        if len(tiles) != size or len(packed) != (moves + 3) >> 2:
+            raise ValueError("Replay is truncated")
+        if (not MIN_GRID_SIZE <= grid_size <= MAX_GRID_SIZE or
+                sorted(tiles) != list(range(size))):
+            raise ValueError("Replay is corrupt")
+        return cls(grid_size, tiles, MoveJournal(packed, moves), elapsed_ms / 1000)
+
+
+def simulate(replay):
+    """Play a replay back; returns the final tiles.
+
+    Raises ValueError if a move would take the empty cell off the board.
+    """
+    n = replay.grid_size
+    board = list(replay.tiles)
+    blank = board.index(0)
+    steps = direction_steps(n)
+    for direction in replay.journal:
+        cell = blank + steps[direction]
+        if (not 0 <= cell < n * n or
+                (direction in (LEFT, RIGHT) and cell // n != blank // n)):
+            raise ValueError("Replay moves off the board")
+        board[blank], board[cell] = board[cell], 0
+        blank = cell
+    return board
+
+
+def is_solved_replay(replay):
+    """True if the replay's moves solve its starting board."""
+    size = replay.grid_size * replay.grid_size
+    return simulate(replay) == list(range(1, size)) + [0]
+
+
+def replay_dir():
+    """Directory finished games are saved in."""
+    value = os.environ.get(ENV_VAR)
+    if value:
+        return value
+    data = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data, "mathgames", "replays")
+
+
+def save_replay(replay, directory=None):
+    """Write a replay to a new file and return its path."""
+    directory = directory or replay_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = time.strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(directory, f"fifteen-{replay.grid_size}x{replay.grid_size}-{name}.replay")
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = os.path.join(directory, f"fifteen-{replay.grid_size}x{replay.grid_size}-{name}-{suffix}.replay")
+    with open(path, "wb") as replay_file:
+        replay_file.write(replay.to_bytes())
+    return path
+
+
+def load_replay(path):
+    with open(path, "rb") as replay_file:
+        return Replay.from_bytes(replay_file.read())
@@ -0,0 +1,309 @@
+"""
+Math Minesweeper rules: a grid of tiles, each cleared by answering a math
+question. Wrong answers turn the tile into a mine and cost a life.
+"""
+
+import random
+
+
+class QuestionGenerator:
+    def __init__(self, rng=random):
+        """Initialize the question generator with various question types"""
+        self.random = rng
+        self.question_types = [
+            self._generate_number_pattern,
+            self._generate_fill_in_blank,
+            self._generate_missing_operator,
+            self._generate_reverse_logic,
+            self._generate_word_puzzle,
+            self._generate_true_false,
+            self._generate_time_riddle
+        ]
+
+    def get_random_question(self):
+        """Returns a random question, its answer, and its type"""
+        question_func = self.random.choice(self.question_types)
+        return question_func()
+
+    def _generate_number_pattern(self):
+        """Generate a number pattern question"""
+        pattern_type = self.random.choice(["arithmetic", "geometric", "fibonacci"])
+
+        if pattern_type == "arithmetic":
+            # Arithmetic sequence (add constant)
+            start = self.random.randint(1, 10)
+            step = self.random.randint(1, 5)
+            sequence = [start + i * step for i in range(4)]
+            answer = start + 4 * step
+
+        elif pattern_type == "geometric":
+            # Geometric sequence (multiply by constant)
+            start = self.random.randint(1, 5)
+            ratio = self.random.randint(2, 3)
+            sequence = [start * (ratio ** i) for i in range(4)]
+            answer = start * (ratio ** 4)
+
+        else:  # fibonacci-like
+            # Simple fibonacci-like sequence (each number is sum of two before)
+            a, b = self.random.randint(1, 5), self.random.randint(1, 5)
+            sequence = [a, b]
+            for _ in range(2):
+                sequence.append(sequence[-1] + sequence[-2])
+            answer = sequence[-1] + sequence[-2]
+
+        question = f"What comes next? {', '.join(map(str, sequence))}, ___"
+        return question, str(answer), "number_pattern"
+
+    def _generate_fill_in_blank(self):
+        """Generate a fill-in-the-blank arithmetic question"""
+        operation = self.random.choice(["addition", "subtraction", "multiplication"])
+
+        if operation == "addition":
+            a = self.random.randint(5, 20)
+            c = self.random.randint(10, 30)
+            b = c - a
+            question = f"{a} + ___ = {c}"
+
+        elif operation == "subtraction":
+            b = self.random.randint(5, 20)
+            c = self.random.randint(b + 5, b + 25)
+            a = c + b
+            question = f"{a} - ___ = {c}"
+
+        else:  # multiplication
+            a = self.random.randint(2, 9)
+            c = self.random.randint(a + 1, 20)
+            b = c // a
+            if b * a == c:  # Ensure exact division
+                question = f"{a} × ___ = {c}"
+            else:
+                a = self.random.randint(2, 9)
+                b = self.random.randint(2, 9)
+                c = a * b
+                question = f"{a} × ___ = {c}"
+
+        return question, str(b), "fill_in_blank"
+
+    def _generate_missing_operator(self):
+        """Generate a missing operator question"""
+        a = self.random.randint(1, 10)
+        b = self.random.randint(1, 10)
+
+        # Generate answer for all possible operators
+        results = {
+            '+': a + b,
+            '-': a - b,
+            '×': a * b,
+            '÷': a / b if b != 0 else None
+        }
+
+        # Choose operator with clean results (avoid division with remainder)
+        valid_ops = [op for op, result in results.items()
+                    if result is not None and (op != '÷' or a % b == 0)]
+
+        chosen_op = self.random.choice(valid_ops)
+        result = results[chosen_op]
+
+        question = f"What operator works? {a} ___ {b} = {int(result)}"
+        return question, chosen_op, "missing_operator"
+
+    def _generate_reverse_logic(self):
+        """Generate a reverse logic question"""
+        operations = [
+            {"desc": "doubled a number", "op": lambda x: x * 2, "inv": lambda y: y // 2, "range": (2, 10)},
+            {"desc": "tripled a number", "op": lambda x: x * 3, "inv": lambda y: y // 3, "range": (2, 7)},
+            {"desc": "added 5 to a number", "op": lambda x: x + 5, "inv": lambda y: y - 5, "range": (1, 15)},
+            {"desc": "subtracted 3 from a number", "op": lambda x: x - 3, "inv": lambda y: y + 3, "range": (4, 20)},
+            {"desc": "squared a number", "op": lambda x: x ** 2, "inv": lambda y: int(y ** 0.5), "range": (2, 10)}
+        ]
+
+        op_info = self.random.choice(operations)
+        original = self.random.randint(*op_info["range"])
+
+        # Ensure clean results for operations like square root
+        while "squared" in op_info["desc"] and int(original ** 0.5) ** 2 != original:
+            original = self.random.randint(*op_info["range"])
+
+        result = op_info["op"](original)
+
+        question = f"I {op_info['desc']} and got {result}. What was the original number?"
+        answer = original
+
+        return question, str(answer), "reverse_logic"
+
+    def _generate_word_puzzle(self):
+        """Generate a simple word problem"""
+        templates = [
+            {
+                "template": "{name} has {start} apples. {pronoun} buys {buys} more and eats {eats}. How many apples does {pronoun} have now?",
+                "calc": lambda start, buys, eats: start + buys - eats,
+                "ranges": {"start": (2, 8), "buys": (1, 5), "eats": (1, 3)}
+            },
+            {
+                "template": "{name} has {start} pencils. {pronoun} gives {gives} to friends and finds {finds} more. How many pencils does {pronoun} have now?",
+                "calc": lambda start, gives, finds: start - gives + finds,
+                "ranges": {"start": (5, 10), "gives": (1, 4), "finds": (1, 4)}
+            },
+            {
+                "template": "There are {start} children on a bus. {board} more get on and {exit} get off. How many children are on the bus now?",
+                "calc": lambda start, board, exit: start + board - exit,
+                "ranges": {"start": (5, 15), "board": (2, 8), "exit": (1, 7)}
+            }
+        ]
+
+        names = [("Amy", "she"), ("Tom", "he"), ("Sam", "they"), ("Pat", "they"), ("Alex", "they")]
+        template_data = self.random.choice(templates)
+
+        # Generate random values for the puzzle
+        values = {}
+        for key, (min_val, max_val) in template_data["ranges"].items():
+            values[key] = self.random.randint(min_val, max_val)
+
+        # Select a random name if needed
+        if "{name}" in template_data["template"]:
+            name, pronoun = self.random.choice(names)
+            values["name"] = name
+            values["pronoun"] = pronoun
+
+        # Calculate the answer
+        answer = template_data["calc"](**{k: v for k, v in values.items() if k in ["start", "buys", "eats", "gives", "finds", "board", "exit"]})
+
+        # Generate the question
+        question = template_data["template"].format(**values)
+
+        return question, str(answer), "word_puzzle"
+
+    def _generate_true_false(self):
+        """Generate a true/false math statement"""
+        operation = self.random.choice(["addition", "subtraction", "multiplication"])
+        is_true = self.random.choice([True, False])
+
+        if operation == "addition":
+            a = self.random.randint(1, 20)
+            b = self.random.randint(1, 20)
+            true_result = a + b
+
+        elif operation == "subtraction":
+            a = self.random.randint(5, 25)
+            b = self.random.randint(1, a)
+            true_result = a - b
+
+        else:  # multiplication
+            a = self.random.randint(2, 10)
+            b = self.random.randint(2, 10)
+            true_result = a * b
+
+        if is_true:
+            result = true_result
+            answer = "True"
+        else:
+            # Make the false result close to true result for challenge
+            offset = self.random.choice([-2, -1, 1, 2])
+            result = true_result + offset
+            answer = "False"
+
+        if operation == "addition":
+            question = f"True or False: {a} + {b} = {result}"
+        elif operation == "subtraction":
+            question = f"True or False: {a} - {b} = {result}"
+        else:  # multiplication
+            question = f"True or False: {a} × {b} = {result}"
+
+        return question, answer, "true_false"
+
+    def _generate_time_riddle(self):
+        """Generate a time-based riddle"""
+        # Generate a random current time
+        current_hour = self.random.randint(1, 12)
+        am_pm = self.random.choice(["AM", "PM"])
+
+        # Generate time change
+        hours_change = self.random.randint(1, 5)
+        operation = self.random.choice(["add", "subtract"])
+
+        if operation == "add":
+            new_hour = (current_hour + hours_change) % 12
+            if new_hour == 0:
+                new_hour = 12
+
+            # Handle AM/PM change
+            new_am_pm = am_pm
+            if current_hour + hours_change > 12:
+                new_am_pm = "PM" if am_pm == "AM" else "AM"
+
+            question = f"If it's {current_hour} {am_pm} now, what time will it be in {hours_change} hours?"
+            answer = f"{new_hour} {new_am_pm}"
+        else:
+            new_hour = (current_hour - hours_change) % 12
+            if new_hour <= 0:
+                new_hour += 12
+
+            # Handle AM/PM change
+            new_am_pm = am_pm
+            if current_hour - hours_change <= 0:
+                new_am_pm = "PM" if am_pm == "AM" else "AM"
+
+            question = f"If it's {current_hour} {am_pm} now, what time was it {hours_change} hours ago?"
+            answer = f"{new_hour} {new_am_pm}"
+
+        return question, answer, "time_riddle"
+
+
+class MinesweeperGame:
+    """Tile, score and lives state for Math Minesweeper."""
+
+    # Cell states
+    HIDDEN = None
+    CLEARED = "correct"
+    MINE = "wrong"
+
+    def __init__(self, rows=5, cols=5, lives=3, question_generator=None, rng=random):
+        self.rows = rows
+        self.cols = cols
+        self.max_lives = lives
+        self.question_generator = question_generator or QuestionGenerator(rng)
+        self.restart()
+
+    def restart(self):
+        """Reset score, lives and every tile"""
+        self.score = 0
+        self.lives = self.max_lives
+        self.cells = [[self.HIDDEN] * self.cols for _ in range(self.rows)]
+        self.hidden_count = self.rows * self.cols
+        self.game_over = False
+
+    def is_hidden(self, row, col):
+        return not self.game_over and self.cells[row][col] is self.HIDDEN
+
+    def next_question(self):
+        """Returns a random question, its answer, and its type"""
+        return self.question_generator.get_random_question()
+
+    @staticmethod
+    def is_correct(user_answer, correct_answer):
+        """Compare answers ignoring case and surrounding whitespace"""
+        return str(user_answer).strip().lower() == str(correct_answer).strip().lower()
+
+    def answer(self, row, col, user_answer, correct_answer):
+        """Reveal a tile with the player's answer; returns True if correct"""
+        if not self.is_hidden(row, col):
+            raise ValueError(f"Tile ({row}, {col}) is already revealed")
+
+        correct = self.is_correct(user_answer, correct_answer)
+        self.hidden_count -= 1
+        if correct:
+            self.cells[row][col] = self.CLEARED
+            self.score += 10
+        else:
+            self.cells[row][col] = self.MINE
+            self.lives -= 1
+
+        if self.is_won() or self.is_lost():
+            self.game_over = True
+        return correct
+
+    def is_won(self):
+        return self.hidden_count == 0 and self.lives > 0
+
+    def is_lost(self):
+        return self.lives <= 0
@@ -0,0 +1,366 @@
+"""
+Number Ninja rules: numbers float across the play area and the player
+clicks the ones that match the current rule.
+"""
+
+import math
+import random
+
+try:
+    import cairo
+except ImportError:
+    # Only Number.draw() needs cairo; the rules run without it
+    cairo = None
+
+# Seconds between two correct clicks that still extend a combo
+COMBO_WINDOW = 2.0
+
+
+# Define a number class to handle the floating numbers
+class Number:
+    # Shared size for new numbers, scaled to the play area by the game
+    size = 30
+
+    def __init__(self, value, x, y, speed):
+        self.value = value
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.size = Number.size
+
+        # Simple pastel color palette based on number value
+        hue = (value * 25) % 360 / 360  # Use value to create different hues
+        self.color = self._hsv_to_rgb(hue, 0.65, 0.95)
+
+        self.alive = True
+        self.pulse = 0  # For animation
+        self.pulse_direction = 1
+        # Minimal rotation for subtle movement
+        self.rotation = random.uniform(-0.05, 0.05)
+
+    def _hsv_to_rgb(self, h, s, v):
+        if s == 0:
+            return v, v, v
+
+        i = int(h * 6)
+        f = h * 6 - i
+        p = v * (1 - s)
+        q = v * (1 - f * s)
+        t = v * (1 - (1 - f) * s)
+
+        if i % 6 == 0:
+            return v, t, p
+        elif i % 6 == 1:
+            return q, v, p
+        elif i % 6 == 2:
+            return p, v, t
+        elif i % 6 == 3:
+            return p, q, v
+        elif i % 6 == 4:
+            return t, p, v
+        else:
+            return v, p, q
+
+    def move(self):
+        self.x += self.speed
+        # Subtle pulsing animation
+        self.pulse += 0.08 * self.pulse_direction
+        if self.pulse > 1:
+            self.pulse = 1
+            self.pulse_direction = -1
+        elif self.pulse < 0:
+            self.pulse = 0
+            self.pulse_direction = 1
+
+    def is_clicked(self, click_x, click_y):
+        # Check if the click is inside the number
+        distance = math.sqrt((self.x - click_x)**2 + (self.y - click_y)**2)
+        return distance < self.size / 2
+
+    def draw(self, context):
+        # Calculate size with subtle pulse effect
+        pulse_size = self.size * (1 + self.pulse * 0.1)
+
+        # Save context for rotation
+        context.save()
+        context.translate(self.x, self.y)
+        context.rotate(self.rotation)
+
+        # Draw the number bubble - with enhanced visual style
+        r, g, b = self.color
+
+        # Add a slight shadow for depth
+        context.set_source_rgba(0, 0, 0, 0.15)
+        context.arc(2, 3, pulse_size/2, 0, 2 * math.pi)
+        context.fill()
+
+        # Main circle - more vibrant gradient
+        gradient = cairo.RadialGradient(
+            -pulse_size/6, -pulse_size/6, 0,  # Inner point (offset for highlight)
+            0, 0, pulse_size/2                # Outer point
+        )
+        gradient.add_color_stop_rgba(0, min(r+0.2, 1), min(g+0.2, 1), min(b+0.2, 1), 1)  # Lighter center
+        gradient.add_color_stop_rgba(1, r, g, b, 1)                                      # Original color edge
+
+        context.set_source(gradient)
+        context.arc(0, 0, pulse_size/2, 0, 2 * math.pi)
+        context.fill()
+
+        # More subtle highlight
+        context.set_line_width(2)
+        context.set_source_rgba(1, 1, 1, 0.8)
+        context.arc(0, 0, pulse_size/2 - 1, 0, math.pi)  # Half circle highlight
+        context.stroke()
+
+        # Draw the number text
+        context.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_BOLD)
+        context.set_font_size(pulse_size * 0.6)
+
+        # Center the text
+        text = str(self.value)
+        x_bearing, y_bearing, width, height, x_advance, y_advance = context.text_extents(text)
+
+        # Improved text with subtle shadow for better readability
+        # Text shadow
+        context.set_source_rgba(0, 0, 0, 0.25)
+        context.move_to(-width / 2 - x_bearing + 1, -height / 2 - y_bearing + 1)
+        context.show_text(text)
+
+        # Text with contrast for readability
+        context.set_source_rgb(1, 1, 1)  # White text
+        context.move_to(-width / 2 - x_bearing, -height / 2 - y_bearing)
+        context.show_text(text)
+
+        # Restore context after rotation
+        context.restore()
+
+
+class NumberNinjaGame:
+    """Score, health, level and power-up state for Number Ninja."""
+
+    RULES = ("even", "prime", "multiple3")
+
+    def __init__(self, rule_type="even", rng=random):
+        self.random = rng
+        self.rule_type = rule_type
+        self.width = 0
+        self.height = 0
+        self.reset()
+
+    def reset(self):
+        """Reset game variables"""
+        self.numbers = []
+        self.score = 0
+        self.health = 100
+        self.game_time = 60  # 60 seconds
+        self.is_running = False
+
+        # Gameplay variables
+        self.level = 1
+        self.combo_count = 0
+        self.max_combo = 0
+        self.number_speed_multiplier = 1.0
+        self.spawn_rate = 1500  # ms between spawns
+        self.next_level_score = 100  # Score needed for level 2
+        self.last_correct_time = 0  # For tracking combo timing
+
+        # Power-up variables
+        self.slow_time_active = False
+        self.slow_time_remaining = 0
+        self.power_up_available = False
+        self.power_up_type = None
+
+    def start(self, width, height):
+        """Start a new game in a play area of the given size"""
+        self.reset()
+        self.resize(width, height)
+        self.is_running = True
+
+    def resize(self, width, height):
+        """Scale number size based on the smaller dimension"""
+        self.width = width
+        self.height = height
+        if width and height:
+            Number.size = min(width, height) / 12
+            for num in self.numbers:
+                num.size = Number.size
+
+    def check_rule(self, value):
+        if self.rule_type == "even":
+            return value % 2 == 0
+        elif self.rule_type == "prime":
+            # Simple prime check
+            if value < 2:
+                return False
+            for i in range(2, int(math.sqrt(value)) + 1):
+                if value % i == 0:
+                    return False
+            return True
+        elif self.rule_type == "multiple3":
+            return value % 3 == 0
+        return False
+
+    def spawn_number(self):
+        """Create a new number at the left edge; returns it"""
+        value = self.random.randint(1, 20)
+
+        # Calculate spawn position and speed
+        x = -Number.size
+        y = self.random.uniform(Number.size, self.height - Number.size)
+
+        # Speed increases with level
+        base_speed = 2.0 * self.number_speed_multiplier
+
+        # Add some randomness to speed
+        speed = base_speed * self.random.uniform(0.8, 1.2)
+
+        # Slow time effect
+        if self.slow_time_active:
+            speed *= 0.5
+
+        new_number = Number(value, x, y, speed)
+        new_number.size = Number.size  # Update with current size
+        self.numbers.append(new_number)
+        return new_number
+
+    def update(self):
+        """Advance every number one step; returns False once the game ends"""
+        if not self.is_running:
+            return False
+
+        alive = []
+        for num in self.numbers:
+            num.move()
+
+            # Check if number went off screen
+            if num.x > self.width + num.size:
+                # If it was a correct number, penalize
+                if self.check_rule(num.value):
+                    self.health = max(0, self.health - 5)
+            else:
+                alive.append(num)
+        self.numbers = alive
+
+        # Check for game over
+        if self.health <= 0:
+            self.is_running = False
+        return self.is_running
+
+    def number_at(self, x, y):
+        for num in self.numbers:
+            if num.is_clicked(x, y):
+                return num
+        return None
+
+    def click(self, x, y, now):
+        """Handle a click at (x, y) at time `now` (seconds).
+
+        Returns True for a correct hit, False for a wrong one and None if no
+        number was hit.
+        """
+        if not self.is_running:
+            return None
+
+        num = self.number_at(x, y)
+        if num is None:
+            return None
+
+        if self.check_rule(num.value):
+            self.correct_click(num, now)
+            return True
+        self.incorrect_click(num)
+        return False
+
+    def correct_click(self, num, now):
+        # Remove the number from the game
+        self.numbers.remove(num)
+
+        # Update score based on level
+        points = 10 * self.level
+
+        # Add combo bonus if applicable
+        if self.combo_count > 0 and now - self.last_correct_time < COMBO_WINDOW:
+            self.combo_count += 1
+            # Exponential combo bonus
+            points += int(points * (self.combo_count * 0.1))
+        else:
+            # Start new combo
+            self.combo_count = 1
+
+        self.max_combo = max(self.max_combo, self.combo_count)
+
+        # Track time of correct click for combo calculation
+        self.last_correct_time = now
+        self.score += points
+
+        # Power-ups are applied as soon as they become available
+        if not self.power_up_available and self.combo_count >= 5:
+            self.power_up_available = True
+            self.power_up_type = self.random.choice(["slow", "health", "clear"])
+            self.activate_power_up()
+
+    def incorrect_click(self, num):
+        # Remove the number and reset combo
+        self.numbers.remove(num)
+        self.combo_count = 0
+
+        # Reduce health
+        self.health = max(0, self.health - 10)
+        if self.health <= 0:
+            self.is_running = False
+
+    def activate_power_up(self):
+        """Apply the pending power-up; returns its type"""
+        if not self.power_up_available:
+            return None
+
+        power_up = self.power_up_type
+        if power_up == "slow":
+            # Activate slow time effect
+            self.slow_time_active = True
+            self.slow_time_remaining = 5  # 5 seconds of slow time
+            for num in self.numbers:
+                num.speed *= 0.5
+        elif power_up == "health":
+            # Restore health
+            self.health = min(100, self.health + 30)
+        elif power_up == "clear":
+            # Remove all incorrect numbers
+            self.numbers = [num for num in self.numbers if self.check_rule(num.value)]
+
+        # Reset power-up
+        self.power_up_available = False
+        return power_up
+
+    def end_slow_time(self):
+        self.slow_time_active = False
+
+        # Return numbers to normal speed
+        for num in self.numbers:
+            num.speed *= 2.0
+
+    def tick(self):
+        """Count the timer down one second; returns False when time is up"""
+        if not self.is_running:
+            return False
+        self.game_time -= 1
+        if self.game_time <= 0:
+            self.is_running = False
+        return self.is_running
+
+    def check_level_up(self):
+        """Level up if the score allows it; returns True on a new level"""
+        if not self.is_running or self.score < self.next_level_score:
+            return False
+
+        self.level += 1
+
+        # Update next level threshold
+        self.next_level_score = self.next_level_score + (self.level * 100)
+
+        # Increase difficulty
+        self.number_speed_multiplier += 0.2
+
+        # Increase spawn rate (reduce time between spawns)
+        self.spawn_rate = max(800, self.spawn_rate - 150)
+        return True
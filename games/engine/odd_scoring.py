@@ -0,0 +1,127 @@
+"""
+Odd Scoring rules: players alternately add (or subtract) 1-3 and whoever
+lands exactly on the target (or zero) wins.
+"""
+
+import random
+
+# Target sum for each difficulty
+TARGETS = {
+    "easy": 15,
+    "normal": 21,
+    "hard": 30,
+}
+
+MOVES = (1, 2, 3)
+
+
+class OddScoringGame:
+    """Running total, turn counts and computer strategy for Odd Scoring."""
+
+    def __init__(self, game_mode="sum", difficulty="normal", rng=random):
+        self.random = rng
+        self.game_mode = game_mode  # "sum" or "countdown"
+        self.difficulty = difficulty  # "easy", "normal", "hard"
+        self.target_sum = TARGETS[difficulty]
+        self.current_sum = 0
+        self.human_moves = 0
+        self.computer_moves = 0
+        self.game_over = False
+
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self.target_sum = TARGETS[difficulty]
+
+    def start(self):
+        """Reset the running total and move counts."""
+        if self.game_mode == "sum":
+            self.current_sum = 0
+        else:  # countdown
+            self.current_sum = self.target_sum
+
+        self.human_moves = 0
+        self.computer_moves = 0
+        self.game_over = False
+
+    def is_legal(self, move):
+        """Return True if `move` keeps the total within bounds."""
+        if self.game_mode == "sum":
+            return self.current_sum + move <= self.target_sum
+        return self.current_sum - move >= 0
+
+    def valid_moves(self):
+        return [move for move in MOVES if self.is_legal(move)]
+
+    def apply_move(self, move, human):
+        """Apply a move for the human or the computer; returns game over."""
+        if self.game_mode == "sum":
+            self.current_sum += move
+        else:  # countdown
+            self.current_sum -= move
+
+        if human:
+            self.human_moves += 1
+        else:
+            self.computer_moves += 1
+
+        return self.check_game_over()
+
+    def check_game_over(self):
+        if self.game_mode == "sum":
+            self.game_over = self.current_sum >= self.target_sum
+        else:  # countdown
+            self.game_over = self.current_sum <= 0
+        return self.game_over
+
+    def remaining(self):
+        """Distance left to the finishing value."""
+        if self.game_mode == "sum":
+            return self.target_sum - self.current_sum
+        return self.current_sum
+
+    def calculate_computer_move(self):
+        """Calculate the computer's move based on game mode and difficulty."""
+        remaining = self.remaining()
+
+        if self.difficulty == "easy":
+            # Easy: Just random moves
+            valid_moves = self.valid_moves()
+            return self.random.choice(valid_moves) if valid_moves else 1
+
+        if remaining <= 3:
+            # Can win in one move
+            return remaining
+
+        if self.difficulty == "normal" and self.random.random() >= 0.7:
+            # Normal: 70% chance of making the optimal move, else random
+            valid_moves = self.valid_moves()
+            return self.random.choice(valid_moves) if valid_moves else 1
+
+        return self.get_optimal_move(remaining)
+
+    def get_optimal_move(self, remaining):
+        """Leave the opponent on a multiple of 4 where possible."""
+        if remaining % 4 == 0:
+            return 3
+        return remaining % 4
+
+    def result(self):
+        """Return (winner, message) for a finished game."""
+        human_moved_last = self.human_moves > self.computer_moves
+        if self.game_mode == "sum":
+            finish = self.target_sum
+            exact = self.current_sum == self.target_sum
+            overshoot = "over"
+        else:
+            finish = 0
+            exact = self.current_sum == 0
+            overshoot = "below"
+
+        # Last player to move wins if they hit the target exactly
+        if exact:
+            if human_moved_last:
+                return "You Win!", f"You reached exactly {finish}!"
+            return "Computer Wins!", f"Computer reached exactly {finish}!"
+        if human_moved_last:
+            return "Computer Wins!", f"You went {overshoot} {finish}!"
+        return "You Win!", f"Computer went {overshoot} {finish}!"
@@ -0,0 +1,232 @@
+"""
+Additive pattern databases for the sliding puzzle solver.
+
+The tiles are split into disjoint groups. For each group a table holds,
+for every placement of the group's tiles, the fewest moves of those tiles
+needed to bring them home, with every other tile treated as
+interchangeable. Only moves of a group's own tiles are counted, so the
+values of different groups can be added and the sum is still a lower
+bound.
+
+Tables are built once by a breadth-first search backwards from the solved
+position and stored as one byte per placement. A placement of k tiles on
+an n x n board is indexed by its cell numbers read as a base-n*n number,
+so a slide changes the index by a fixed step and lookups need no ranking.
+The files are memory-mapped read-only, so every process using them shares
+the same pages instead of loading a copy.
+
+Build the 4x4 tables with:
+
+    cd games && python3 -c "from engine.pattern_db import main; main()"
+
+Only one process builds at a time: a build holds a lock on a file next to
+the tables, and a second one started meanwhile leaves the work to it.
+"""
+
+import fcntl
+import mmap
+import os
+import threading
+import time
+
+from engine.fifteen import neighbour_table
+
+ENV_VAR = "MATHGAMES_PDB_DIR"
+
+# Disjoint tile groups per board size. 6-6-3 or 7-8 partitions give
+# stronger bounds, but with the sparse base-n*n indexing above a 6-tile
+# table has 16**6 entries (16 MB, mostly unreachable) and building one
+# in pure Python takes far too long; they would need ranked
+# (permutation) indexing, which is not implemented. With 5-5-5 plus
+# walking distance the hardest 80-move positions still take IDA* from
+# tens of seconds up to about a minute and a half, so optimal hints for
+# them are not interactive: the game's hint search gives up after
+# its time limit and the fast solver's upper bound is shown instead.
+PARTITIONS = {
+    4: ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+}
+
+UNSEEN = 255
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def table_dir():
+    """Directory the tables are stored in."""
+    value = os.environ.get(ENV_VAR)
+    if value:
+        return value
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "mathgames")
+
+
+def table_path(grid_size, tiles):
+    name = "-".join(str(tile) for tile in tiles)
+    return os.path.join(table_dir(), f"pdb-{grid_size}x{grid_size}-{name}.bin")
+
+
+def build_table(grid_size, tiles):
+    """Return the pattern database of `tiles` as a bytearray.
+
+    Each search state is a placement of the group plus the region of cells
+    the empty cell can reach without moving a group tile; moves inside the
+    region are free, so a whole region is expanded at once.
+    """
+    size = grid_size * grid_size
+    k = len(tiles)
+    weights = [size ** (k - 1 - j) for j in range(k)]
+    neighbours = neighbour_table(grid_size)
+
+    table = bytearray([UNSEEN]) * (size ** k)
+    # Per (placement, empty cell): 0 new, 1 queued, 2 expanded
+    state = bytearray(size ** k * size)
+
+    goal = sum((tile - 1) * weight for tile, weight in zip(tiles, weights))
+    frontier = [goal * size + size - 1]
+    depth = 0
+    while frontier:
+        next_frontier = []
+        for code in frontier:
+            if state[code] == 2:
+                continue
+            index, blank = divmod(code, size)
+            if table[index] == UNSEEN:
+                table[index] = depth
+
+            # Cell -> slot of the group tile on it
+            slots = {}
+            rest = index
+            for j, weight in enumerate(weights):
+                cell, rest = divmod(rest, weight)
+                slots[cell] = j
+
+            base = index * size
+            state[base + blank] = 2
+            stack = [blank]
+            while stack:
+                cell = stack.pop()
+                for neighbour in neighbours[cell]:
+                    j = slots.get(neighbour)
+                    if j is None:
+                        if state[base + neighbour] != 2:
+                            state[base + neighbour] = 2
+                            stack.append(neighbour)
+                    else:
+                        # Slide the group tile into the empty cell
+                        child = (index + (cell - neighbour) * weights[j]) * size + neighbour
+                        if state[child] == 0:
+                            state[child] = 1
+                            next_frontier.append(child)
+        frontier = next_frontier
+        depth += 1
+    return table
+
+
+def write_table(path, table):
+    """Write a table atomically so readers never map a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as table_file:
+        table_file.write(table)
+    os.replace(temp_path, path)
+
+
+def map_table(path):
+    with open(path, "rb") as table_file:
+        return mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def tables_exist(grid_size):
+    partition = PARTITIONS.get(grid_size)
+    return partition is not None and tables_built(grid_size) == len(partition)
+
+
+def tables_built(grid_size):
+    """How many of grid_size's tables exist, for showing build progress."""
+    return sum(os.path.exists(table_path(grid_size, tiles))
+               for tiles in PARTITIONS.get(grid_size, ()))
+
+
+def ensure_tables(grid_size):
+    """Build whichever tables for grid_size are missing; returns True if all exist."""
+    partition = PARTITIONS.get(grid_size)
+    if partition is None:
+        return False
+    for tiles in partition:
+        path = table_path(grid_size, tiles)
+        if not os.path.exists(path):
+            write_table(path, build_table(grid_size, tiles))
+    return True
+
+
+class PatternDatabaseHeuristic:
+    """Sum of the pattern database values of every tile group."""
+
+    def __init__(self, grid_size, groups, tables):
+        self.grid_size = grid_size
+        self.groups = groups
+        self.tables = tables
+
+        size = grid_size * grid_size
+        # tile -> (group number, index step per cell)
+        self.slots = [None] * size
+        for group, tiles in enumerate(groups):
+            for j, tile in enumerate(tiles):
+                self.slots[tile] = (group, size ** (len(tiles) - 1 - j))
+
+    def index(self, group, pos):
+        size = self.grid_size * self.grid_size
+        index = 0
+        for tile in self.groups[group]:
+            index = index * size + pos[tile]
+        return index
+
+    def estimate(self, board, pos):
+        return sum(table[self.index(group, pos)] for group, table in enumerate(self.tables))
+
+    def update(self, h, board, pos, tile, src, dst, depth):
+        group, step = self.slots[tile]
+        table = self.tables[group]
+        index = self.index(group, pos)
+        return h + table[index] - table[index + (src - dst) * step]
+
+
+def load_heuristic(grid_size):
+    """Return the memory-mapped heuristic for grid_size, or None if not built."""
+    with _lock:
+        heuristic = _loaded.get(grid_size)
+        if heuristic is None and tables_exist(grid_size):
+            partition = PARTITIONS[grid_size]
+            tables = [map_table(table_path(grid_size, tiles)) for tiles in partition]
+            heuristic = PatternDatabaseHeuristic(grid_size, partition, tables)
+            _loaded[grid_size] = heuristic
+        return heuristic
+
+
+def main(niceness=0):
+    """Build every missing table; niceness lowers the process priority."""
+    if niceness:
+        os.nice(niceness)
+    os.makedirs(table_dir(), exist_ok=True)
+    with open(os.path.join(table_dir(), "build.lock"), "w") as lock_file:
+        # The lock goes away with the process, so a crashed build never
+        # blocks the next one
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            print(f"The tables in {table_dir()} are already being built")
+            return
+        for grid_size, partition in PARTITIONS.items():
+            for tiles in partition:
+                path = table_path(grid_size, tiles)
+                if os.path.exists(path):
+                    print(f"{path} already exists")
+                    continue
+                started = time.perf_counter()
+                write_table(path, build_table(grid_size, tiles))
+                print(f"Built {path} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Difficulty-graded scrambles for the Fifteen Puzzle.
+
+A graded scramble is a position whose optimal solution length falls in
+the band of the chosen difficulty. Candidates come from random walks of
+varying length away from the solved board (long walks are close to
+uniformly random positions) and are kept only if the solver puts them in
+the band. That is quick for easy bands but can take a minute for expert
+4x4 positions without the pattern databases, so ScramblePool keeps a
+few ready per difficulty and refills them on a background thread.
+"""
+
+import random
+import threading
+from collections import deque
+
+from engine.fifteen import FifteenPuzzle
+from engine.solver import solve, SearchCancelled
+
+RANDOM = "Random"
+
+# Inclusive range of optimal solution lengths per difficulty. Only sizes
+# that can be solved optimally are graded.
+DIFFICULTY_BANDS = {
+    3: {"Easy": (6, 10), "Medium": (14, 18), "Hard": (20, 24), "Expert": (26, 31)},
+    4: {"Easy": (8, 12), "Medium": (18, 22), "Hard": (33, 37), "Expert": (48, 52)},
+}
+
+# Walks of up to this many times the band's longest length are tried;
+# random walks wander in circles, so they end nearer than their length
+WALK_FACTOR = 2
+
+# Candidates that need a longer search are skipped rather than waited on
+CANDIDATE_NODE_BUDGET = 2000000
+
+
+def difficulties(grid_size):
+    """Difficulty names available for grid_size, easiest first."""
+    return list(DIFFICULTY_BANDS.get(grid_size, {}))
+
+
+class Scramble:
+    """A graded position and one of its shortest solutions."""
+
+    def __init__(self, board, solution):
+        self.board = board
+        self.solution = solution
+
+    def __len__(self):
+        return len(self.solution)
+
+
+def random_walk(grid_size, length, rng=random):
+    """Return the tiles after `length` random slides from solved."""
+    puzzle = FifteenPuzzle(grid_size, rng)
+    puzzle.shuffle(length)
+    return list(puzzle.board)
+
+
+def generate_scramble(grid_size, difficulty, rng=random, should_stop=None):
+    """Return a Scramble in the difficulty's band, or None if stopped."""
+    low, high = DIFFICULTY_BANDS[grid_size][difficulty]
+    while should_stop is None or not should_stop():
+        board = random_walk(grid_size, rng.randint(low, WALK_FACTOR * high), rng)
+        # Candidates beyond the band are given up on as soon as the depth
+        # bound passes it, which is usually before any search at all
+        try:
+            solution = solve(board, grid_size, max_nodes=CANDIDATE_NODE_BUDGET,
+                             should_stop=should_stop, max_length=high)
+        except SearchCancelled:
+            return None
+        if solution is not None and low <= len(solution) <= high:
+            return Scramble(board, solution.moves)
+    return None
+
+
+class ScramblePool:
+    """Scrambles generated ahead of time for every difficulty of one size."""
+
+    def __init__(self, grid_size, size=3, rng=None):
+        self.grid_size = grid_size
+        self.size = size
+        self.random = rng or random.Random()
+        self.pools = {difficulty: deque() for difficulty in difficulties(grid_size)}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Refill the pools on a background thread if it is not running."""
+        with self.lock:
+            if self.thread is not None:
+                return
+            # Each fill gets its own event, so one that is still stopping
+            # never picks up the next fill's
+            self.stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._fill, args=(self.stop_event,),
+                                           daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop refilling; the next start() or take() carries on."""
+        with self.lock:
+            self.stop_event.set()
+            self.thread = None
+
+    def available(self, difficulty):
+        with self.lock:
+            return len(self.pools[difficulty])
+
+    def take(self, difficulty):
+        """Return a ready Scramble, or None if that pool is still empty.
+
+        Never waits for a search, so it is safe to call from the UI
+        thread; the pools are topped up again in the background.
+        """
+        with self.lock:
+            pool = self.pools[difficulty]
+            scramble = pool.popleft() if pool else None
+        self.start()
+        return scramble
+
+    def _next_difficulty(self, stop_event):
+        # The emptiest pool first, so every difficulty gets one quickly
+        with self.lock:
+            difficulty = min(self.pools, key=lambda name: len(self.pools[name]))
+            if len(self.pools[difficulty]) >= self.size:
+                if self.stop_event is stop_event:
+                    self.thread = None
+                return None
+            return difficulty
+
+    def _fill(self, stop_event):
+        while not stop_event.is_set():
+            difficulty = self._next_difficulty(stop_event)
+            if difficulty is None:
+                return
+            scramble = generate_scramble(self.grid_size, difficulty, self.random,
+                                         should_stop=stop_event.is_set)
+            if scramble is not None:
+                with self.lock:
+                    self.pools[difficulty].append(scramble)
@@ -0,0 +1,416 @@
+"""
+Optimal sliding puzzle solver for the Fifteen Puzzle hints.
+
+solve() runs IDA* (iterative deepening A*) over a flat row-major board
+with 0 for the empty cell. The search mutates one board list and one
+tile -> cell list in place, and heuristics are updated incrementally
+from the single tile each move slides, so a node costs no allocation
+beyond the recursion itself.
+
+A solution is the list of tiles to slide into the empty cell, in order;
+its first entry is the hint.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from engine.fifteen import is_solvable_board, neighbour_table, zobrist_table, board_hash
+from engine import pattern_db, walking_distance
+
+# Returned by the depth-first search when the goal was reached
+FOUND = -1
+
+# How often (in expanded nodes) a search checks for cancellation and
+# reports progress, unless the caller asks for a shorter interval
+CHECK_INTERVAL = 4096
+PROGRESS_INTERVAL = 65536
+
+
+class SearchCancelled(Exception):
+    """Raised inside solve() when should_stop() returned True."""
+
+
+class ManhattanHeuristic:
+    """Sum of every tile's grid distance to its solved cell."""
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        size = grid_size * grid_size
+        # distance[tile][cell]
+        self.distance = [[0] * size]
+        for tile in range(1, size):
+            goal_x, goal_y = (tile - 1) % grid_size, (tile - 1) // grid_size
+            self.distance.append([abs(cell % grid_size - goal_x) + abs(cell // grid_size - goal_y)
+                                  for cell in range(size)])
+
+    def estimate(self, board, pos):
+        return sum(self.distance[tile][cell] for cell, tile in enumerate(board) if tile)
+
+    def update(self, h, board, pos, tile, src, dst, depth):
+        """Return h after `tile` slid from cell src to dst (already applied).
+
+        depth is the number of moves made to reach the new position, for
+        heuristics that keep state per search depth.
+        """
+        return h + self.distance[tile][dst] - self.distance[tile][src]
+
+
+class LinearConflictHeuristic(ManhattanHeuristic):
+    """Manhattan distance plus linear conflicts.
+
+    Two tiles in their goal row (or column) but in the wrong order there
+    must step out of the line to pass each other, which adds two moves
+    each. For every line the fewest tiles that have to step out is the
+    number of tiles in their goal line minus the longest run already in
+    goal order.
+    """
+
+    def __init__(self, grid_size):
+        super().__init__(grid_size)
+        self.row_memo = [{} for _ in range(grid_size)]
+        self.col_memo = [{} for _ in range(grid_size)]
+
+    def _line_conflicts(self, memo, line, index, by_row):
+        conflicts = memo.get(line)
+        if conflicts is not None:
+            return conflicts
+
+        n = self.grid_size
+        goals = []
+        for tile in line:
+            if tile == 0:
+                continue
+            goal_row, goal_col = (tile - 1) // n, (tile - 1) % n
+            if by_row and goal_row == index:
+                goals.append(goal_col)
+            elif not by_row and goal_col == index:
+                goals.append(goal_row)
+
+        # Longest increasing subsequence of the goal positions
+        longest = [1] * len(goals)
+        for i in range(len(goals)):
+            for j in range(i):
+                if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        conflicts = 2 * (len(goals) - max(longest, default=0))
+        memo[line] = conflicts
+        return conflicts
+
+    def row_conflicts(self, board, row):
+        n = self.grid_size
+        return self._line_conflicts(self.row_memo[row], tuple(board[row * n:row * n + n]), row, True)
+
+    def col_conflicts(self, board, col):
+        return self._line_conflicts(self.col_memo[col], tuple(board[col::self.grid_size]), col, False)
+
+    def estimate(self, board, pos):
+        h = super().estimate(board, pos)
+        for line in range(self.grid_size):
+            h += self.row_conflicts(board, line) + self.col_conflicts(board, line)
+        return h
+
+    def update(self, h, board, pos, tile, src, dst, depth):
+        n = self.grid_size
+        h += self.distance[tile][dst] - self.distance[tile][src]
+
+        # A vertical slide keeps the order inside the tile's column but
+        # changes two rows; a horizontal slide is the other way round
+        if src % n == dst % n:
+            lines, conflicts = (src // n, dst // n), self.row_conflicts
+        else:
+            lines, conflicts = (src % n, dst % n), self.col_conflicts
+
+        after = conflicts(board, lines[0]) + conflicts(board, lines[1])
+        board[src], board[dst] = tile, 0
+        before = conflicts(board, lines[0]) + conflicts(board, lines[1])
+        board[src], board[dst] = 0, tile
+        return h + after - before
+
+
+class Solution:
+    """Result of a search: the tiles to slide, in order, and search stats.
+
+    `complete` is False for the start of a solution from a search that
+    ran out of time.
+    """
+
+    def __init__(self, moves, nodes, elapsed, complete=True):
+        self.moves = moves
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.complete = complete
+
+    def __len__(self):
+        return len(self.moves)
+
+
+class MaxHeuristic:
+    """The larger of two admissible heuristics, which is admissible too.
+
+    Each part is updated with its own previous value, so those are kept
+    per search depth.
+    """
+
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.first_values = [0] * walking_distance.MAX_DEPTH
+        self.second_values = [0] * walking_distance.MAX_DEPTH
+
+    def estimate(self, board, pos):
+        first = self.first_values[0] = self.first.estimate(board, pos)
+        second = self.second_values[0] = self.second.estimate(board, pos)
+        return max(first, second)
+
+    def update(self, h, board, pos, tile, src, dst, depth):
+        first_values, second_values = self.first_values, self.second_values
+        first = self.first.update(first_values[depth - 1], board, pos, tile, src, dst, depth)
+        second = self.second.update(second_values[depth - 1], board, pos, tile, src, dst, depth)
+        first_values[depth] = first
+        second_values[depth] = second
+        return first if first > second else second
+
+
+def pdb_walking_distance(grid_size):
+    pdb = pattern_db.load_heuristic(grid_size)
+    walking = walking_distance.load_heuristic(grid_size)
+    if pdb is None or walking is None:
+        return None
+    return MaxHeuristic(pdb, walking)
+
+
+# Heuristics by name; each factory returns a new heuristic (some keep
+# per-search state), or None if it is not available for a size
+HEURISTICS = {
+    "manhattan": ManhattanHeuristic,
+    "linear-conflict": LinearConflictHeuristic,
+    "walking-distance": walking_distance.load_heuristic,
+    "pdb": pattern_db.load_heuristic,
+    "pdb+walking-distance": pdb_walking_distance,
+}
+
+# Heuristics to try per board size, fastest first, as measured with
+# benchmarks/solve_batch.py. Sizes not listed use linear conflict.
+PREFERRED_HEURISTICS = {
+    3: ("walking-distance",),
+    4: ("pdb+walking-distance", "pdb", "walking-distance"),
+}
+
+
+def default_heuristic(grid_size):
+    """Return the fastest heuristic available for grid_size."""
+    for name in PREFERRED_HEURISTICS.get(grid_size, ()):
+        heuristic = HEURISTICS[name](grid_size)
+        if heuristic is not None:
+            return heuristic
+    return LinearConflictHeuristic(grid_size)
+
+
+def solve(board, grid_size, heuristic=None, max_nodes=None, should_stop=None, progress=None,
+          max_length=None, check_interval=CHECK_INTERVAL):
+    """Return an optimal Solution for `board`.
+
+    Returns None when max_nodes expansions were not enough to finish, or
+    when every solution is longer than max_length moves.
+    Raises ValueError for a board that cannot be solved, and
+    SearchCancelled as soon as should_stop() returns True; it is called
+    every check_interval nodes, which should divide PROGRESS_INTERVAL.
+    progress(nodes, bound) is called when the depth bound grows and every
+    PROGRESS_INTERVAL nodes.
+    """
+    if not is_solvable_board(board, grid_size):
+        raise ValueError("This board cannot be solved")
+    if heuristic is None:
+        heuristic = default_heuristic(grid_size)
+    started = time.perf_counter()
+
+    board = list(board)
+    pos = [0] * len(board)
+    for cell, tile in enumerate(board):
+        pos[tile] = cell
+    neighbours = neighbour_table(grid_size)
+    update = heuristic.update
+
+    path = []
+    nodes = 0
+
+    def search(blank, g, bound, h, previous):
+        nonlocal nodes
+        if h == 0:
+            return FOUND
+        nodes += 1
+        if nodes % check_interval == 0:
+            if max_nodes is not None and nodes > max_nodes:
+                raise OverflowError
+            if should_stop is not None and should_stop():
+                raise SearchCancelled
+            if progress is not None and nodes % PROGRESS_INTERVAL == 0:
+                progress(nodes, bound)
+
+        minimum = None
+        for cell in neighbours[blank]:
+            if cell == previous:
+                continue
+            tile = board[cell]
+            board[blank], board[cell] = tile, 0
+            pos[tile], pos[0] = blank, cell
+
+            child_h = update(h, board, pos, tile, cell, blank, g + 1)
+            f = g + 1 + child_h
+            if f <= bound:
+                path.append(tile)
+                f = search(cell, g + 1, bound, child_h, blank)
+                if f == FOUND:
+                    return FOUND
+                path.pop()
+
+            board[blank], board[cell] = 0, tile
+            pos[tile], pos[0] = cell, blank
+            if minimum is None or f < minimum:
+                minimum = f
+        return minimum
+
+    h = heuristic.estimate(board, pos)
+    bound = h
+    try:
+        while max_length is None or bound <= max_length:
+            if progress is not None:
+                progress(nodes, bound)
+            result = search(pos[0], 0, bound, h, None)
+            if result == FOUND:
+                return Solution(path, nodes, time.perf_counter() - started)
+            bound = result
+    except OverflowError:
+        pass
+    return None
+
+
+class HintCache:
+    """LRU cache from a board's Zobrist hash to a shortest way to solve it.
+
+    store() records every position along a solution, so a player who
+    follows the hints (or returns to a position they saw before) gets the
+    next one without another search. Entries share the solution's move
+    tuple and keep only an offset into it. Solutions that are not known to
+    be shortest belong in a cache of their own, so they never pass for
+    optimal ones or push them out.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+
+    def get(self, position_hash):
+        """Return (next tile to slide, moves left) for a position, or None.
+
+        The next tile is None for a solved position.
+        """
+        entry = self.entries.get(position_hash)
+        if entry is None:
+            return None
+        self.entries.move_to_end(position_hash)
+        moves, offset = entry
+        if offset == len(moves):
+            return None, 0
+        return moves[offset], len(moves) - offset
+
+    def store(self, board, grid_size, moves):
+        """Remember `moves` as the solution of `board` and of each position after it."""
+        moves = tuple(moves)
+        board = list(board)
+        keys = zobrist_table(grid_size)
+        position_hash = board_hash(board, grid_size)
+        blank = board.index(0)
+        for offset, tile in enumerate(moves):
+            self._put(position_hash, (moves, offset))
+            cell = board.index(tile)
+            board[blank], board[cell] = tile, 0
+            position_hash ^= (keys[tile][cell] ^ keys[tile][blank] ^
+                              keys[0][blank] ^ keys[0][cell])
+            blank = cell
+        self._put(position_hash, (moves, len(moves)))
+
+    def clear(self):
+        self.entries.clear()
+
+    def _put(self, position_hash, entry):
+        self.entries[position_hash] = entry
+        self.entries.move_to_end(position_hash)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+
+class BackgroundSearch:
+    """Run solve(), or another search given to run(), on a daemon thread,
+    one search at a time.
+
+    Results and progress are handed to `dispatch` (GLib.idle_add in the
+    Gtk game) so the callbacks run on the caller's thread. Starting a new
+    search or calling cancel() stops the old one and drops anything it
+    still delivers, so callbacks never see a result for an old board.
+    """
+
+    def __init__(self, dispatch):
+        self.dispatch = dispatch
+        self.generation = 0
+        self.cancel_event = None
+
+    def is_running(self):
+        return self.cancel_event is not None
+
+    def start(self, board, grid_size, on_done, on_progress=None, max_nodes=None,
+              time_limit=None):
+        """Search `board`; on_done(solution) receives a Solution, or None if
+        max_nodes expansions or time_limit seconds were not enough."""
+        board = list(board)
+
+        def search(should_stop, report):
+            return solve(board, grid_size, max_nodes=max_nodes,
+                         should_stop=should_stop, progress=report)
+
+        self.run(search, on_done, on_progress, time_limit)
+
+    def run(self, search, on_done, on_progress=None, time_limit=None):
+        """Call search(should_stop, progress) on the thread and hand its
+        result to on_done; running out of time_limit seconds hands None."""
+        self.cancel()
+        generation = self.generation
+        cancel_event = threading.Event()
+        self.cancel_event = cancel_event
+        started = time.perf_counter()
+
+        def should_stop():
+            return cancel_event.is_set() or (
+                time_limit is not None and time.perf_counter() - started > time_limit)
+
+        def deliver(callback, *args):
+            def run():
+                if generation == self.generation:
+                    if callback is on_done:
+                        self.cancel_event = None
+                    callback(*args)
+                return False
+            self.dispatch(run)
+
+        def report(nodes, bound):
+            if on_progress is not None:
+                deliver(on_progress, nodes, bound)
+
+        def work():
+            try:
+                result = search(should_stop, report)
+            except SearchCancelled:
+                if cancel_event.is_set():
+                    return
+                result = None  # Out of time
+            deliver(on_done, result)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def cancel(self):
+        """Stop the running search and discard its results."""
+        self.generation += 1
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
@@ -0,0 +1,157 @@
+"""
+Walking distance heuristic for the sliding puzzle solver.
+
+Walking distance looks at the board one axis at a time. For the rows it
+only records, for every row, how many of its tiles belong in each goal
+row, plus the row of the empty cell. Every vertical slide moves one tile
+between two neighbouring rows of that summary, so the fewest vertical
+slides that can sort the summary is a lower bound on the vertical slides
+of any solution. The columns are the same problem turned sideways, and
+the two bounds add up because every slide is either vertical or
+horizontal. It sees the detours tiles make around each other in a row or
+column, which Manhattan distance misses.
+
+The summaries of an n x n board are few (24964 for 4x4), so the distance
+of every one is found once by a breadth-first search from the goal and
+kept in a table, together with the summary each slide leads to. Lookups
+during a search then only follow those links. The tables are built in
+memory the first time they are needed, which takes well under a second
+for 4x4; bigger boards have far too many summaries, so only sizes up to
+MAX_SIZE are supported.
+"""
+
+import threading
+
+MAX_SIZE = 4
+
+# Deepest search the per-depth state can follow; optimal 4x4 solutions
+# are at most 80 moves
+MAX_DEPTH = 256
+
+_lock = threading.Lock()
+_tables = {}
+
+
+class WalkingDistanceTable:
+    """Distances and slide links of every row summary of one board size.
+
+    A summary is numbered by its position in `ids`. distance[i] is its
+    walking distance; links[i * 2n + d * n + g] is the summary reached when
+    the empty cell moves up (d = 0) or down (d = 1) and swaps with a tile
+    whose goal row is g, or -1 if there is no such tile.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        n = grid_size
+
+        # A summary is (counts, blank row), counts[r * n + g] being the
+        # number of tiles in row r that belong in row g
+        goal_counts = [0] * (n * n)
+        for row in range(n):
+            goal_counts[row * n + row] = n
+        goal_counts[-1] = n - 1
+        goal = (tuple(goal_counts), n - 1)
+
+        self.ids = {goal: 0}
+        summaries = [goal]
+        distance = [0]
+        links = []
+        index = 0
+        while index < len(summaries):
+            counts, blank = summaries[index]
+            for direction, row in enumerate((blank - 1, blank + 1)):
+                for g in range(n):
+                    if not 0 <= row < n or counts[row * n + g] == 0:
+                        links.append(-1)
+                        continue
+                    child = list(counts)
+                    child[row * n + g] -= 1
+                    child[blank * n + g] += 1
+                    key = (tuple(child), row)
+                    child_id = self.ids.get(key)
+                    if child_id is None:
+                        child_id = len(summaries)
+                        self.ids[key] = child_id
+                        summaries.append(key)
+                        distance.append(distance[index] + 1)
+                    links.append(child_id)
+            index += 1
+
+        self.distance = bytes(distance)
+        self.links = links
+
+    def row_id(self, board):
+        """Number of the row summary of a flat row-major board."""
+        n = self.grid_size
+        counts = [0] * (n * n)
+        blank = 0
+        for cell, tile in enumerate(board):
+            if tile:
+                counts[cell // n * n + (tile - 1) // n] += 1
+            else:
+                blank = cell // n
+        return self.ids[(tuple(counts), blank)]
+
+    def column_id(self, board):
+        """Number of the column summary, which uses the same table."""
+        n = self.grid_size
+        counts = [0] * (n * n)
+        blank = 0
+        for cell, tile in enumerate(board):
+            if tile:
+                counts[cell % n * n + (tile - 1) % n] += 1
+            else:
+                blank = cell % n
+        return self.ids[(tuple(counts), blank)]
+
+
+def load_table(grid_size):
+    """Return the table for grid_size, building it on first use."""
+    with _lock:
+        table = _tables.get(grid_size)
+        if table is None:
+            table = WalkingDistanceTable(grid_size)
+            _tables[grid_size] = table
+        return table
+
+
+class WalkingDistanceHeuristic:
+    """Row plus column walking distance.
+
+    The summaries of the position at each search depth are kept in
+    `rows` and `columns`, so each instance serves one search at a time.
+    """
+
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.table = load_table(grid_size)
+        self.rows = [0] * MAX_DEPTH
+        self.columns = [0] * MAX_DEPTH
+
+    def estimate(self, board, pos):
+        table = self.table
+        self.rows[0] = table.row_id(board)
+        self.columns[0] = table.column_id(board)
+        return table.distance[self.rows[0]] + table.distance[self.columns[0]]
+
+    def update(self, h, board, pos, tile, src, dst, depth):
+        n = self.grid_size
+        table = self.table
+        rows, columns = self.rows, self.columns
+        # The empty cell moved from dst to src: up or left is link group 0
+        step = 0 if src < dst else n
+        if src % n == dst % n:
+            row = table.links[rows[depth - 1] * 2 * n + step + (tile - 1) // n]
+            rows[depth], columns[depth] = row, columns[depth - 1]
+            return h + table.distance[row] - table.distance[rows[depth - 1]]
+        column = table.links[columns[depth - 1] * 2 * n + step + (tile - 1) % n]
+        rows[depth], columns[depth] = rows[depth - 1], column
+        return h + table.distance[column] - table.distance[columns[depth - 1]]
+
+
+def load_heuristic(grid_size):
+    """Return a new walking distance heuristic, or None for big boards."""
+    if grid_size > MAX_SIZE:
+        return None
+    return WalkingDistanceHeuristic(grid_size)
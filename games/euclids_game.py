@@ -4,7 +4,6 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, GLib, Gdk
-import random
 import sugar3.activity.activity
 from sugar3.graphics.toolbarbox import ToolbarBox
 from sugar3.activity.widgets import ActivityToolbarButton, StopButton
@@ -14,6 +13,8 @@ from sugar3.graphics.icon import Icon
 from sugar3.graphics.alert import Alert
 from sugar3.graphics.xocolor import XoColor
 
+from engine.euclid import EuclidsGame
+
 
 class EuclidsGameActivity(sugar3.activity.activity.Activity):
     """
@@ -65,11 +66,7 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
         self.set_toolbar_box(toolbar_box)
         
         # Game variables
-        self.numbers_on_board = []
-        self.player_moves = 0
-        self.bot_moves = 0
-        self.current_turn = "Player"  # "Player" or "Bot"
-        self.game_active = False
+        self.game = EuclidsGame()
         self.selected_numbers = []
         
         # Create the main container
@@ -112,11 +109,7 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
         toolbar_box.pack_start(help_button, False, False, 5)
         
         # Game variables
-        self.numbers_on_board = []
-        self.player_moves = 0
-        self.bot_moves = 0
-        self.current_turn = "Player"  # "Player" or "Bot"
-        self.game_active = False
+        self.game = EuclidsGame()
         self.selected_numbers = []
         
         # Create the main container
@@ -513,13 +506,9 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
     def __start_new_game(self):
         """Initialize a new game."""
         # Clear previous game state
-        self.numbers_on_board = []
-        self.player_moves = 0
-        self.bot_moves = 0
         self.selected_numbers = []
         self.first_selected_number = None
         self.second_selected_number = None
-        self.game_active = True
         
         # Update UI
         self.player_score_value.set_text("0")
@@ -534,37 +523,15 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
         for child in self.numbers_grid.get_children():
             self.numbers_grid.remove(child)
         
-        # Generate two random starting numbers
-        num1 = random.randint(10, 50)
-        num2 = random.randint(60, 100)
-        
-        # Make sure the numbers are different
-        while num1 == num2:
-            num2 = random.randint(60, 100)
-        
-        # Add the starting numbers to the board
-        self.__add_number_to_board(num1)
-        self.__add_number_to_board(num2)
+        # Start with two random numbers on the board
+        self.game.start()
+        self.__refresh_numbers_board()
         
         # Set player's turn
-        self.current_turn = "Player"
         self.__update_turn_label()
         
         self.status_label.set_text("Game started! Select two numbers to find their difference.")
     
-    def __add_number_to_board(self, number):
-        """Add a new number to the game board."""
-        if number in self.numbers_on_board:
-            return False
-        
-        self.numbers_on_board.append(number)
-        self.numbers_on_board.sort()  # Keep numbers sorted for easier viewing
-        
-        # Refresh the numbers board UI
-        self.__refresh_numbers_board()
-        
-        return True
-    
     def __refresh_numbers_board(self):
         """Refresh the numbers shown on the board."""
         # Clear existing numbers from the grid
@@ -577,7 +544,7 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
         
         # Add buttons in a grid layout (up to 6 per row)
         max_columns = 6
-        for i, number in enumerate(self.numbers_on_board):
+        for i, number in enumerate(self.game.numbers_on_board):
             row = i // max_columns
             col = i % max_columns
             
@@ -603,7 +570,7 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
     
     def __number_button_clicked(self, button, number):
         """Handle direct number button clicks."""
-        if not self.game_active or self.current_turn != "Player":
+        if not self.game.game_active or self.game.current_turn != "Player":
             return
         
         if self.first_selected_number is None:
@@ -643,30 +610,19 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
     
     def __create_number_cb(self, button):
         """Create a new number when the player clicks the Create Number button."""
-        if not self.game_active or not self.selected_numbers or len(self.selected_numbers) != 2:
-            return
-        
-        # Calculate the difference
-        bigger = max(self.selected_numbers)
-        smaller = min(self.selected_numbers)
-        difference = bigger - smaller
-        
-        # Check if the difference is already on the board
-        if difference in self.numbers_on_board:
-            self.status_label.set_text(f"The number {difference} is already on the board. Try again!")
+        if not self.game.game_active or not self.selected_numbers or len(self.selected_numbers) != 2:
             return
         
-        # Check if the difference is 0
-        if difference == 0:
-            self.status_label.set_text("The difference is 0, which is not a valid move. Try again!")
+        # Add the difference to the board (this also passes the turn)
+        try:
+            difference = self.game.play(*self.selected_numbers)
+        except ValueError as e:
+            self.status_label.set_text(f"{e} Try again!")
             return
-        
-        # Add the new number to the board
-        self.__add_number_to_board(difference)
+        self.__refresh_numbers_board()
         
         # Update player's score
-        self.player_moves += 1
-        self.player_score_value.set_text(str(self.player_moves))
+        self.player_score_value.set_text(str(self.game.player_moves))
         
         # Clear selections
         self.__clear_selection_cb(None)
@@ -680,7 +636,6 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
             return
         
         # Switch to bot's turn
-        self.current_turn = "Bot"
         self.__update_turn_label()
         
         # Give bot time to think
@@ -688,7 +643,7 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
     
     def __bot_turn(self):
         """Handle the bot's turn."""
-        if not self.game_active or self.current_turn != "Bot":
+        if not self.game.game_active or self.game.current_turn != "Bot":
             return False
         
         self.status_label.set_text("Bot is thinking...")
@@ -701,31 +656,10 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
         GLib.timeout_add(1000, self.__bot_make_move)
         return False  # Don't repeat this timeout
     
-    def __find_valid_bot_move(self):
-        """Find a valid move for the bot."""
-        # Get all possible pairs of numbers
-        possible_pairs = []
-        for i in range(len(self.numbers_on_board)):
-            for j in range(i + 1, len(self.numbers_on_board)):
-                num1 = self.numbers_on_board[i]
-                num2 = self.numbers_on_board[j]
-                difference = abs(num1 - num2)
-                
-                # Check if the difference is valid (not already on board and not 0)
-                if difference > 0 and difference not in self.numbers_on_board:
-                    possible_pairs.append((num1, num2, difference))
-        
-        # If there are valid moves, randomly select one
-        if possible_pairs:
-            return random.choice(possible_pairs)
-        
-        # No valid moves found
-        return None
-    
     def __bot_make_move(self):
         """Bot makes a move by selecting two numbers."""
         # Find a valid move
-        move = self.__find_valid_bot_move()
+        move = self.game.find_bot_move()
         
         if move:
             num1, num2, difference = move
@@ -736,11 +670,11 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
             self.result_label.set_text(str(difference))
             
             # Add the new number to the board
-            self.__add_number_to_board(difference)
+            self.game.play(num1, num2)
+            self.__refresh_numbers_board()
             
             # Update bot's score
-            self.bot_moves += 1
-            self.bot_score_value.set_text(str(self.bot_moves))
+            self.bot_score_value.set_text(str(self.game.bot_moves))
             
             # Set status message
             self.status_label.set_text(f"Bot created {difference} by finding the difference between {max(num1, num2)} and {min(num1, num2)}!")
@@ -751,7 +685,6 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
                 return False
             
             # Switch back to player's turn
-            self.current_turn = "Player"
             self.__update_turn_label()
             
             # Reset selection labels
@@ -771,43 +704,23 @@ class EuclidsGameActivity(sugar3.activity.activity.Activity):
     
     def __check_game_over(self):
         """Check if the game is over (no more valid moves possible)."""
-        # Check all possible combinations of numbers on the board
-        for i in range(len(self.numbers_on_board)):
-            for j in range(i + 1, len(self.numbers_on_board)):
-                num1 = self.numbers_on_board[i]
-                num2 = self.numbers_on_board[j]
-                difference = abs(num1 - num2)
-                
-                # If a valid move exists, game is not over
-                if difference > 0 and difference not in self.numbers_on_board:
-                    return False
-        
-        # No valid moves found, game is over
-        return True
+        return self.game.is_game_over()
     
     def __update_turn_label(self):
         """Update the turn label to show whose turn it is."""
-        if self.current_turn == "Player":
+        if self.game.current_turn == "Player":
             self.turn_label.set_markup('<span size="large" weight="bold" color="blue">Current Turn: Player</span>')
         else:
             self.turn_label.set_markup('<span size="large" weight="bold" color="red">Current Turn: Bot</span>')
     
     def __end_game(self):
         """End the game and show the results."""
-        self.game_active = False
+        message = self.game.end()
         
         # Clear the board selection
         self.__clear_selection_cb(None)  # Use our existing clear method instead
         self.create_button.set_sensitive(False)
         
-        # Determine the winner
-        if self.player_moves > self.bot_moves:
-            message = f"Game over! You win! Score: Player {self.player_moves} - Bot {self.bot_moves}"
-        elif self.bot_moves > self.player_moves:
-            message = f"Game over! Bot wins! Score: Player {self.player_moves} - Bot {self.bot_moves}"
-        else:
-            message = f"Game over! It's a tie! Score: Player {self.player_moves} - Bot {self.bot_moves}"
-        
         # Show game over message
         self.status_label.set_text(message)
         self.turn_label.set_markup('<span size="large" weight="bold" color="purple">Game Over!</span>')
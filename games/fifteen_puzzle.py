@@ -1,9 +1,38 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GLib, Pango
-import random
+import logging
+import subprocess
+import sys
 import time
 
+from game_paths import GAMES_DIR
+from engine import pattern_db
+from engine.fifteen import (
+    FifteenPuzzle, generate_math_operations, MIN_GRID_SIZE, MAX_GRID_SIZE,
+)
+from engine.solver import BackgroundSearch, HintCache
+from engine.fast_solver import solve_fast, FINISH_RESERVE
+from engine.scrambles import ScramblePool, difficulties, RANDOM
+from engine.journal import save_replay
+
+logger = logging.getLogger("mathgames.fifteen")
+
+# Optimal hints are searched on a background thread for at most this many
+# seconds; past that, and on big boards, a short solution found within
+# FAST_HINT_DEADLINE seconds is used instead
+HINT_TIME_LIMIT = 1.5
+OPTIMAL_HINT_MAX_SIZE = 4
+FAST_HINT_DEADLINE = 0.2
+
+# The pattern database build started by this process, shared by every
+# window. It only starts when the player asks for it, runs at the lowest
+# CPU priority, and is checked every BUILD_POLL_SECONDS to show progress
+# and to reap it when it ends.
+pattern_db_build = None
+BUILD_POLL_SECONDS = 1
+BUILD_NICENESS = 19
+
 class FifteenPuzzleApp(Gtk.Window):
     def __init__(self):
         Gtk.Window.__init__(self, title="Fifteen Puzzle")
@@ -13,16 +42,28 @@ class FifteenPuzzleApp(Gtk.Window):
         self.set_name("fifteen-puzzle-window")
         
         # Game state variables
-        self.grid_size = 4
-        self.move_count = 0
+        self.puzzle = FifteenPuzzle(grid_size=4)
+        self.grid_size = self.puzzle.grid_size
         self.start_time = time.time()
         self.elapsed_time = 0
         self.timer_running = False  # Add this line to track timer status
         self.math_mode = True
         self.math_operations = {}
-        self.last_moved_tile = None
         self.solved = False
-        self.tiles = []  # To store tile buttons
+        self.tiles = []  # One persistent button per cell, row-major
+        self.tile_labels = []  # Label currently shown by each button
+        
+        # Optimal hint searches; results for an old board are dropped
+        self.hint_search = BackgroundSearch(GLib.idle_add)
+        self.hint_cache = HintCache()
+        # Short but not always shortest solutions from the fast solver
+        self.fast_hint_cache = HintCache()
+        
+        # Graded positions are generated ahead of time per board size
+        self.difficulty = RANDOM
+        self.scramble_pools = {}
+        self.scramble = None  # Scramble the current game started from
+        self.connect("destroy", self.on_destroy)
         
         # Create the main layout
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=16)
@@ -47,6 +88,7 @@ class FifteenPuzzleApp(Gtk.Window):
         self.grid.set_column_spacing(8)
         self.grid.set_hexpand(True)
         self.grid.set_vexpand(True)
+        self.grid.get_style_context().add_class(f"board-{self.grid_size}")
         main_box.pack_start(self.grid, True, True, 0)
         
         # Feedback area
@@ -70,6 +112,8 @@ class FifteenPuzzleApp(Gtk.Window):
         # Start timer for elapsed time updates
         GLib.timeout_add(1000, self.update_timer)
         
+        self.update_tables_button()
+        
         # Show welcome message
         self.show_welcome()
     
@@ -159,7 +203,7 @@ class FifteenPuzzleApp(Gtk.Window):
         
         # Radio buttons for game mode
         self.mode_number = Gtk.RadioButton.new_with_label_from_widget(None, "Numbers")
-        self.mode_number.set_tooltip_text("Show numbers from 1 to 15")
+        self.mode_number.set_tooltip_text("Show the tile numbers")
         
         self.mode_math = Gtk.RadioButton.new_with_label_from_widget(self.mode_number, "Math")
         self.mode_math.set_tooltip_text("Show math equations instead of numbers")
@@ -174,6 +218,37 @@ class FifteenPuzzleApp(Gtk.Window):
         
         controls_box.pack_start(mode_box, False, False, 0)
         
+        # Board size selector
+        size_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        size_box.set_hexpand(True)
+        size_box.set_homogeneous(True)
+        size_label = Gtk.Label(label="Board Size:")
+        size_box.pack_start(size_label, False, False, 5)
+        
+        self.size_combo = Gtk.ComboBoxText()
+        for size in range(MIN_GRID_SIZE, MAX_GRID_SIZE + 1):
+            self.size_combo.append(str(size), f"{size} x {size}")
+        self.size_combo.set_active_id(str(self.grid_size))
+        self.size_combo.connect("changed", self.on_size_changed)
+        size_box.pack_start(self.size_combo, False, False, 5)
+        
+        controls_box.pack_start(size_box, False, False, 0)
+        
+        # Difficulty selector, filled in for the current board size
+        difficulty_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        difficulty_box.set_hexpand(True)
+        difficulty_box.set_homogeneous(True)
+        difficulty_label = Gtk.Label(label="Difficulty:")
+        difficulty_box.pack_start(difficulty_label, False, False, 5)
+        
+        self.difficulty_combo = Gtk.ComboBoxText()
+        self.difficulty_combo.set_tooltip_text("Puzzles are graded by the fewest moves that solve them")
+        self.fill_difficulty_combo()
+        self.difficulty_combo.connect("changed", self.on_difficulty_changed)
+        difficulty_box.pack_start(self.difficulty_combo, False, False, 5)
+        
+        controls_box.pack_start(difficulty_box, False, False, 0)
+        
         # Action buttons
         buttons_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
         buttons_box.set_hexpand(True)
@@ -188,8 +263,28 @@ class FifteenPuzzleApp(Gtk.Window):
         self.hint_button.connect("clicked", self.on_hint_clicked)
         buttons_box.pack_start(self.hint_button, True, True, 0)
         
+        self.undo_button = Gtk.Button(label="Undo")
+        self.undo_button.set_tooltip_text("Take back your last move")
+        self.undo_button.connect("clicked", lambda button: self.step_history(self.puzzle.undo))
+        buttons_box.pack_start(self.undo_button, True, True, 0)
+        
+        self.redo_button = Gtk.Button(label="Redo")
+        self.redo_button.set_tooltip_text("Make the move you took back again")
+        self.redo_button.connect("clicked", lambda button: self.step_history(self.puzzle.redo))
+        buttons_box.pack_start(self.redo_button, True, True, 0)
+        
         controls_box.pack_start(buttons_box, False, False, 0)
         
+        # Optimal 4x4 hints are much faster with the pattern database
+        # tables, which are only built when asked for
+        self.tables_button = Gtk.Button(label="Prepare Faster Hints")
+        self.tables_button.set_tooltip_text(
+            "Build about 3 MB of tables once, in the background, so 4x4 hints are found faster"
+        )
+        self.tables_button.connect("clicked", self.on_build_tables_clicked)
+        self.tables_button.set_no_show_all(True)
+        controls_box.pack_start(self.tables_button, False, False, 0)
+        
         return controls_box
     
     def apply_css(self):
@@ -277,7 +372,7 @@ class FifteenPuzzleApp(Gtk.Window):
             padding: 10px;
             border-radius: 10px;
         }
-        """
+        """ + self.board_size_css()
         css_provider.load_from_data(css.encode())
         Gtk.StyleContext.add_provider_for_screen(
             Gdk.Screen.get_default(),
@@ -285,11 +380,90 @@ class FifteenPuzzleApp(Gtk.Window):
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
     
+    def board_size_css(self):
+        """Shrink tiles and labels on bigger boards so they still fit"""
+        rules = []
+        for size in range(MIN_GRID_SIZE, MAX_GRID_SIZE + 1):
+            font = max(11, 26 * 4 // size)
+            tile = max(36, 80 * 4 // size)
+            margin = max(2, 6 * 4 // size)
+            rules.append(
+                f".board-{size} button {{ font-size: {font}px; min-height: {tile}px; "
+                f"min-width: {tile}px; margin: {margin}px; }}"
+            )
+        return "\n".join(rules)
+    
+    def fill_difficulty_combo(self):
+        """List the difficulties of the current board size"""
+        names = [RANDOM] + difficulties(self.grid_size)
+        if self.difficulty not in names:
+            self.difficulty = RANDOM
+        self.difficulty_combo.remove_all()
+        for name in names:
+            self.difficulty_combo.append(name, name)
+        self.difficulty_combo.set_active_id(self.difficulty)
+        # Big boards cannot be graded, so only Random is offered
+        self.difficulty_combo.set_sensitive(len(names) > 1)
+    
+    def scramble_pool(self):
+        """Return the scramble pool of the current board size"""
+        pool = self.scramble_pools.get(self.grid_size)
+        if pool is None:
+            pool = ScramblePool(self.grid_size)
+            self.scramble_pools[self.grid_size] = pool
+        pool.start()
+        return pool
+    
+    def difficulty_text(self):
+        if self.scramble is not None:
+            return (f"This {self.difficulty.lower()} puzzle can be solved "
+                    f"in {len(self.scramble)} moves. ")
+        if self.difficulty != RANDOM:
+            return (f"No {self.difficulty.lower()} puzzle is ready yet, "
+                    "so this one is random. ")
+        return ""
+    
+    def goal_text(self):
+        return f"Arrange the tiles in order from 1 to {self.puzzle.max_value}."
+    
+    def on_build_tables_clicked(self, button):
+        """Build the 4x4 hint tables in the background"""
+        # A separate process keeps the build from competing with the UI
+        # for the interpreter; hints use them as soon as they exist
+        global pattern_db_build
+        if pattern_db_build is None or pattern_db_build.poll() is not None:
+            pattern_db_build = subprocess.Popen(
+                [sys.executable, "-c",
+                 f"from engine.pattern_db import main; main(niceness={BUILD_NICENESS})"],
+                cwd=GAMES_DIR,
+            )
+        self.update_tables_button()
+        GLib.timeout_add_seconds(BUILD_POLL_SECONDS, self.update_tables_button)
+    
+    def update_tables_button(self):
+        """Show the table build button, with progress, while it is useful"""
+        total = len(pattern_db.PARTITIONS[4])
+        built = pattern_db.tables_built(4)
+        # poll() also reaps the build once it has finished
+        building = pattern_db_build is not None and pattern_db_build.poll() is None
+        
+        if built == total or self.grid_size != 4:
+            self.tables_button.hide()
+        else:
+            self.tables_button.show()
+        if building:
+            self.tables_button.set_label(f"Preparing Faster Hints... {built}/{total}")
+            self.tables_button.set_sensitive(False)
+        else:
+            self.tables_button.set_label("Prepare Faster Hints")
+            self.tables_button.set_sensitive(True)
+        return building  # Keep polling while the build runs
+    
     def show_welcome(self):
         """Show the welcome message in the feedback area"""
         welcome_msg = (
             "Welcome to Fifteen Puzzle!\n"
-            "Arrange the tiles in order from 1 to 15.\n"
+            f"{self.goal_text()}\n"
             "Click 'New Game' to begin."
         )
         self.feedback_label.set_text(welcome_msg)
@@ -338,11 +512,12 @@ class FifteenPuzzleApp(Gtk.Window):
             "Game Rules:\n"
             "1. Click on a tile to move it into the empty space\n"
             "2. A tile can only move if it's adjacent to the empty space\n"
-            "3. Arrange the tiles in order from 1 to 15\n"
+            f"3. Arrange the tiles in order from 1 to {self.puzzle.max_value}\n"
             "4. The empty space should end up in the bottom right corner\n\n"
             "Game Modes:\n"
-            "- Numbers: Shows the numbers 1-15 on the tiles\n"
+            f"- Numbers: Shows the numbers 1-{self.puzzle.max_value} on the tiles\n"
             "- Math: Shows math equations that equal the tile's number\n\n"
+            "Use 'Board Size' to play anything from the 3 x 3 to the 10 x 10 puzzle.\n"
             "Use the 'Get Hint' button if you're stuck!"
         )
         instr_label = Gtk.Label(label=instructions)
@@ -382,46 +557,57 @@ class FifteenPuzzleApp(Gtk.Window):
     
     def init_game(self):
         """Initialize the game board"""
-        # Clear any existing tiles
-        for child in self.grid.get_children():
-            self.grid.remove(child)
-        
-        self.tiles = []
-        
-        # Create the board (1-15 and 0 for empty)
-        self.board = list(range(1, self.grid_size * self.grid_size)) + [0]
-        self.empty_pos = (self.grid_size - 1, self.grid_size - 1)
+        self.hint_search.cancel()
         
         # Generate math operations
-        self.math_operations = self.generate_math_operations()
-        
-        # Shuffle board
-        self.shuffle_board()
+        self.math_operations = generate_math_operations(self.puzzle.max_value)
+        
+        # Start from a ready graded position, or shuffle at random. Only
+        # graded games of this size need positions prepared in the background
+        self.scramble = None
+        for size, pool in self.scramble_pools.items():
+            if size != self.grid_size or self.difficulty == RANDOM:
+                pool.stop()
+        if self.difficulty != RANDOM:
+            self.scramble = self.scramble_pool().take(self.difficulty)
+        if self.scramble is not None:
+            self.puzzle.load(self.scramble.board)
+            # Its solution is already known, so hints need no search
+            self.hint_cache.store(self.scramble.board, self.grid_size, self.scramble.solution)
+        else:
+            self.puzzle.new_game()
         
-        # Create tile buttons
-        self.create_tile_buttons()
+        # The buttons are created once and then only refreshed
+        if len(self.tiles) != self.grid_size * self.grid_size:
+            self.create_tile_buttons()
+        self.refresh_all_cells()
         
         # Reset game state
-        self.move_count = 0
         self.moves_label.set_text("0")
         self.start_time = time.time()
         self.elapsed_time = 0
         self.timer_running = False  # Reset timer state on new game
         self.update_timer()
         self.solved = False
+        self.update_history_buttons()
         
         self.grid.show_all()
     
     def create_tile_buttons(self):
-        """Create and arrange tile buttons based on the current board state"""
-        self.tiles = []
+        """Create one button per grid cell; refresh_cell() fills them in
+
+        The buttons stay attached for the life of a board size. A button
+        belongs to a cell, not to a tile, so a move only changes the label
+        and style classes of the two cells involved; new games and mode
+        changes refresh every cell, and only a size change rebuilds them.
+        """
+        for child in self.grid.get_children():
+            self.grid.remove(child)
         
-        # Create buttons for each position in the grid
+        self.tiles = []
+        self.tile_labels = []
         for y in range(self.grid_size):
             for x in range(self.grid_size):
-                idx = y * self.grid_size + x
-                value = self.board[idx]
-                
                 button = Gtk.Button()
                 button.set_hexpand(True)
                 button.set_vexpand(True)
@@ -429,174 +615,114 @@ class FifteenPuzzleApp(Gtk.Window):
                 # Store the grid position as button data
                 button.x_pos = x
                 button.y_pos = y
-                
-                if value == 0:
-                    # Empty tile
-                    button.set_sensitive(False)
-                    button.get_style_context().add_class("empty-tile")
-                else:
-                    # Normal tile
-                    button.connect("clicked", self.on_tile_clicked)
-                    button.get_style_context().add_class("tile-button")
-                    
-                    # Set button label based on mode
-                    self.update_button_label(button, value)
-                    
-                    # Check if tile is in correct position
-                    if value == idx + 1:
-                        button.get_style_context().add_class("correct-position")
+                button.connect("clicked", self.on_tile_clicked)
                 
                 self.grid.attach(button, x, y, 1, 1)
                 self.tiles.append(button)
+                self.tile_labels.append(None)
         
         # Show all the tiles
         self.grid.show_all()
     
-    def generate_math_operations(self):
-        """Generate simple math operations for numbers 1-15"""
-        operations = {}
-        for num in range(1, 16):
-            # Generate different types of operations
-            if num <= 5:
-                # Simple addition for smaller numbers
-                a = random.randint(0, num)
-                operations[num] = f"{a} + {num - a}"
-            elif num <= 10:
-                # Mix of addition and subtraction
-                op = random.choice(['+', '-'])
-                if op == '+':
-                    a = random.randint(1, num - 1)
-                    operations[num] = f"{a} + {num - a}"
-                else:
-                    a = random.randint(num + 1, num + 5)
-                    operations[num] = f"{a} - {a - num}"
-            else:
-                # Include multiplication for larger numbers
-                op = random.choice(['+', '-', '×'])
-                if op == '+':
-                    a = random.randint(5, num - 1)
-                    operations[num] = f"{a} + {num - a}"
-                elif op == '-':
-                    a = random.randint(num + 1, num + 10)
-                    operations[num] = f"{a} - {a - num}"
-                else:
-                    factors = [i for i in range(2, 6) if num % i == 0]
-                    if factors:
-                        factor = random.choice(factors)
-                        operations[num] = f"{factor} × {num // factor}"
-                    else:
-                        a = random.randint(5, num - 1)
-                        operations[num] = f"{a} + {num - a}"
-        return operations
-    
-    def update_button_label(self, button, value):
-        """Update a button's label based on current mode"""
+    def tile_label(self, value):
+        """Return the text shown on the tile with `value` in the current mode"""
         if value == 0:
-            button.set_label("")
-            return
-            
+            return ""
         if self.math_mode and value in self.math_operations:
-            button.set_label(self.math_operations[value])
-            # Add small number indicator in corner (could be improved with custom drawing)
-            button.set_tooltip_text(f"Value: {value}")
+            return self.math_operations[value]
+        return str(value)
+    
+    def refresh_cell(self, x, y):
+        """Bring the button at (x, y) in line with the board"""
+        idx = y * self.grid_size + x
+        button = self.tiles[idx]
+        value = self.puzzle.tile_at(x, y)
+        context = button.get_style_context()
+        
+        label = self.tile_label(value)
+        if label != self.tile_labels[idx]:
+            self.tile_labels[idx] = label
+            button.set_label(label)
+            # Math labels carry the tile's value in a tooltip
+            button.set_tooltip_text(f"Value: {value}" if label and label != str(value) else None)
+        
+        if value == 0:
+            # Empty tile
+            button.set_sensitive(False)
+            context.remove_class("tile-button")
+            context.remove_class("correct-position")
+            context.add_class("empty-tile")
         else:
-            button.set_label(str(value))
-    
-    def shuffle_board(self):
-        """Shuffle the board while ensuring it's solvable"""
-        # Perform random valid moves to shuffle
-        for _ in range(1000):
-            possible_moves = self.get_possible_moves()
-            move = random.choice(possible_moves)
-            self.move_tile(move[0], move[1], update_ui=False)
-        
-        # Make sure the puzzle is solvable
-        if not self.is_solvable():
-            # Swap the first two tiles to make it solvable
-            if self.board[0] != 0 and self.board[1] != 0:
-                self.board[0], self.board[1] = self.board[1], self.board[0]
+            button.set_sensitive(True)
+            context.remove_class("empty-tile")
+            context.add_class("tile-button")
+            if self.puzzle.is_in_place(x, y):
+                context.add_class("correct-position")
             else:
-                self.board[2], self.board[3] = self.board[3], self.board[2]
-    
-    def is_solvable(self):
-        """Check if the puzzle is solvable"""
-        # Count inversions
-        inversions = 0
-        board_without_zero = [x for x in self.board if x != 0]
-        
-        for i in range(len(board_without_zero)):
-            for j in range(i + 1, len(board_without_zero)):
-                if board_without_zero[i] > board_without_zero[j]:
-                    inversions += 1
-        
-        # For a 4x4 puzzle, if the empty tile is on an even row from the bottom (second or fourth row),
-        # then the puzzle is solvable if the number of inversions is odd.
-        # If the empty tile is on an odd row from the bottom (first or third row),
-        # then the puzzle is solvable if the number of inversions is even.
-        empty_row = self.empty_pos[0]
-        if (self.grid_size - empty_row) % 2 == 0:
-            return inversions % 2 == 1
-        else:
-            return inversions % 2 == 0
+                context.remove_class("correct-position")
     
-    def get_possible_moves(self):
-        """Get coordinates of tiles that can be moved"""
-        moves = []
-        empty_x, empty_y = self.empty_pos
-        
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            x, y = empty_x + dx, empty_y + dy
-            if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
-                moves.append((x, y))
-        
-        return moves
+    def refresh_all_cells(self):
+        """Refresh every button; unchanged labels are left alone"""
+        for y in range(self.grid_size):
+            for x in range(self.grid_size):
+                self.refresh_cell(x, y)
     
-    def move_tile(self, x, y, update_ui=True):
+    def move_tile(self, x, y):
         """Move a tile to the empty position if it's adjacent"""
-        empty_x, empty_y = self.empty_pos
-        
-        # Check if tile is adjacent to empty space
-        if (x == empty_x and abs(y - empty_y) == 1) or (y == empty_y and abs(x - empty_x) == 1):
-            # Get the index of the clicked tile and empty tile
-            empty_idx = empty_y * self.grid_size + empty_x
-            tile_idx = y * self.grid_size + x
-            
-            # Remember which tile was moved
-            self.last_moved_tile = self.board[tile_idx]
-            
-            # Swap the tiles
-            self.board[empty_idx], self.board[tile_idx] = self.board[tile_idx], self.board[empty_idx]
-            self.empty_pos = (x, y)
-            
-            # Update UI if needed
-            if update_ui:
-                self.move_count += 1
-                self.moves_label.set_text(str(self.move_count))
-                self.update_grid_ui()
-                self.check_solution()
-            
-            return True
-        return False
+        empty_x, empty_y = self.puzzle.empty_pos
+        if not self.puzzle.move_tile(x, y):
+            return False
+        self.after_move(empty_x, empty_y)
+        return True
     
-    def update_grid_ui(self):
-        """Update the grid UI after a move"""
-        # Remove all buttons from the grid
-        for child in self.grid.get_children():
-            self.grid.remove(child)
-        
-        # Create new buttons based on current board state
-        self.create_tile_buttons()
+    def step_history(self, step):
+        """Undo or redo one move with puzzle.undo or puzzle.redo"""
+        empty_x, empty_y = self.puzzle.empty_pos
+        if step() is not None:
+            self.after_move(empty_x, empty_y)
+    
+    def after_move(self, empty_x, empty_y):
+        """Update the view after the empty cell left (empty_x, empty_y)"""
+        # A hint being worked out is for the old board
+        if self.hint_search.is_running():
+            self.hint_search.cancel()
+            self.feedback_label.set_text("")
+        
+        # Only the moved tile's old and new cells have changed
+        self.refresh_cell(*self.puzzle.empty_pos)
+        self.refresh_cell(empty_x, empty_y)
+        
+        self.moves_label.set_text(str(self.puzzle.move_count))
+        self.check_solution()
+        self.update_history_buttons()
+    
+    def update_history_buttons(self):
+        journal = self.puzzle.journal
+        self.undo_button.set_sensitive(journal.can_undo() and not self.solved)
+        self.redo_button.set_sensitive(journal.can_redo() and not self.solved)
     
     def check_solution(self):
         """Check if the puzzle is solved"""
-        solution = list(range(1, self.grid_size * self.grid_size)) + [0]
-        if self.board == solution:
+        if self.puzzle.is_solved():
+            if not self.solved:
+                self.save_replay()
             self.solved = True
             self.feedback_label.set_markup(
                 f"<span class='success-text'>🎉 CONGRATULATIONS! YOU SOLVED THE PUZZLE! 🎉</span>"
             )
             self.show_success_dialog()
         
+    def save_replay(self):
+        """Save the finished game so it can be replayed and checked later"""
+        elapsed = self.elapsed_time
+        if self.timer_running:
+            elapsed = time.time() - self.start_time
+        try:
+            save_replay(self.puzzle.replay(elapsed))
+        except OSError:
+            # Not worth interrupting the player's win over
+            logger.warning("Could not save the replay", exc_info=True)
+    
     def show_success_dialog(self):
         """Show a success dialog"""
         dialog = Gtk.Dialog(
@@ -624,7 +750,7 @@ class FifteenPuzzleApp(Gtk.Window):
         secs = int(self.elapsed_time % 60)
         stats_label = Gtk.Label()
         stats_label.set_markup(
-            f"<span size='large'>You solved it in <b>{self.move_count}</b> moves!</span>\n"
+            f"<span size='large'>You solved it in <b>{self.puzzle.move_count}</b> moves!</span>\n"
             f"<span size='large'>Time: <b>{mins}:{secs:02d}</b></span>"
         )
         content_box.pack_start(stats_label, False, False, 5)
@@ -646,12 +772,8 @@ class FifteenPuzzleApp(Gtk.Window):
         x = button.x_pos
         y = button.y_pos
         
-        # Get the empty tile position
-        empty_x, empty_y = self.empty_pos
-        
         # Check if this tile can move
-        if ((x == empty_x and abs(y - empty_y) == 1) or 
-            (y == empty_y and abs(x - empty_x) == 1)):
+        if self.puzzle.can_move(x, y):
             
             # Start the timer on the first move if it's not already running
             if not self.timer_running:
@@ -671,49 +793,140 @@ class FifteenPuzzleApp(Gtk.Window):
                 self.mode_label.set_text("Numbers")
             
             # Update all button labels
-            self.update_grid_ui()
+            self.refresh_all_cells()
+    
+    def on_size_changed(self, combo):
+        """Start a new game on a board of the selected size"""
+        size = int(combo.get_active_id())
+        if size == self.grid_size:
+            return
+        
+        context = self.grid.get_style_context()
+        context.remove_class(f"board-{self.grid_size}")
+        self.puzzle.set_grid_size(size)
+        self.grid_size = size
+        self.hint_cache.clear()
+        self.fast_hint_cache.clear()
+        context.add_class(f"board-{self.grid_size}")
+        
+        # fill_difficulty_combo() may reset the difficulty; don't start a
+        # second game from the "changed" signal while it does
+        self.difficulty_combo.handler_block_by_func(self.on_difficulty_changed)
+        self.fill_difficulty_combo()
+        self.difficulty_combo.handler_unblock_by_func(self.on_difficulty_changed)
+        
+        self.init_game()
+        self.update_tables_button()
+        self.feedback_label.set_text(
+            f"New {size} x {size} game started. {self.difficulty_text()}{self.goal_text()}"
+        )
+    
+    def on_difficulty_changed(self, combo):
+        """Start a new game at the selected difficulty"""
+        difficulty = combo.get_active_id()
+        if difficulty is None or difficulty == self.difficulty:
+            return
+        self.difficulty = difficulty
+        self.init_game()
+        self.feedback_label.set_text(f"New game started. {self.difficulty_text()}{self.goal_text()}")
     
     def on_new_game(self, button):
         """Start a new game"""
         self.init_game()
-        self.feedback_label.set_text("New game started. Arrange the tiles in order from 1 to 15.")
+        self.feedback_label.set_text(f"New game started. {self.difficulty_text()}{self.goal_text()}")
+    
+    def on_destroy(self, window):
+        self.hint_search.cancel()
+        for pool in self.scramble_pools.values():
+            pool.stop()
     
     def on_hint_clicked(self, button):
         """Provide a hint for the puzzle"""
-        hint = self.generate_hint()
+        if self.puzzle.is_solved():
+            self.show_hint(self.generate_hint())
+            return
+        
+        # Positions on an earlier solution are answered straight away
+        cached = self.hint_cache.get(self.puzzle.hash)
+        if cached is not None:
+            self.show_hint(self.generate_hint(*cached))
+            return
+        cached = self.fast_hint_cache.get(self.puzzle.hash)
+        if cached is not None:
+            self.show_hint(self.generate_hint(*cached, optimal=False))
+            return
+        if self.hint_search.is_running():
+            return
+        if self.grid_size > OPTIMAL_HINT_MAX_SIZE:
+            self.show_fast_hint(list(self.puzzle.board))
+            return
+        
+        # Search for the first move of a shortest solution off the UI thread
+        self.feedback_label.set_markup("<span class='hint-text'>Thinking about a hint...</span>")
+        board = list(self.puzzle.board)
+        self.hint_search.start(board, self.grid_size,
+                               lambda solution: self.on_hint_found(board, solution),
+                               self.on_hint_progress, time_limit=HINT_TIME_LIMIT)
+    
+    def on_hint_progress(self, nodes, bound):
+        self.feedback_label.set_markup(
+            f"<span class='hint-text'>Thinking about a hint... "
+            f"checked {nodes:,} positions, at least {bound} moves to go</span>"
+        )
+    
+    def on_hint_found(self, board, solution):
+        if solution is None:
+            # The optimal search already had its time, so leave the fast
+            # solver only enough to finish without searching
+            self.show_fast_hint(board, deadline=FINISH_RESERVE)
+            return
+        self.show_solution_hint(board, solution.moves)
+    
+    def show_fast_hint(self, board, deadline=FAST_HINT_DEADLINE):
+        """Hint from a short but not always shortest solution"""
+        # solve_fast takes up to `deadline` seconds, so it runs off the UI
+        # thread like the optimal search
+        board, grid_size = list(board), self.grid_size
+        self.hint_search.run(lambda should_stop, progress: solve_fast(board, grid_size, deadline),
+                             lambda solution: self.on_fast_hint_found(board, solution))
+    
+    def on_fast_hint_found(self, board, solution):
+        if solution.complete:
+            self.show_solution_hint(board, solution.moves, optimal=False)
+        elif solution.moves:
+            # Out of time, but the moves so far still lead to a solution
+            self.show_hint(self.generate_hint(solution.moves[0]))
+        else:
+            self.show_hint(self.generate_hint())
+    
+    def show_solution_hint(self, board, moves, optimal=True):
+        """Remember a solution of `board` and hint its first move"""
+        cache = self.hint_cache if optimal else self.fast_hint_cache
+        cache.store(board, self.grid_size, moves)
+        self.show_hint(self.generate_hint(moves[0] if moves else None, len(moves), optimal))
+    
+    def show_hint(self, hint):
         self.feedback_label.set_markup(f"<span class='hint-text'>Hint: {hint}</span>")
     
-    def generate_hint(self):
+    def tile_name(self, value):
+        if self.math_mode:
+            return self.math_operations[value]
+        return f"tile {value}"
+    
+    def generate_hint(self, next_tile=None, remaining=None, optimal=True):
         """Generate a hint for solving the puzzle"""
-        # Find a tile that can be moved toward its correct position
-        for y in range(self.grid_size):
-            for x in range(self.grid_size):
-                idx = y * self.grid_size + x
-                value = self.board[idx]
-                
-                if value == 0:
-                    continue
-                
-                # Calculate where this tile should be
-                target_idx = value - 1
-                target_x = target_idx % self.grid_size
-                target_y = target_idx // self.grid_size
-                
-                # Is this tile adjacent to the empty space?
-                empty_x, empty_y = self.empty_pos
-                if ((x == empty_x and abs(y - empty_y) == 1) or 
-                    (y == empty_y and abs(x - empty_x) == 1)):
-                    
-                    # Calculate if moving would get it closer to target
-                    current_dist = abs(x - target_x) + abs(y - target_y)
-                    new_x, new_y = empty_x, empty_y
-                    new_dist = abs(new_x - target_x) + abs(new_y - target_y)
-                    
-                    if new_dist < current_dist:
-                        if self.math_mode:
-                            return f"Try moving {self.math_operations[value]} toward its correct position"
-                        else:
-                            return f"Try moving tile {value} toward its correct position"
+        # First move of a known solution, the shortest if the optimal search finished
+        if next_tile is not None:
+            hint = f"Move {self.tile_name(next_tile)} into the empty space."
+            if remaining is not None and optimal:
+                hint += f" The puzzle can be solved in {remaining} moves."
+            elif remaining is not None:
+                hint += f" The puzzle can be solved in at most {remaining} moves."
+            return hint
+        
+        value = self.puzzle.hint_tile()
+        if value is not None:
+            return f"Try moving {self.tile_name(value)} toward its correct position"
         
         # If no good move found, give general hint
         return "Focus on getting the top row and left column in place first"
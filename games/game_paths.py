@@ -0,0 +1,28 @@
+"""
+Path resolver for game scripts and their assets.
+
+Games must not depend on the process working directory: the launcher runs
+several of them in one process and may import them from worker threads.
+Resolve every file through these helpers instead.
+"""
+
+import os
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+ACTIVITY_DIR = os.path.dirname(GAMES_DIR)
+ASSETS_DIR = os.path.join(ACTIVITY_DIR, "assets")
+
+
+def game_path(*parts):
+    """Return an absolute path inside the games directory."""
+    return os.path.join(GAMES_DIR, *parts)
+
+
+def asset_path(*parts):
+    """Return an absolute path inside the shared assets directory."""
+    return os.path.join(ASSETS_DIR, *parts)
+
+
+def activity_path(*parts):
+    """Return an absolute path relative to the activity bundle root."""
+    return os.path.join(ACTIVITY_DIR, *parts)
@@ -6,251 +6,10 @@
 import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GObject, Pango
-import random
 import os
 import datetime
 
-class QuestionGenerator:
-    def __init__(self):
-        """Initialize the question generator with various question types"""
-        self.question_types = [
-            self._generate_number_pattern,
-            self._generate_fill_in_blank,
-            self._generate_missing_operator,
-            self._generate_reverse_logic,
-            self._generate_word_puzzle,
-            self._generate_true_false,
-            self._generate_time_riddle
-        ]
-    
-    def get_random_question(self):
-        """Returns a random question, its answer, and its type"""
-        question_func = random.choice(self.question_types)
-        return question_func()
-    
-    def _generate_number_pattern(self):
-        """Generate a number pattern question"""
-        pattern_type = random.choice(["arithmetic", "geometric", "fibonacci"])
-        
-        if pattern_type == "arithmetic":
-            # Arithmetic sequence (add constant)
-            start = random.randint(1, 10)
-            step = random.randint(1, 5)
-            sequence = [start + i * step for i in range(4)]
-            answer = start + 4 * step
-            
-        elif pattern_type == "geometric":
-            # Geometric sequence (multiply by constant)
-            start = random.randint(1, 5)
-            ratio = random.randint(2, 3)
-            sequence = [start * (ratio ** i) for i in range(4)]
-            answer = start * (ratio ** 4)
-            
-        else:  # fibonacci-like
-            # Simple fibonacci-like sequence (each number is sum of two before)
-            a, b = random.randint(1, 5), random.randint(1, 5)
-            sequence = [a, b]
-            for _ in range(2):
-                sequence.append(sequence[-1] + sequence[-2])
-            answer = sequence[-1] + sequence[-2]
-        
-        question = f"What comes next? {', '.join(map(str, sequence))}, ___"
-        return question, str(answer), "number_pattern"
-    
-    def _generate_fill_in_blank(self):
-        """Generate a fill-in-the-blank arithmetic question"""
-        operation = random.choice(["addition", "subtraction", "multiplication"])
-        
-        if operation == "addition":
-            a = random.randint(5, 20)
-            c = random.randint(10, 30)
-            b = c - a
-            question = f"{a} + ___ = {c}"
-            
-        elif operation == "subtraction":
-            b = random.randint(5, 20)
-            c = random.randint(b + 5, b + 25)
-            a = c + b
-            question = f"{a} - ___ = {c}"
-            
-        else:  # multiplication
-            a = random.randint(2, 9)
-            c = random.randint(a + 1, 20)
-            b = c // a
-            if b * a == c:  # Ensure exact division
-                question = f"{a} × ___ = {c}"
-            else:
-                a = random.randint(2, 9)
-                b = random.randint(2, 9)
-                c = a * b
-                question = f"{a} × ___ = {c}"
-        
-        return question, str(b), "fill_in_blank"
-    
-    def _generate_missing_operator(self):
-        """Generate a missing operator question"""
-        a = random.randint(1, 10)
-        b = random.randint(1, 10)
-        
-        # Generate answer for all possible operators
-        results = {
-            '+': a + b,
-            '-': a - b,
-            '×': a * b,
-            '÷': a / b if b != 0 else None
-        }
-        
-        # Choose operator with clean results (avoid division with remainder)
-        valid_ops = [op for op, result in results.items() 
-                    if result is not None and (op != '÷' or a % b == 0)]
-        
-        chosen_op = random.choice(valid_ops)
-        result = results[chosen_op]
-        
-        question = f"What operator works? {a} ___ {b} = {int(result)}"
-        return question, chosen_op, "missing_operator"
-    
-    def _generate_reverse_logic(self):
-        """Generate a reverse logic question"""
-        operations = [
-            {"desc": "doubled a number", "op": lambda x: x * 2, "inv": lambda y: y // 2, "range": (2, 10)},
-            {"desc": "tripled a number", "op": lambda x: x * 3, "inv": lambda y: y // 3, "range": (2, 7)},
-            {"desc": "added 5 to a number", "op": lambda x: x + 5, "inv": lambda y: y - 5, "range": (1, 15)},
-            {"desc": "subtracted 3 from a number", "op": lambda x: x - 3, "inv": lambda y: y + 3, "range": (4, 20)},
-            {"desc": "squared a number", "op": lambda x: x ** 2, "inv": lambda y: int(y ** 0.5), "range": (2, 10)}
-        ]
-        
-        op_info = random.choice(operations)
-        original = random.randint(*op_info["range"])
-        
-        # Ensure clean results for operations like square root
-        while "squared" in op_info["desc"] and int(original ** 0.5) ** 2 != original:
-            original = random.randint(*op_info["range"])
-        
-        result = op_info["op"](original)
-        
-        question = f"I {op_info['desc']} and got {result}. What was the original number?"
-        answer = original
-        
-        return question, str(answer), "reverse_logic"
-    
-    def _generate_word_puzzle(self):
-        """Generate a simple word problem"""
-        templates = [
-            {
-                "template": "{name} has {start} apples. {pronoun} buys {buys} more and eats {eats}. How many apples does {pronoun} have now?",
-                "calc": lambda start, buys, eats: start + buys - eats,
-                "ranges": {"start": (2, 8), "buys": (1, 5), "eats": (1, 3)}
-            },
-            {
-                "template": "{name} has {start} pencils. {pronoun} gives {gives} to friends and finds {finds} more. How many pencils does {pronoun} have now?",
-                "calc": lambda start, gives, finds: start - gives + finds,
-                "ranges": {"start": (5, 10), "gives": (1, 4), "finds": (1, 4)}
-            },
-            {
-                "template": "There are {start} children on a bus. {board} more get on and {exit} get off. How many children are on the bus now?",
-                "calc": lambda start, board, exit: start + board - exit,
-                "ranges": {"start": (5, 15), "board": (2, 8), "exit": (1, 7)}
-            }
-        ]
-        
-        names = [("Amy", "she"), ("Tom", "he"), ("Sam", "they"), ("Pat", "they"), ("Alex", "they")]
-        template_data = random.choice(templates)
-        
-        # Generate random values for the puzzle
-        values = {}
-        for key, (min_val, max_val) in template_data["ranges"].items():
-            values[key] = random.randint(min_val, max_val)
-        
-        # Select a random name if needed
-        if "{name}" in template_data["template"]:
-            name, pronoun = random.choice(names)
-            values["name"] = name
-            values["pronoun"] = pronoun
-            
-        # Calculate the answer
-        answer = template_data["calc"](**{k: v for k, v in values.items() if k in ["start", "buys", "eats", "gives", "finds", "board", "exit"]})
-        
-        # Generate the question
-        question = template_data["template"].format(**values)
-        
-        return question, str(answer), "word_puzzle"
-    
-    def _generate_true_false(self):
-        """Generate a true/false math statement"""
-        operation = random.choice(["addition", "subtraction", "multiplication"])
-        is_true = random.choice([True, False])
-        
-        if operation == "addition":
-            a = random.randint(1, 20)
-            b = random.randint(1, 20)
-            true_result = a + b
-            
-        elif operation == "subtraction":
-            a = random.randint(5, 25)
-            b = random.randint(1, a)
-            true_result = a - b
-            
-        else:  # multiplication
-            a = random.randint(2, 10)
-            b = random.randint(2, 10)
-            true_result = a * b
-        
-        if is_true:
-            result = true_result
-            answer = "True"
-        else:
-            # Make the false result close to true result for challenge
-            offset = random.choice([-2, -1, 1, 2])
-            result = true_result + offset
-            answer = "False"
-        
-        if operation == "addition":
-            question = f"True or False: {a} + {b} = {result}"
-        elif operation == "subtraction":
-            question = f"True or False: {a} - {b} = {result}"
-        else:  # multiplication
-            question = f"True or False: {a} × {b} = {result}"
-        
-        return question, answer, "true_false"
-    
-    def _generate_time_riddle(self):
-        """Generate a time-based riddle"""
-        # Generate a random current time
-        current_hour = random.randint(1, 12)
-        am_pm = random.choice(["AM", "PM"])
-        
-        # Generate time change
-        hours_change = random.randint(1, 5)
-        operation = random.choice(["add", "subtract"])
-        
-        if operation == "add":
-            new_hour = (current_hour + hours_change) % 12
-            if new_hour == 0:
-                new_hour = 12
-            
-            # Handle AM/PM change
-            new_am_pm = am_pm
-            if current_hour + hours_change > 12:
-                new_am_pm = "PM" if am_pm == "AM" else "AM"
-                
-            question = f"If it's {current_hour} {am_pm} now, what time will it be in {hours_change} hours?"
-            answer = f"{new_hour} {new_am_pm}"
-        else:
-            new_hour = (current_hour - hours_change) % 12
-            if new_hour <= 0:
-                new_hour += 12
-            
-            # Handle AM/PM change
-            new_am_pm = am_pm
-            if current_hour - hours_change <= 0:
-                new_am_pm = "PM" if am_pm == "AM" else "AM"
-                
-            question = f"If it's {current_hour} {am_pm} now, what time was it {hours_change} hours ago?"
-            answer = f"{new_hour} {new_am_pm}"
-        
-        return question, answer, "time_riddle"
-
+from engine.minesweeper import MinesweeperGame
 
 class MathMinesweeperGame(Gtk.Window):
     def __init__(self):
@@ -262,9 +21,7 @@ class MathMinesweeperGame(Gtk.Window):
         self._initialize_css()
         
         # Game state
-        self.score = 0
-        self.lives = 3
-        self.question_generator = QuestionGenerator()
+        self.game = MinesweeperGame(rows=5, cols=5, lives=3)
         
         # Main layout container
         main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
@@ -400,9 +157,9 @@ class MathMinesweeperGame(Gtk.Window):
         
         # Create 5x5 grid of buttons
         self.buttons = []
-        for row in range(5):
+        for row in range(self.game.rows):
             button_row = []
-            for col in range(5):
+            for col in range(self.game.cols):
                 button = Gtk.Button()
                 
                 # Add CSS class for styling
@@ -420,10 +177,10 @@ class MathMinesweeperGame(Gtk.Window):
     
     def _on_tile_clicked(self, button, row, col):
         """Handle click on a game tile"""
-        # Only process click if button is still sensitive (not yet revealed)
-        if button.get_sensitive():
+        # Only process click if the tile is not yet revealed
+        if self.game.is_hidden(row, col):
             # Generate a random question
-            question, correct_answer, question_type = self.question_generator.get_random_question()
+            question, correct_answer, question_type = self.game.next_question()
             
             # Create and show dialog
             dialog = self._create_question_dialog(question, question_type)
@@ -545,12 +302,7 @@ class MathMinesweeperGame(Gtk.Window):
     
     def _process_answer(self, button, row, col, user_answer, correct_answer):
         """Process the answer and update game state"""
-        # Convert answers to strings for comparison
-        user_answer_str = str(user_answer).strip().lower()
-        correct_answer_str = str(correct_answer).strip().lower()
-        
-        # Check if the answer is correct
-        if user_answer_str == correct_answer_str:
+        if self.game.answer(row, col, user_answer, correct_answer):
             # Correct answer - handle it
             self._handle_correct_answer(button, row, col)
         else:
@@ -566,21 +318,16 @@ class MathMinesweeperGame(Gtk.Window):
         context.add_class("correct-tile")
         
         # Update score
-        self.score += 10
-        self.score_value.set_text(str(self.score))
+        self.score_value.set_text(str(self.game.score))
         
         # Check if all tiles are cleared (game won)
-        tiles_remaining = sum(1 for row in self.buttons for button in row if button.get_sensitive())
-        if tiles_remaining == 0:
-            self._show_game_over_dialog("You Win!", f"You've cleared all tiles!\nFinal Score: {self.score}")
+        if self.game.is_won():
+            self._show_game_over_dialog("You Win!", f"You've cleared all tiles!\nFinal Score: {self.game.score}")
     
     def _handle_wrong_answer(self, button, row, col):
         """Handle wrong answer - mark as mine and update lives"""
-        # Decrease lives
-        self.lives -= 1
-        
         # Update lives display
-        hearts = "❤️ " * self.lives
+        hearts = "❤️ " * self.game.lives
         self.lives_value.set_text(hearts)
         
         # Mark the tile as a mine
@@ -590,8 +337,8 @@ class MathMinesweeperGame(Gtk.Window):
         context.add_class("wrong-tile")
         
         # Check if game over
-        if self.lives <= 0:
-            self._show_game_over_dialog("Game Over!", f"You've run out of lives!\nFinal Score: {self.score}")
+        if self.game.is_lost():
+            self._show_game_over_dialog("Game Over!", f"You've run out of lives!\nFinal Score: {self.game.score}")
     
     def _show_game_over_dialog(self, title, message):
         """Show game over dialog with results"""
@@ -614,8 +361,7 @@ class MathMinesweeperGame(Gtk.Window):
     def _on_restart_clicked(self, button):
         """Handle restart button click"""
         # Reset score and lives
-        self.score = 0
-        self.lives = 3
+        self.game.restart()
         self.score_value.set_text("0")
         self.lives_value.set_text("❤️ ❤️ ❤️")
         
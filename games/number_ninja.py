@@ -5,6 +5,7 @@ import gi
 gi.require_version('Gtk', '3.0')
 from gi.repository import Gtk, Gdk, GLib, GdkPixbuf
 import cairo
+import os
 import random
 import math
 from gettext import gettext as _
@@ -15,120 +16,10 @@ from sugar3.graphics.toolbarbox import ToolbarBox
 from sugar3.graphics.toolbutton import ToolButton
 from sugar3.graphics.style import GRID_CELL_SIZE
 
-# Define a number class to handle the floating numbers
-class Number:
-    def __init__(self, value, x, y, speed):
-        self.value = value
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.size = 30  # Default, will be overridden on game start
-        
-        # Simple pastel color palette based on number value
-        hue = (value * 25) % 360 / 360  # Use value to create different hues
-        self.color = self._hsv_to_rgb(hue, 0.65, 0.95)
-        
-        self.alive = True
-        self.pulse = 0  # For animation
-        self.pulse_direction = 1
-        # Minimal rotation for subtle movement
-        self.rotation = random.uniform(-0.05, 0.05)
-    
-    def _hsv_to_rgb(self, h, s, v):
-        if s == 0:
-            return v, v, v
-        
-        i = int(h * 6)
-        f = h * 6 - i
-        p = v * (1 - s)
-        q = v * (1 - f * s)
-        t = v * (1 - (1 - f) * s)
-        
-        if i % 6 == 0:
-            return v, t, p
-        elif i % 6 == 1:
-            return q, v, p
-        elif i % 6 == 2:
-            return p, v, t
-        elif i % 6 == 3:
-            return p, q, v
-        elif i % 6 == 4:
-            return t, p, v
-        else:
-            return v, p, q
-        
-    def move(self):
-        self.x += self.speed
-        # Subtle pulsing animation
-        self.pulse += 0.08 * self.pulse_direction
-        if self.pulse > 1:
-            self.pulse = 1
-            self.pulse_direction = -1
-        elif self.pulse < 0:
-            self.pulse = 0
-            self.pulse_direction = 1
-        
-    def is_clicked(self, click_x, click_y):
-        # Check if the click is inside the number
-        distance = math.sqrt((self.x - click_x)**2 + (self.y - click_y)**2)
-        return distance < self.size / 2
-        
-    def draw(self, context):
-        # Calculate size with subtle pulse effect
-        pulse_size = self.size * (1 + self.pulse * 0.1)
-        
-        # Save context for rotation
-        context.save()
-        context.translate(self.x, self.y)
-        context.rotate(self.rotation)
-        
-        # Draw the number bubble - with enhanced visual style
-        r, g, b = self.color
-        
-        # Add a slight shadow for depth
-        context.set_source_rgba(0, 0, 0, 0.15)
-        context.arc(2, 3, pulse_size/2, 0, 2 * math.pi)
-        context.fill()
-        
-        # Main circle - more vibrant gradient
-        gradient = cairo.RadialGradient(
-            -pulse_size/6, -pulse_size/6, 0,  # Inner point (offset for highlight)
-            0, 0, pulse_size/2                # Outer point
-        )
-        gradient.add_color_stop_rgba(0, min(r+0.2, 1), min(g+0.2, 1), min(b+0.2, 1), 1)  # Lighter center
-        gradient.add_color_stop_rgba(1, r, g, b, 1)                                      # Original color edge
-        
-        context.set_source(gradient)
-        context.arc(0, 0, pulse_size/2, 0, 2 * math.pi)
-        context.fill()
-        
-        # More subtle highlight
-        context.set_line_width(2)
-        context.set_source_rgba(1, 1, 1, 0.8)
-        context.arc(0, 0, pulse_size/2 - 1, 0, math.pi)  # Half circle highlight
-        context.stroke()
-        
-        # Draw the number text
-        context.select_font_face("Sans", cairo.FONT_SLANT_NORMAL, cairo.FONT_WEIGHT_BOLD)
-        context.set_font_size(pulse_size * 0.6)
-        
-        # Center the text
-        text = str(self.value)
-        x_bearing, y_bearing, width, height, x_advance, y_advance = context.text_extents(text)
-        
-        # Improved text with subtle shadow for better readability
-        # Text shadow
-        context.set_source_rgba(0, 0, 0, 0.25)
-        context.move_to(-width / 2 - x_bearing + 1, -height / 2 - y_bearing + 1)
-        context.show_text(text)
-        
-        # Text with contrast for readability
-        context.set_source_rgb(1, 1, 1)  # White text
-        context.move_to(-width / 2 - x_bearing, -height / 2 - y_bearing)
-        context.show_text(text)
-        
-        # Restore context after rotation
-        context.restore()
+from game_paths import asset_path
+
+# Floating number sprites and the game rules live in the engine
+from engine.number_ninja import Number, NumberNinjaGame
 
 class NumberNinjaActivity(Gtk.Window):
     def __init__(self, handle):
@@ -147,11 +38,13 @@ class NumberNinjaActivity(Gtk.Window):
             self.set_resizable(True)
             self.connect("delete-event", Gtk.main_quit)
             
-            # Set application icon
-            try:
-                self.set_icon_from_file("/home/pranjalnegi/Maths-Games/assets/number_ninja_icon.png")
-            except:
-                pass  # Icon loading is optional
+            # Set application icon if the bundle ships one
+            icon_path = asset_path("number_ninja_icon.png")
+            if os.path.exists(icon_path):
+                try:
+                    self.set_icon_from_file(icon_path)
+                except:
+                    pass  # Icon loading is optional
             
         # Apply modernized CSS styling with animations
         self._apply_css()
@@ -0,0 +1,338 @@
+"""
+Per-game resource usage for the Math Games launcher.
+
+For every game the launcher starts, ResourceMonitor records wall time, CPU
+time, peak resident memory and the number of GLib main-loop callbacks the
+game ran. Games started with their run() entry point share the launcher
+process, so their CPU time is the process CPU used while the game was open
+and their peak RSS is the launcher's high-water mark. Subprocess games are
+sampled from /proc once a second, and warm workers report exact figures
+when the game exits.
+
+Each finished game is appended as one JSON line to a rotating log. Set
+MATHGAMES_RESOURCE_LOG to choose its path; by default it is
+mathgames-resources.log in the temp directory.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import resource
+import tempfile
+import time
+from contextlib import contextmanager
+
+from gi.repository import GLib
+
+ENV_VAR = "MATHGAMES_RESOURCE_LOG"
+LOG_MAX_BYTES = 256 * 1024
+LOG_BACKUPS = 3
+POLL_SECONDS = 1
+
+# GLib functions that schedule a main-loop callback
+SCHEDULERS = ("timeout_add", "timeout_add_seconds", "idle_add")
+
+# Modules whose callbacks are the launcher's own, never a game's
+LAUNCHER_MODULES = (
+    "MathGamesActivity", "animations", "game_registry", "resource_monitor",
+    "startup_profiler", "worker_pool",
+)
+
+
+def process_cpu_time():
+    """CPU seconds used by this process so far."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def process_peak_rss():
+    """Peak resident memory of this process in kB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def read_proc_usage(pid):
+    """Return (cpu seconds, peak RSS kB) of another process, or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as stat_file:
+            # The command name may contain spaces, so split after it
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+        peak = None
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    peak = int(line.split()[1])
+                    break
+        return cpu, peak
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class CallbackCounter:
+    """Count GLib callbacks by the game they were scheduled for.
+
+    While installed, GLib.timeout_add, timeout_add_seconds and idle_add
+    are wrapped so every callback scheduled through them is charged to the
+    current owner, whichever module defined it; results that a shared
+    engine module delivers through idle_add count for the game that
+    started the work. Callbacks defined in `ignore_modules` are left
+    unwrapped.
+
+    A worker process runs a single game, so it calls install() once. The
+    launcher only wraps the schedulers for the duration of track(), while
+    an in-process game runs, and leaves GLib untouched otherwise.
+    """
+
+    def __init__(self, ignore_modules=()):
+        self.counts = {}
+        self.originals = {}
+        self.ignore_modules = frozenset(ignore_modules)
+        self.owner = None
+
+    def install(self, owner="game"):
+        """Wrap the schedulers, charging new callbacks to `owner`."""
+        self.owner = owner
+        if self.originals:
+            return
+        for name in SCHEDULERS:
+            original = getattr(GLib, name)
+            self.originals[name] = original
+            setattr(GLib, name, self._wrap_scheduler(original))
+
+    def uninstall(self):
+        for name, original in self.originals.items():
+            setattr(GLib, name, original)
+        self.originals = {}
+        self.owner = None
+
+    @contextmanager
+    def track(self, owner):
+        """Charge callbacks scheduled inside the block to `owner`."""
+        previous = self.owner
+        was_installed = bool(self.originals)
+        self.install(owner)
+        try:
+            yield
+        finally:
+            if was_installed:
+                self.owner = previous
+            else:
+                self.uninstall()
+
+    def count(self, owner):
+        return self.counts.get(owner, 0)
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def _wrap_scheduler(self, original):
+        def schedule(*args, **kwargs):
+            args = list(args)
+            for i, arg in enumerate(args):
+                if callable(arg):
+                    args[i] = self._wrap_callback(arg)
+                    break
+            return original(*args, **kwargs)
+        return schedule
+
+    def _wrap_callback(self, function):
+        owner = self.owner
+        if owner is None or getattr(function, "__module__", None) in self.ignore_modules:
+            return function
+
+        def counted(*data):
+            self.counts[owner] = self.counts.get(owner, 0) + 1
+            return function(*data)
+        return counted
+
+
+class GameRecord:
+    """Resource usage of one game launch."""
+
+    def __init__(self, name, mode, pid=None):
+        self.name = name
+        self.mode = mode  # "in-process" or "subprocess"
+        self.pid = pid
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.wall_s = 0.0
+        self.cpu_s = None
+        self.peak_rss_kb = None
+        self.callbacks = None
+        self.status = "running"
+
+    def as_dict(self):
+        return {
+            "game": self.name,
+            "mode": self.mode,
+            "pid": self.pid,
+            "started_at": self.started_at,
+            "wall_s": round(self.wall_s, 3),
+            "cpu_s": None if self.cpu_s is None else round(self.cpu_s, 3),
+            "peak_rss_kb": self.peak_rss_kb,
+            "callbacks": self.callbacks,
+            "status": self.status,
+        }
+
+
+class ResourceMonitor:
+    """Track the games started by the launcher and log their usage."""
+
+    def __init__(self, log_path=None, history=50):
+        self.log_path = log_path
+        self.history = history
+        self.records = []
+        self.listeners = []
+        self.running = {}
+        self.poll_id = None
+        self.counter = CallbackCounter(LAUNCHER_MODULES)
+        self.logger = self._make_logger(log_path)
+
+    @classmethod
+    def from_environ(cls):
+        value = os.environ.get(ENV_VAR)
+        if not value:
+            value = os.path.join(tempfile.gettempdir(), "mathgames-resources.log")
+        return cls(value)
+
+    def _make_logger(self, log_path):
+        if log_path is None:
+            return None
+        logger = logging.getLogger("mathgames.resources")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        try:
+            handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS
+            )
+        except OSError as e:
+            print(f"Error opening resource log: {e}")
+            return None
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        return logger
+
+    def add_listener(self, callback):
+        """Call callback(monitor) whenever a record changes."""
+        self.listeners.append(callback)
+
+    def run_in_process(self, name, entry_point):
+        """Call a game's entry point and record what it used.
+
+        run() blocks in a nested main loop until the game window closes,
+        so the record is finished when it returns. Callbacks scheduled
+        meanwhile, outside the launcher's own modules, count for the game.
+        """
+        record = self._add(GameRecord(name, "in-process", os.getpid()))
+        cpu_start = process_cpu_time()
+        callbacks_start = self.counter.count(name)
+
+        def sample(record):
+            record.wall_s = time.perf_counter() - record.origin
+            record.cpu_s = process_cpu_time() - cpu_start
+            record.peak_rss_kb = process_peak_rss()
+            record.callbacks = self.counter.count(name) - callbacks_start
+
+        self._watch(record, sample)
+        try:
+            with self.counter.track(name):
+                entry_point()
+            record.status = "finished"
+        except Exception:
+            record.status = "error"
+            raise
+        finally:
+            sample(record)
+            self._finish(record)
+
+    def new_stats_path(self):
+        """Return a file a warm worker can write its final usage to."""
+        fd, stats_path = tempfile.mkstemp(prefix="mathgames-stats-", suffix=".json")
+        os.close(fd)
+        return stats_path
+
+    def watch_process(self, name, process, stats_path=None):
+        """Sample a game running in `process` until it exits."""
+        record = self._add(GameRecord(name, "subprocess", process.pid))
+
+        def sample(record):
+            record.wall_s = time.perf_counter() - record.origin
+            usage = read_proc_usage(process.pid)
+            if usage is not None:
+                record.cpu_s, record.peak_rss_kb = usage
+
+        def poll(record):
+            exit_code = process.poll()
+            if exit_code is None:
+                sample(record)
+                return
+            record.wall_s = time.perf_counter() - record.origin
+            record.status = f"exited ({exit_code})"
+            if stats_path is not None:
+                self._read_stats(record, stats_path)
+            self._finish(record)
+
+        sample(record)
+        self._watch(record, poll)
+        return record
+
+    def _read_stats(self, record, stats_path):
+        try:
+            with open(stats_path) as stats_file:
+                stats = json.load(stats_file)
+            record.cpu_s = stats["cpu_s"]
+            record.peak_rss_kb = stats["peak_rss_kb"]
+            record.callbacks = stats["callbacks"]
+        except (OSError, ValueError, KeyError):
+            # Cold launches and killed workers leave no stats behind
+            pass
+        try:
+            os.remove(stats_path)
+        except OSError:
+            pass
+
+    def _add(self, record):
+        self.records.append(record)
+        del self.records[:-self.history]
+        self._notify()
+        return record
+
+    def _watch(self, record, poll):
+        self.running[record] = poll
+        if self.poll_id is None:
+            self.poll_id = GLib.timeout_add_seconds(POLL_SECONDS, self._on_poll)
+
+    def _on_poll(self):
+        for record, poll in list(self.running.items()):
+            poll(record)
+        self._notify()
+        if not self.running:
+            self.poll_id = None
+            return False
+        return True
+
+    def _finish(self, record):
+        self.running.pop(record, None)
+        if self.logger is not None:
+            self.logger.info(json.dumps(record.as_dict()))
+        self._notify()
+
+    def _notify(self):
+        for callback in self.listeners:
+            callback(self)
+
+
+def write_process_stats(stats_path, counter):
+    """Write this process's final usage for the launcher to pick up."""
+    stats = {
+        "cpu_s": process_cpu_time(),
+        "peak_rss_kb": process_peak_rss(),
+        "callbacks": counter.total(),
+    }
+    try:
+        with open(stats_path, "w") as stats_file:
+            json.dump(stats, stats_file)
+    except OSError as e:
+        print(f"Error writing game stats: {e}")
@@ -0,0 +1,99 @@
+"""
+Startup instrumentation for the Math Games launcher.
+
+Set MATHGAMES_PROFILE_STARTUP to enable it. The value is the path of the
+JSON report to write; "1" writes mathgames-startup.json to the temp
+directory. The report lists each startup phase (imports, toolbar, grid,
+CSS, first draw) with wall-clock offsets in milliseconds, so releases can
+be compared by a script.
+
+This module only uses the standard library so it can be imported before
+anything else is timed.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+ENV_VAR = "MATHGAMES_PROFILE_STARTUP"
+REPORT_VERSION = 1
+
+
+class StartupProfiler:
+    """Record named phases and point-in-time marks relative to creation."""
+
+    def __init__(self, report_path=None):
+        self.report_path = report_path
+        self.enabled = report_path is not None
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.open_phases = {}
+        self.marks = {}
+        self.written = False
+
+    @classmethod
+    def from_environ(cls):
+        value = os.environ.get(ENV_VAR)
+        if not value:
+            return cls()
+        if value == "1":
+            value = os.path.join(tempfile.gettempdir(), "mathgames-startup.json")
+        return cls(value)
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def begin(self, name):
+        """Start timing phase `name`."""
+        if self.enabled:
+            self.open_phases[name] = self._now_ms()
+
+    def end(self, name):
+        """Stop timing phase `name` and record it."""
+        if not self.enabled or name not in self.open_phases:
+            return
+        start = self.open_phases.pop(name)
+        end = self._now_ms()
+        self.phases.append({
+            "name": name,
+            "start_ms": round(start, 3),
+            "end_ms": round(end, 3),
+            "duration_ms": round(end - start, 3),
+        })
+
+    def mark(self, name):
+        """Record the time at which `name` happened."""
+        if self.enabled:
+            self.marks[name] = round(self._now_ms(), 3)
+
+    def report(self):
+        """Return the report as a JSON-serialisable dict."""
+        return {
+            "version": REPORT_VERSION,
+            "started_at": self.started_at,
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "phases": self.phases,
+            "marks": self.marks,
+            "total_ms": max(list(self.marks.values()) +
+                            [phase["end_ms"] for phase in self.phases] + [0]),
+        }
+
+    def write_report(self):
+        """Write the JSON report once; later calls do nothing."""
+        if not self.enabled or self.written:
+            return False
+        self.written = True
+        try:
+            with open(self.report_path, "w") as report_file:
+                json.dump(self.report(), report_file, indent=2)
+        except OSError as e:
+            print(f"Error writing startup profile: {e}")
+        return False
+
+
+# Shared instance; created at import time so it also times the imports
+profiler = StartupProfiler.from_environ()
@@ -0,0 +1,144 @@
+"""
+Pre-started Python workers for games that have no run() entry point.
+
+Starting `python3 game.py` pays the interpreter start-up plus the gi, Gtk,
+cairo and sugar3 import cost every time. WarmWorkerPool keeps a few worker
+interpreters that have already done those imports and are blocked reading
+a script path from stdin; launching a game just hands the path to one of
+them. Workers are spawned rather than forked, so no display connection is
+ever shared between processes.
+
+Running this file directly starts a worker.
+"""
+
+import os
+import runpy
+import subprocess
+import sys
+
+from gi.repository import GLib
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+
+# Modules every game needs; imported by each worker before it goes idle
+WARM_MODULES = [
+    "gi",
+    "cairo",
+    "sugar3.activity.activity",
+    "sugar3.activity.widgets",
+    "sugar3.graphics.toolbarbox",
+    "sugar3.graphics.toolbutton",
+    "sugar3.graphics.style",
+    "sugar3.graphics.alert",
+]
+
+
+class WarmWorkerPool:
+    """Keep `size` warm workers ready and dispatch game scripts to them."""
+
+    def __init__(self, size=1, refill_delay=3):
+        self.size = size
+        self.refill_delay = refill_delay
+        self.idle = []
+        self.refill_id = None
+
+    def start(self):
+        """Spawn workers until `size` of them are waiting."""
+        self.idle = [worker for worker in self.idle if worker.poll() is None]
+        while len(self.idle) < self.size:
+            self.idle.append(self._spawn())
+
+    def launch(self, script_path, cwd=None, stats_path=None):
+        """Run script_path as __main__ in a warm worker.
+
+        Falls back to a cold `python3 script_path` when no worker is alive.
+        A warm worker writes its final resource usage to stats_path when
+        the game exits. Returns the Popen object of the process running
+        the game.
+        """
+        while self.idle:
+            worker = self.idle.pop(0)
+            if worker.poll() is not None:
+                continue
+            try:
+                worker.stdin.write(f"{script_path}\n{cwd or ''}\n{stats_path or ''}\n".encode())
+                worker.stdin.close()
+            except OSError:
+                continue
+            self.start_later()
+            return worker
+
+        self.start_later()
+        return subprocess.Popen(["python3", script_path], cwd=cwd)
+
+    def shutdown(self):
+        """Stop every idle worker; running games are left alone."""
+        if self.refill_id is not None:
+            GLib.source_remove(self.refill_id)
+            self.refill_id = None
+
+        for worker in self.idle:
+            try:
+                # EOF on stdin makes an idle worker exit cleanly
+                worker.stdin.close()
+            except OSError:
+                worker.kill()
+        self.idle = []
+
+    def _spawn(self):
+        return subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+        )
+
+    def start_later(self):
+        """Fill the pool after refill_delay seconds on the main loop."""
+        # The delay keeps the workers' imports from competing with the
+        # launcher or with the game that is starting right now
+        if self.refill_id is not None:
+            return
+        self.refill_id = GLib.timeout_add_seconds(self.refill_delay, self._on_refill)
+
+    def _on_refill(self):
+        self.refill_id = None
+        self.start()
+        return False
+
+
+def worker_main():
+    """Import the shared game dependencies, then run one game script."""
+    import gi
+    gi.require_version('Gtk', '3.0')
+    from gi.repository import Gtk, Gdk, Pango
+
+    for name in WARM_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+
+    from resource_monitor import CallbackCounter, write_process_stats
+
+    script_path = sys.stdin.readline().strip()
+    cwd = sys.stdin.readline().strip()
+    stats_path = sys.stdin.readline().strip()
+    if not script_path:
+        return
+
+    counter = CallbackCounter()
+    counter.install()
+
+    # Mimic `python3 script_path`
+    if cwd:
+        os.chdir(cwd)
+    sys.argv = [script_path]
+    sys.path.insert(0, os.path.dirname(script_path))
+    try:
+        runpy.run_path(script_path, run_name="__main__")
+    finally:
+        if stats_path:
+            write_process_stats(stats_path, counter)
+
+
+if __name__ == "__main__":
+    worker_main()